@@ -10,3 +10,12 @@ from .release import __version__, __authors__ # this is actually everything
 
 from .bertini import *
 from .core import *
+
+def __getattr__(name):
+    # BERTINI, MPIRUN and PCOUNT are found on first use; assign to them
+    # here (e.g., naglib.BERTINI = '/path/to/bertini') to override
+    from .bertini import sysutils
+    if name in sysutils._DISCOVERED:
+        return getattr(sysutils, name)
+    msg = "module {0} has no attribute {1}".format(repr(__name__), repr(name))
+    raise AttributeError(msg)
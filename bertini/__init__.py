@@ -1,4 +1,22 @@
 from __future__ import absolute_import, print_function
 
-from .fileutils import fprint, parselines, read_points
-from .sysutils import BERTINI, MPIRUN, PCOUNT, BertiniRun
\ No newline at end of file
+from .fileutils import LazyWitnessData, fprint, iter_points, parsearray, parselines, parse_main_data, parse_witness_data, read_array, read_points
+from .cache import ResultCache
+from .launch import Launcher, LocalLauncher, MPILauncher, SerialLauncher
+from .pool import BertiniPool
+from .rundir import RunDirectoryManager
+from .timing import add_timing_hook, remove_timing_hook
+from .sysutils import BertiniRun
+
+import sys
+if sys.version_info < (3, 7):
+    from .sysutils import BERTINI, MPIRUN, PCOUNT
+del sys
+
+def __getattr__(name):
+    # BERTINI, MPIRUN and PCOUNT are found on first use
+    from . import sysutils
+    if name in sysutils._DISCOVERED:
+        return getattr(sysutils, name)
+    msg = "module {0} has no attribute {1}".format(repr(__name__), repr(name))
+    raise AttributeError(msg)
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""asyncio support for BertiniRun; this module requires Python 3"""
+import asyncio
+import os
+import signal
+
+from naglib.bertini.timing import _Phase, _call_hooks
+from naglib.exceptions import BertiniError
+
+def _kill(process):
+    """
+    Kill `process' along with anything it spawned (e.g., mpirun's
+    Bertini processes)
+    """
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+async def _in_executor(loop, func, *args):
+    """
+    Run func(*args) in the loop's default executor; if cancelled, wait
+    for it to finish before passing the cancellation on, so cleaning up
+    doesn't race it
+    """
+    future = loop.run_in_executor(None, func, *args)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        try:
+            await future
+        except Exception:
+            pass
+        raise
+
+async def run_async(bertini_run, rerun_on_fail=False, on_output=None, retry_failed=False):
+    """
+    Run Bertini without blocking the event loop, and return what
+    `bertini_run.run' would
+
+    Input files are written, the result cache consulted and results
+    parsed in the loop's default executor. Bertini's stdout is read as
+    it arrives.
+
+    If the task is cancelled, the Bertini (or mpirun) process group is
+    killed and the run directory given back. On any other error, the
+    process is killed and the directory kept as that of a failed run.
+
+    Keyword arguments:
+    bertini_run   -- BertiniRun
+    rerun_on_fail -- optional boolean, as for BertiniRun.run
+    on_output     -- optional callable, called with each line of
+                     Bertini's stdout as it arrives
+    retry_failed  -- optional boolean, as for BertiniRun.run
+    """
+    loop = asyncio.get_running_loop()
+    dirname = bertini_run.dirname
+    process = None
+    bertini_run._timings = {}
+
+    try:
+        arg, stdin = await _in_executor(loop, bertini_run._prepare_run)
+        hit, data = await _in_executor(loop, bertini_run._fetch_cached, rerun_on_fail)
+        if not hit:
+            with _Phase(bertini_run.timings, 'bertini', dirname=dirname,
+                        input_files=bertini_run._input_files):
+                fh = open(stdin, 'r') if stdin else asyncio.subprocess.DEVNULL
+                try:
+                    process = await asyncio.create_subprocess_exec(*arg, stdin=fh,
+                                                                   stdout=asyncio.subprocess.PIPE,
+                                                                   cwd=dirname,
+                                                                   start_new_session=True)
+                finally:
+                    if stdin:
+                        fh.close()
+
+                lines = []
+                while True:
+                    line = await process.stdout.readline()
+                    if not line:
+                        break
+                    line = line.decode(errors='replace')
+                    lines.append(line)
+                    if on_output is not None:
+                        on_output(line)
+                returncode = await process.wait()
+
+            output = ''.join(lines)
+            if returncode != 0:
+                msg = bertini_run._proc_err_output(output)
+                raise BertiniError(msg)
+
+            data = await _in_executor(loop, bertini_run._finish_run, output, rerun_on_fail)
+            await _in_executor(loop, bertini_run._store_cached, output)
+
+        _call_hooks(bertini_run, bertini_run.timings)
+        if retry_failed:
+            data = await _in_executor(loop, bertini_run._retry_failed, data)
+    except asyncio.CancelledError:
+        await _stop(process)
+        bertini_run.close()
+        raise
+    except BaseException:
+        await _stop(process)
+        bertini_run.rundirs.fail(dirname)
+        raise
+
+    return data
+
+async def _stop(process):
+    """
+    Kill `process', if there is one and it is still running, and reap it
+    """
+    if process is None or process.returncode is not None:
+        return
+    _kill(process)
+    await process.wait()
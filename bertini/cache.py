@@ -0,0 +1,211 @@
+from __future__ import print_function
+
+import os
+
+from naglib.core.base import NAGobject
+
+def _default_dirname():
+    """
+    Return the directory for the default cache: $NAGLIB_CACHE_DIR if
+    set, otherwise naglib under the user's cache directory
+    """
+    dirname = os.getenv('NAGLIB_CACHE_DIR')
+    if not dirname:
+        base = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        dirname = os.path.join(base, 'naglib')
+    return dirname
+
+_default = None
+
+def default_cache():
+    """
+    Return the ResultCache used by BertiniRuns unless told otherwise
+    """
+    global _default
+    if _default is None:
+        _default = ResultCache()
+    return _default
+
+class ResultCache(NAGobject):
+    """
+    An on-disk cache of Bertini's output files, keyed by a hash of the
+    files written for a run
+
+    Each entry is a directory holding the output files and stdout of a
+    run. Entries are evicted least recently used first once the cache
+    grows past `max_size' bytes.
+    """
+    STDOUT = '.stdout'
+
+    def __init__(self, dirname=None, max_size=256*2**20):
+        """
+        Initialize the ResultCache object
+
+        Keyword arguments:
+        dirname  -- optional string, the directory holding the cache
+        max_size -- optional int, the most bytes to keep on disk
+        """
+        if dirname is None:
+            dirname = _default_dirname()
+        if not os.path.exists(dirname):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                # another process got there first
+                if not os.path.isdir(dirname):
+                    raise
+
+        self._dirname = dirname
+        self._max_size = max_size
+
+    def __contains__(self, key):
+        """
+        x.__contains__(y) <==> y in x
+        """
+        return os.path.isdir(os.path.join(self._dirname, key))
+
+    def __len__(self):
+        """
+        x.__len__() <==> len(x)
+        """
+        return len(self._entries())
+
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        return 'ResultCache({0}, max_size={1})'.format(repr(self._dirname), self._max_size)
+
+    def _entries(self):
+        """
+        Return the paths of the entries in the cache
+        """
+        dirname = self._dirname
+        return [os.path.join(dirname, e) for e in os.listdir(dirname)
+                if not e.startswith('.') and os.path.isdir(os.path.join(dirname, e))]
+
+    def _evict(self):
+        """
+        Discard least recently used entries until the cache fits
+        """
+        entries = []
+        total = 0
+        for entry in self._entries():
+            try:
+                size = sum([os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry)])
+                entries.append((os.path.getmtime(entry), size, entry))
+            except OSError:
+                # evicted by someone else
+                continue
+            total += size
+
+        entries.sort()
+        while total > self._max_size and entries:
+            mtime, size, entry = entries.pop(0)
+            self.discard(os.path.basename(entry))
+            total -= size
+
+    def clear(self):
+        """
+        Discard every entry
+        """
+        for entry in self._entries():
+            self.discard(os.path.basename(entry))
+
+    def discard(self, key):
+        """
+        Discard the entry for `key', if there is one
+        """
+        from shutil import rmtree
+        rmtree(os.path.join(self._dirname, key), ignore_errors=True)
+
+    def fetch(self, key, dirname):
+        """
+        Copy the output files cached under `key' into `dirname'
+
+        Returns Bertini's stdout for the run, or None on a miss
+        """
+        from shutil import copy2
+
+        entry = os.path.join(self._dirname, key)
+        try:
+            files = os.listdir(entry)
+            fh = open(os.path.join(entry, self.STDOUT), 'r')
+            output = fh.read()
+            fh.close()
+            for f in files:
+                if f != self.STDOUT:
+                    copy2(os.path.join(entry, f), os.path.join(dirname, f))
+            # mark as recently used
+            os.utime(entry, None)
+        except (IOError, OSError):
+            return None
+
+        return output
+
+    def key(self, bertini, filenames):
+        """
+        Return the key for a run of the executable `bertini' on the
+        files `filenames'
+        """
+        from hashlib import sha256
+
+        h = sha256()
+        # a different build of Bertini may give different output
+        bertini = os.path.realpath(bertini)
+        try:
+            stat = os.stat(bertini)
+            h.update('{0}:{1}:{2}\n'.format(bertini, stat.st_size, int(stat.st_mtime)).encode())
+        except OSError:
+            h.update('{0}\n'.format(bertini).encode())
+
+        for filename in sorted(filenames, key=os.path.basename):
+            h.update('{0}:{1}\n'.format(os.path.basename(filename), os.path.getsize(filename)).encode())
+            fh = open(filename, 'rb')
+            for block in iter(lambda: fh.read(2**16), b''):
+                h.update(block)
+            fh.close()
+
+        return h.hexdigest()
+
+    def store(self, key, dirname, input_files, output):
+        """
+        Cache the files in `dirname' other than `input_files', along
+        with Bertini's stdout, under `key'
+        """
+        from shutil import copy2, rmtree
+        from tempfile import mkdtemp
+
+        if key in self:
+            return
+
+        inputs = set([os.path.basename(f) for f in input_files])
+        # build the entry off to the side, then move it into place in
+        # one step so readers never see part of one
+        tmpdir = mkdtemp(prefix='.', dir=self._dirname)
+        try:
+            for f in os.listdir(dirname):
+                path = os.path.join(dirname, f)
+                if f not in inputs and os.path.isfile(path):
+                    copy2(path, os.path.join(tmpdir, f))
+            fh = open(os.path.join(tmpdir, self.STDOUT), 'w')
+            fh.write(output)
+            fh.close()
+            os.rename(tmpdir, os.path.join(self._dirname, key))
+        except (IOError, OSError):
+            # someone else stored it first
+            rmtree(tmpdir, ignore_errors=True)
+            return
+
+        self._evict()
+
+    @property
+    def dirname(self):
+        return self._dirname
+    @property
+    def max_size(self):
+        return self._max_size
+    @max_size.setter
+    def max_size(self, size):
+        self._max_size = size
+        self._evict()
@@ -3,10 +3,11 @@ from __future__ import print_function
 from os.path import isfile
 from sys import stdout
 
-from sympy import I, Float, sympify
+import numpy as np
 
 from naglib.startup import TOL
-from naglib.core import AffinePoint, ProjectivePoint
+from naglib.core import AffinePoint, AffinePointArray, PointArray, ProjectivePoint, ProjectivePointArray
+from naglib.core.base import NAGobject
 from naglib.core.misc import striplines
 
 def parselines(lines, tol=TOL, projective=False, as_set=False):
@@ -16,7 +17,7 @@ def parselines(lines, tol=TOL, projective=False, as_set=False):
              the rest, "%s %s" % real, imag
     tol   -- optional float, smallest allowable nonzero value
     """
-    from re import split as resplit
+    from sympy import I, Float
     from naglib.core.misc import dps
     
     lines = striplines(lines)
@@ -31,7 +32,7 @@ def parselines(lines, tol=TOL, projective=False, as_set=False):
 
     for i in range(0, length, numvar):
         point = lines[i:i+numvar]
-        point = [resplit(r'\s+', p) for p in point]
+        point = [p.split() for p in point]
         newpoint = []
         for p in point:
             real,imag = p
@@ -57,14 +58,100 @@ def parselines(lines, tol=TOL, projective=False, as_set=False):
 
     return points
 
-def read_points(filename, tol=TOL, projective=False, as_set=False):
+def parsearray(lines, tol=TOL, multiprec=False):
+    """
+    Parse points in Bertini format into an array of shape
+    (numpoints, numvars) in a single pass
+
+    Keyword arguments:
+    lines     -- string or iterable of strings, first entry the number
+                 of points; the rest, "%s %s" % real, imag
+    tol       -- optional float, smallest allowable nonzero value
+    multiprec -- optional boolean, if True, return an object array of
+                 mpmath mpc, keeping every digit given in the file;
+                 otherwise return a complex128 array
+    """
+    if not isinstance(lines, str):
+        lines = '\n'.join(lines)
+    tokens = lines.replace(';', ' ').split()
+
+    numpoints = int(tokens[0]) if tokens else 0
+    if numpoints == 0:
+        return np.zeros((0, 0), dtype=object if multiprec else np.complex128)
+    tokens = tokens[1:]
+    numvar = len(tokens)//(2*numpoints)
+
+    if multiprec:
+        points = _mpc_array(tokens, tol)
+    else:
+        points = _complex_array(tokens, tol)
+
+    return points.reshape(numpoints, numvar)
+
+def _mpc_array(tokens, tol):
+    """
+    Convert a flat list of real, imaginary strings into an object array
+    of mpmath mpc, keeping every digit given
+    """
+    from mpmath import mpc, mpf, workdps
+    from naglib.core.misc import dps
+
+    numbers = np.empty(len(tokens)//2, dtype=object)
+    for i in range(len(numbers)):
+        real, imag = tokens[2*i], tokens[2*i+1]
+        with workdps(max(dps(real), dps(imag))):
+            real, imag = mpf(real), mpf(imag)
+            if abs(real) < tol:
+                real = mpf(0)
+            if abs(imag) < tol:
+                imag = mpf(0)
+            numbers[i] = mpc(real, imag)
+    return numbers
+
+def _complex_array(tokens, tol):
+    """
+    Convert a flat list of real, imaginary strings into a complex128 array
+    """
+    parts = np.array(tokens, dtype=np.float64).reshape(-1, 2)
+    parts[np.abs(parts) < tol] = 0
+    return parts[:, 0] + 1j*parts[:, 1]
+
+def read_array(filename, tol=TOL, multiprec=False):
+    """
+    Reads in a file of points in one bulk pass and returns them as the
+    rows of an array; see `parsearray'
+    """
+    if not isfile(filename):
+        msg = "{0} does not exist".format(filename)
+        raise IOError(msg)
+
+    fh = open(filename, 'r')
+    text = fh.read()
+    fh.close()
+
+    return parsearray(text, tol=tol, multiprec=multiprec)
+
+def read_points(filename, tol=TOL, projective=False, as_set=False, as_array=False):
     """
     Reads in a file and return a set of Float numbers
+
+    If `as_array' is True, skip building SymPy points altogether and
+    return an AffinePointArray or ProjectivePointArray backed by a
+    single complex128 array (see `read_array')
     """
     if not isfile(filename):
         msg = "{0} does not exist".format(filename)
         raise IOError(msg)
 
+    if as_array:
+        points = read_array(filename, tol=tol)
+        if as_set and len(points) > 0:
+            points = np.unique(points, axis=0)
+        if projective:
+            return ProjectivePointArray(points)
+        else:
+            return AffinePointArray(points)
+
     fh = open(filename, 'r')
     lines = striplines(fh.readlines())
     fh.close()
@@ -72,6 +159,612 @@ def read_points(filename, tol=TOL, projective=False, as_set=False):
     points = parselines(lines, tol=tol, projective=projective, as_set=as_set)
     return points
 
+def iter_points(filename, chunk=None, tol=TOL, projective=False, numvars=None):
+    """
+    Lazily read the points in a file, holding at most one chunk in
+    memory at a time
+
+    Keyword arguments:
+    filename   -- string, path to a file of points in Bertini format
+    chunk      -- optional int; if given, yield complex128 arrays of at
+                  most `chunk' rows, otherwise yield points one at a time
+    tol        -- optional float, smallest allowable nonzero value
+    projective -- optional boolean, yield ProjectivePoints if True
+    numvars    -- optional int, the number of coordinates of each point;
+                  inferred from the blank line ending the first point
+                  if not given
+    """
+    if not isfile(filename):
+        msg = "{0} does not exist".format(filename)
+        raise IOError(msg)
+    if chunk is not None and chunk < 1:
+        msg = "chunk must be a positive integer"
+        raise ValueError(msg)
+
+    fh = open(filename, 'r')
+    try:
+        numpoints = 0
+        for line in fh:
+            line = line.strip()
+            if line:
+                numpoints = int(line)
+                break
+        if numpoints == 0:
+            return
+
+        # coordinate lines read while determining numvars
+        pending = []
+        if numvars is None:
+            delimited = False
+            for line in fh:
+                line = line.strip()
+                if line:
+                    pending.append(line)
+                elif pending:
+                    delimited = True
+                    break
+            if delimited:
+                numvars = len(pending)
+            else: # no blank lines between points; whole file was read
+                numvars = len(pending)//numpoints
+        if numvars == 0:
+            return
+
+        blocksize = numvars*(chunk if chunk else 1)
+        remaining = numpoints
+        block = pending
+        lines = (l.strip() for l in fh)
+        while remaining > 0:
+            while len(block) < blocksize:
+                line = next(lines, None)
+                if line is None:
+                    break
+                if line:
+                    block.append(line)
+            take = min(len(block), blocksize)//numvars
+            if take == 0:
+                msg = "{0} ended after {1} of {2} points".format(filename, numpoints - remaining, numpoints)
+                raise IOError(msg)
+            take = min(take, remaining)
+            current, block = block[:take*numvars], block[take*numvars:]
+            remaining -= take
+
+            if chunk:
+                tokens = ' '.join(current).replace(';', ' ').split()
+                yield _complex_array(tokens, tol).reshape(take, numvars)
+            else:
+                yield parselines(['1'] + current, tol=tol, projective=projective)[0]
+    finally:
+        fh.close()
+
+INT = 0
+DOUBLE = 1
+RATIONAL = 2
+
+def parse_witness_data(filename):
+    """
+    Parse witness_data file into usable data
+
+    The file is read once, front to back, so parsing is linear in its
+    size. If the number format of the file is DOUBLE, coordinates and
+    matrices are stored as NumPy arrays; otherwise as SymPy matrices.
+
+    Keyword arguments:
+    filename -- string, path to witness_data file
+    """
+    if not isfile(filename):
+        msg = "{0} does not exist".format(filename)
+        raise IOError(msg)
+
+    fh = open(filename, 'r')
+    lines = (l.strip() for l in fh)
+    lines = (l for l in lines if l)
+    nextline = lambda: next(lines)
+    nextlines = lambda n: [next(lines) for k in range(n)]
+
+    try:
+        num_vars, nonempty_codims = int(nextline()), int(nextline())
+        # previous line includes additional homogenizing variable(s),
+        # as appropriate
+
+        # following block represents a single codim; repeated for each
+        codims = []
+        for i in range(nonempty_codims):
+            codim = int(nextline())
+            num_points = int(nextline())
+            # following block represents a single point; repeated for each
+            pts = []
+            for j in range(num_points):
+                pts.append(_read_witness_point(nextline, nextlines, num_vars, filename))
+            codims.append({'codim':codim, 'points':pts})
+
+        # -1 designates the end of witness points
+        nextline()
+
+        # remaining data is related to slices, randomization,
+        # homogenization, and patches
+        num_format = int(nextline())
+        # previous line describes format for remainder of data
+
+        # the following block is repeated for each nonempty codim.
+        for i in range(nonempty_codims):
+            codims[i].update(_read_witness_matrices(nextline, nextlines, num_format))
+    except StopIteration:
+        msg = "{0} ended unexpectedly".format(filename)
+        raise IOError(msg)
+    finally:
+        fh.close()
+
+    # coordinates are converted once the number format is known
+    for c in codims:
+        for pt in c['points']:
+            _convert_witness_point(pt, num_format)
+
+    return codims
+
+def _read_witness_point(nextline, nextlines, num_vars, filename):
+    """
+    Read a single point record from witness_data, leaving the
+    coordinates as strings
+    """
+    from naglib.exceptions import UnclassifiedException
+
+    prec = int(nextline())
+    pt = nextlines(num_vars)
+    # the next point is the last approximation of the point
+    # on the path before convergence
+    prec = int(nextline())
+    approx_pt = nextlines(num_vars)
+
+    condition_number = float(nextline())
+    corank = int(nextline()) # corank of Jacobian at this point
+    smallest_nonzero_singular = float(nextline())
+    largest_zero_singular = float(nextline())
+    pt_type = int(nextline())
+    multiplicity = int(nextline())
+    component_number = int(nextline())
+    if component_number == -1:
+        msg = "components in {0} have unclassified points".format(filename)
+        raise UnclassifiedException(msg)
+    deflations = int(nextline())
+
+    return {'coordinates':pt,
+            'corank':corank,
+            'condition number':condition_number,
+            'smallest nonzero':smallest_nonzero_singular,
+            'largest zero':largest_zero_singular,
+            'type':pt_type,
+            'multiplicity':multiplicity,
+            'component number':component_number,
+            'deflations':deflations,
+            'precision':prec,
+            'last approximation':approx_pt}
+
+def _convert_witness_point(pt, num_format):
+    """
+    Convert the coordinates of a point record read by
+    `_read_witness_point' in place
+    """
+    if num_format == DOUBLE:
+        convert = _complex_array
+    else:
+        convert = _mpc_array
+    pt['coordinates'] = convert(' '.join(pt['coordinates']).split(), 0)
+    pt['last approximation'] = convert(' '.join(pt['last approximation']).split(), 0)
+
+    return pt
+
+def _read_witness_matrices(nextline, nextlines, num_format):
+    """
+    Read the randomization, homogenization, slice and patch data
+    for a single codim from witness_data
+    """
+    from sympy import I, Integer, Rational, Matrix
+
+    def tonumber(line):
+        real, imag = line.split()
+        if num_format == INT:
+            return Integer(real) + I*Integer(imag)
+        elif num_format == DOUBLE:
+            return complex(float(real), float(imag))
+        else:
+            return Rational(real) + I*Rational(imag)
+
+    def tovector(entries):
+        if num_format == DOUBLE:
+            return _complex_array(' '.join(entries).split(), 0)
+        else:
+            return Matrix([tonumber(e) for e in entries])
+
+    def tomatrix(entries, num_rows, num_cols):
+        if num_format == DOUBLE:
+            return tovector(entries).reshape(num_rows, num_cols)
+        else:
+            return Matrix(num_rows, num_cols, [tonumber(e) for e in entries])
+
+    # first, matrix A used for randomization
+    # second, matrix W
+    num_rows, num_cols = [int(n) for n in nextline().split()]
+    AW_size = num_rows*num_cols
+
+    if AW_size == 0:
+        A = None
+        W = None
+    else:
+        A = tomatrix(nextlines(AW_size), num_rows, num_cols) # A is complex-valued
+        W = [int(w) for w in nextlines(AW_size)] # W is integer-valued
+        if num_format == DOUBLE:
+            W = np.array(W, dtype=int).reshape(num_rows, num_cols)
+        else:
+            W = Matrix(num_rows, num_cols, W)
+
+    # third, a vector H used for homogenization
+    # random if projective input
+    H_size = int(nextline())
+    H = tovector(nextlines(H_size))
+
+    # fourth, a number homVarConst
+    # 0 for affine, random for projective
+    hvc = tonumber(nextline())
+
+    # fifth, matrix B for linear slice coefficients
+    num_rows, num_cols = [int(n) for n in nextline().split()]
+    B_size = num_rows*num_cols
+
+    if B_size == 0:
+        B = None
+    else:
+        B = tomatrix(nextlines(B_size), num_rows, num_cols) # B is complex-valued
+
+    # sixth and finally, vector p for patch coefficients
+    p_size = int(nextline())
+    p = tovector(nextlines(p_size))
+
+    return {'A':A, 'W':W, 'H':H, 'homVarConst':hvc, 'slice':B, 'p':p}
+
+# (key in main_data, record field, type) for per-path statistics
+_MAIN_DATA_FIELDS = [('estimated condition number', 'condition_number', float),
+                     ('function residual', 'function_residual', float),
+                     ('latest newton residual', 'newton_residual', float),
+                     ('t value at final sample point', 'final_t', float),
+                     ('maximum precision utilized', 'max_precision', int),
+                     ('t value at first precision increase', 'precision_increase_t', float),
+                     ('number of precision increases', 'precision_switches', int),
+                     ('accuracy estimate, internal', 'accuracy_estimate', float),
+                     ('cycle number', 'cycle_number', int),
+                     ('multiplicity', 'multiplicity', int),
+                     ('retval', 'failure_code', int),
+                     ('path failure', 'failure_code', int),
+                     ('failure code', 'failure_code', int),
+                     ('time', 'time', float)]
+
+def _main_data_value(value, kind):
+    """
+    Convert the first token of `value' to `kind', or return the missing
+    value for `kind' (-1 or nan)
+    """
+    tokens = value.split()
+    try:
+        if kind is int:
+            return int(float(tokens[0]))
+        return float(tokens[0])
+    except (IndexError, ValueError):
+        return -1 if kind is int else np.nan
+
+def parse_main_data(lines):
+    """
+    Parse the per-path statistics in main_data into a record array
+
+    Each record has the fields `path' and `solution' (numbers, -1 if not
+    given), `endpoint' (complex coordinates, padded with nan), and those
+    in _MAIN_DATA_FIELDS: final_t, condition_number, residuals,
+    max_precision, precision_increase_t, precision_switches,
+    accuracy_estimate, cycle_number, multiplicity, failure_code and time.
+    Fields main_data doesn't report are -1 or nan, except failure_code,
+    which is 0 unless a failure is reported. Lines that don't parse are
+    skipped, so a file from any run or version of Bertini gives a
+    (possibly empty) array.
+
+    Keyword arguments:
+    lines -- iterable of strings, the lines of main_data
+    """
+    import re
+
+    head = re.compile(r'^(?:solution\s+(\d+)\s*)?\(?path number:?\s*(\d+)', re.I)
+    input_key = 'input file needed to reproduce this run'
+    fields = _MAIN_DATA_FIELDS
+    names = []
+    for key, name, kind in fields:
+        if name not in names:
+            names.append(name)
+    kinds = dict([(name, kind) for key, name, kind in fields])
+
+    records = []
+    rec = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        lower = line.lower()
+        if input_key in lower:
+            break
+        m = head.match(lower)
+        if m:
+            rec = {'path':int(m.group(2)), 'solution':-1, 'endpoint':[]}
+            if m.group(1) is not None:
+                rec['solution'] = int(m.group(1))
+            records.append(rec)
+            continue
+        if rec is None:
+            continue
+        # separators end a block
+        if not lower.strip('-*= '):
+            rec = None
+            continue
+
+        if ':' in line:
+            key, value = lower.split(':', 1)
+            key = key.strip()
+            for k, name, kind in fields:
+                if key.startswith(k):
+                    rec[name] = _main_data_value(value, kind)
+                    break
+            continue
+
+        # a coordinate: an optional name, then real and imaginary parts
+        tokens = line.split()
+        if len(tokens) in (2, 3):
+            try:
+                rec['endpoint'].append(complex(float(tokens[-2]), float(tokens[-1])))
+            except ValueError:
+                pass
+
+    numvars = max([len(r['endpoint']) for r in records] + [0])
+    dtype = [('path', int), ('solution', int), ('endpoint', complex, (numvars,))]
+    dtype += [(name, kinds[name]) for name in names]
+
+    stats = np.zeros(len(records), dtype=dtype)
+    for i, r in enumerate(records):
+        endpoint = np.empty(numvars, dtype=complex)
+        endpoint[:] = complex(np.nan, np.nan)
+        endpoint[:len(r['endpoint'])] = r['endpoint']
+        row = [r['path'], r['solution'], endpoint]
+        for name in names:
+            if name in r:
+                row.append(r[name])
+            elif name == 'failure_code':
+                row.append(0)
+            elif kinds[name] is int:
+                row.append(-1)
+            else:
+                row.append(np.nan)
+        stats[i] = tuple(row)
+
+    return stats.view(np.recarray)
+
+class LazyWitnessData(NAGobject):
+    """
+    A witness_data file, memory-mapped and decoded on demand
+
+    Opening the file only builds an index of the codim blocks and the
+    point records in each, along with the component number of each
+    point. The coordinates of a point are decoded when it is accessed.
+    Indexing or iterating gives the same dicts `parse_witness_data'
+    returns, so a LazyWitnessData can stand in for its output.
+
+    Close it (or use it in a `with' block) to release the file; a
+    BertiniRun closes its witness data when it gives back its run
+    directory. A LazyWitnessData pickles as its filename, and the copy
+    opens the file again.
+    """
+    def __init__(self, filename):
+        """
+        Keyword arguments:
+        filename -- string, path to witness_data file
+        """
+        from mmap import mmap, ACCESS_READ
+
+        if not isfile(filename):
+            msg = "{0} does not exist".format(filename)
+            raise IOError(msg)
+
+        self._filename = filename
+        self._fh = open(filename, 'rb')
+        try:
+            self._mmap = mmap(self._fh.fileno(), 0, access=ACCESS_READ)
+        except ValueError: # empty file
+            self._fh.close()
+            msg = "{0} ended unexpectedly".format(filename)
+            raise IOError(msg)
+
+        self._index()
+
+    def __len__(self):
+        """
+        x.__len__() <==> len(x)
+        """
+        return len(self._codims)
+
+    def __enter__(self):
+        """
+        x.__enter__() <==> with x
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the file on leaving a `with' block
+        """
+        self.close()
+        return False
+
+    def __reduce__(self):
+        """
+        Support pickling, e.g., to send witness sets to or from a
+        process pool; the file is opened again on unpickling, so it
+        must still exist
+        """
+        return (self.__class__, (self._filename,))
+
+    def __getitem__(self, key):
+        """
+        x.__getitem__(y) <==> x[y]
+        """
+        data = self.codim_data(key)
+        data['points'] = self.points(key)
+
+        return data
+
+    def __iter__(self):
+        """
+        x.__iter__() <==> iter(x)
+        """
+        for i in range(len(self._codims)):
+            yield self[i]
+
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        return 'LazyWitnessData({0})'.format(repr(self._filename))
+
+    def _line(self, i):
+        """
+        Return the ith nonempty line of the file
+        """
+        line = self._mmap[self._starts[i]:self._ends[i]]
+        return line.decode('ascii').strip()
+
+    def _lines(self, start, stop=None):
+        """
+        Iterate over nonempty lines from start up to stop
+        """
+        if stop is None:
+            stop = len(self._starts)
+        for i in range(start, stop):
+            yield self._line(i)
+
+    def _index(self):
+        """
+        Find the offset of every nonempty line, every codim block and
+        every point record, then read the matrices following the points
+        """
+        from naglib.exceptions import UnclassifiedException
+
+        buf = np.frombuffer(self._mmap, dtype=np.uint8)
+        newlines = np.flatnonzero(buf == ord('\n'))
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [len(buf)]))
+        nonempty = ends > starts
+        # also skip lines holding nothing but a carriage return
+        nonempty[nonempty] = buf[starts[nonempty]] != ord('\r')
+        self._starts = starts[nonempty]
+        self._ends = ends[nonempty]
+        del buf
+
+        try:
+            num_vars, nonempty_codims = int(self._line(0)), int(self._line(1))
+            record = 2*num_vars + 10 # lines per point record
+            offset = 2
+
+            self._num_vars = num_vars
+            self._record = record
+            self._codims = []
+            for i in range(nonempty_codims):
+                codim = int(self._line(offset))
+                num_points = int(self._line(offset + 1))
+                first = offset + 2
+                # component number is the third-to-last line of a record
+                comp_ids = [int(self._line(first + j*record + record - 2)) for j in range(num_points)]
+                comp_ids = np.array(comp_ids, dtype=int)
+                if (comp_ids == -1).any():
+                    msg = "components in {0} have unclassified points".format(self._filename)
+                    raise UnclassifiedException(msg)
+                self._codims.append({'codim':codim,
+                                     'first':first,
+                                     'component numbers':comp_ids})
+                offset = first + num_points*record
+
+            # -1 designates the end of witness points
+            lines = self._lines(offset + 1)
+            nextline = lambda: next(lines)
+            nextlines = lambda n: [next(lines) for k in range(n)]
+            self._num_format = int(nextline())
+            for c in self._codims:
+                c['matrices'] = _read_witness_matrices(nextline, nextlines, self._num_format)
+        except (IndexError, StopIteration):
+            self.close()
+            msg = "{0} ended unexpectedly".format(self._filename)
+            raise IOError(msg)
+
+    def close(self):
+        """
+        Release the memory map and the underlying file
+        """
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._fh.close()
+
+    def codim_data(self, i):
+        """
+        Return the data for the ith nonempty codim, without its points
+        """
+        c = self._codims[i]
+        data = {'codim':c['codim']}
+        data.update(c['matrices'])
+
+        return data
+
+    def components(self, i):
+        """
+        Return the component numbers in the ith nonempty codim
+        """
+        return sorted(set(self._codims[i]['component numbers'].tolist()))
+
+    def num_points(self, i, component=None):
+        """
+        Return the number of points in the ith nonempty codim,
+        optionally only those on component number `component'
+        """
+        comp_ids = self._codims[i]['component numbers']
+        if component is None:
+            return len(comp_ids)
+        return int((comp_ids == component).sum())
+
+    def points(self, i, component=None):
+        """
+        Decode the points of the ith nonempty codim, optionally only
+        those on component number `component'
+        """
+        c = self._codims[i]
+        record = self._record
+        comp_ids = c['component numbers']
+        if component is None:
+            which = range(len(comp_ids))
+        else:
+            which = np.flatnonzero(comp_ids == component).tolist()
+
+        pts = []
+        for j in which:
+            start = c['first'] + j*record
+            lines = self._lines(start, start + record)
+            nextline = lambda: next(lines)
+            nextlines = lambda n: [next(lines) for k in range(n)]
+            pt = _read_witness_point(nextline, nextlines, self._num_vars, self._filename)
+            pts.append(_convert_witness_point(pt, self._num_format))
+
+        return pts
+
+    @property
+    def closed(self):
+        return self._mmap.closed
+    @property
+    def codims(self):
+        return [c['codim'] for c in self._codims]
+    @property
+    def filename(self):
+        return self._filename
+
 # write utils
 
 def fprint(points, filename=''):
@@ -79,21 +772,37 @@ def fprint(points, filename=''):
     Print a set of points in Bertini output fashion, optionally to a file
     
     Keyword arguments:
-    points   -- numeric iterable, the points to print
+    points   -- numeric iterable, the points to print; a list of Points,
+                a PointArray, or an array with one point per row
     filename -- optional string, path to filename
     """
+    from sympy import sympify
     if filename:
         fh = open(filename, 'w')
     else:
         fh = stdout
 
+    if isinstance(points, PointArray):
+        points = points.array
+
     numpoints = len(points)
     print('{0}\n'.format(numpoints), file=fh)
     for p in points:
-        for coordinate in p.coordinates:
-            coordinate = sympify(coordinate)
-            real, imag = coordinate.as_real_imag()
-            print('{0} {1}'.format(real, imag), file=fh)
+        if isinstance(p, np.ndarray):
+            coordinates = p
+        elif p._data is not None:
+            coordinates = p._data
+        else:
+            coordinates = p.coordinates
+        # double precision coordinates skip SymPy altogether; any others
+        # (e.g., mpmath or SymPy numbers) are written to full precision
+        if isinstance(coordinates, np.ndarray) and coordinates.dtype in (np.complex128, np.float64):
+            fh.write(''.join(['{0!r} {1!r}\n'.format(c.real, c.imag) for c in coordinates.tolist()]))
+        else:
+            for coordinate in coordinates:
+                coordinate = sympify(coordinate)
+                real, imag = coordinate.as_real_imag()
+                print('{0} {1}'.format(real, imag), file=fh)
         print('', file=fh)
 
     if filename:
@@ -0,0 +1,148 @@
+from __future__ import print_function
+
+from naglib.core.base import NAGobject
+
+def default_launcher():
+    """
+    Return the Launcher used by BertiniRuns unless told otherwise: MPI
+    with naglib.MPIRUN and naglib.PCOUNT as they are at launch
+    """
+    return MPILauncher()
+
+class Launcher(NAGobject):
+    """
+    Decide how Bertini is started for a run
+
+    Subclasses implement `command', returning the command line that
+    precedes the input file.
+    """
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        return '{0}()'.format(self.__class__.__name__)
+
+    def command(self, bertini_run):
+        """
+        Return the command starting Bertini for `bertini_run', as a list
+        """
+        raise NotImplementedError()
+
+class SerialLauncher(Launcher):
+    """
+    Run Bertini in a single process
+    """
+    def command(self, bertini_run):
+        """
+        Return the command starting Bertini for `bertini_run', as a list
+        """
+        return [bertini_run.bertini]
+
+class LocalLauncher(Launcher):
+    """
+    Run some other local program in place of Bertini, e.g., a stand-in
+    for testing; it is started in the run directory with the input file
+    as its last argument
+    """
+    def __init__(self, command):
+        """
+        Initialize the LocalLauncher object
+
+        Keyword arguments:
+        command -- string or list of strings, the program to run and any
+                   arguments to put before the input file
+        """
+        if not isinstance(command, (list, tuple)):
+            command = [command]
+        self._command = list(command)
+
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        return 'LocalLauncher({0})'.format(repr(self._command))
+
+    def command(self, bertini_run):
+        """
+        Return the command starting the stand-in, as a list
+        """
+        return list(self._command)
+
+class MPILauncher(Launcher):
+    """
+    Run Bertini under mpirun when the run is parallel and has enough
+    paths to pay for starting MPI, and serially otherwise
+    """
+    def __init__(self, nprocs=None, mpirun=None, args=(), hostfile=None, min_paths=None):
+        """
+        Initialize the MPILauncher object
+
+        Keyword arguments:
+        nprocs    -- optional int, the number of processes; defaults to
+                     naglib.PCOUNT
+        mpirun    -- optional string, the mpirun executable; defaults to
+                     naglib.MPIRUN
+        args      -- optional list of strings, extra flags for mpirun
+        hostfile  -- optional string, a hostfile to pass mpirun
+        min_paths -- optional int, run serially if the run is estimated
+                     to track fewer paths than this; defaults to four
+                     paths per process
+        """
+        if nprocs is not None and nprocs < 1:
+            msg = "specify at least one process"
+            raise ValueError(msg)
+
+        self._nprocs = nprocs
+        self._mpirun = mpirun
+        self._args = list(args)
+        self._hostfile = hostfile
+        self._min_paths = min_paths
+
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        return 'MPILauncher(nprocs={0}, hostfile={1})'.format(self._nprocs, repr(self._hostfile))
+
+    def command(self, bertini_run):
+        """
+        Return the command starting Bertini for `bertini_run', as a list
+        """
+        from naglib import MPIRUN, PCOUNT
+
+        mpirun = self._mpirun
+        if mpirun is None:
+            mpirun = MPIRUN
+        nprocs = self._nprocs
+        if nprocs is None:
+            nprocs = PCOUNT
+
+        if not (bertini_run.parallel and mpirun) or nprocs < 2:
+            return [bertini_run.bertini]
+
+        min_paths = self._min_paths
+        if min_paths is None:
+            min_paths = 4*nprocs
+        numpaths = bertini_run.path_count()
+        if numpaths is not None and numpaths < min_paths:
+            return [bertini_run.bertini]
+
+        arg = [mpirun, '-np', str(nprocs)]
+        if self._hostfile:
+            arg += ['-hostfile', self._hostfile]
+        arg += self._args
+
+        return arg + [bertini_run.bertini]
+
+    @property
+    def args(self):
+        return self._args
+    @property
+    def hostfile(self):
+        return self._hostfile
+    @property
+    def min_paths(self):
+        return self._min_paths
+    @property
+    def nprocs(self):
+        return self._nprocs
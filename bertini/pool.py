@@ -0,0 +1,181 @@
+from __future__ import print_function
+
+from concurrent.futures import Future
+
+from naglib.core.base import NAGobject
+
+# what a BertiniRun learns by running, copied back onto the caller's run
+_FINISHED = ('_bertini', '_cache_key', '_complete', '_executable', '_input_files',
+             '_inputf', '_main_data', '_output', '_path_stats', '_timings',
+             '_witness_data')
+
+def _run(bertini_run, rerun_on_fail=False, parallel=True):
+    """
+    Run `bertini_run' and return its results along with its finished
+    state; module level so process pools can pickle it
+
+    If `parallel' is False, a copy of the run is made to run serially,
+    leaving the caller's run as it was.
+    """
+    from copy import copy
+
+    if not parallel and bertini_run.parallel:
+        bertini_run = copy(bertini_run)
+        bertini_run.parallel = False
+    data = bertini_run.run(rerun_on_fail=rerun_on_fail)
+    state = dict([(k, v) for k, v in vars(bertini_run).items() if k in _FINISHED])
+
+    return data, state
+
+class _RunFuture(Future):
+    """
+    The Future of a run in a BertiniPool: it holds what the run's `run'
+    method returns, and once the run finishes, the caller's BertiniRun
+    is brought up to date (e.g., complete, output and timings) from the
+    copy that actually ran
+    """
+    def __init__(self, inner, bertini_run):
+        super(_RunFuture, self).__init__()
+        self._inner = inner
+        self._bertini_run = bertini_run
+        inner.add_done_callback(self._finish)
+
+    def _finish(self, inner):
+        if inner.cancelled():
+            super(_RunFuture, self).cancel()
+            return
+        exc = inner.exception()
+        if exc is not None:
+            self.set_exception(exc)
+            return
+        data, state = inner.result()
+        vars(self._bertini_run).update(state)
+        self.set_result(data)
+
+    def cancel(self):
+        """
+        Cancel the run if it hasn't started
+        """
+        if not self._inner.cancel():
+            return False
+        return super(_RunFuture, self).cancel()
+
+class BertiniPool(NAGobject):
+    """
+    Run many BertiniRuns at once in a pool of threads or processes
+
+    Each BertiniRun works in its own directory, so runs do not interfere
+    with one another. A run spends most of its time waiting on Bertini,
+    so threads are usually enough; use processes if parsing results
+    becomes the bottleneck.
+    """
+    def __init__(self, max_workers=None, processes=False, mpi=False):
+        """
+        Initialize the BertiniPool object
+
+        Keyword arguments:
+        max_workers -- optional int, the number of runs going at once;
+                       defaults to the number of processors
+        processes   -- optional boolean, use a process pool rather than
+                       a thread pool
+        mpi         -- optional boolean, let parallel runs use mpirun;
+                       off by default, since the pool already fills the
+                       processors
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        from naglib import PCOUNT
+
+        if max_workers is None:
+            max_workers = PCOUNT
+        if max_workers < 1:
+            msg = "specify at least one worker"
+            raise ValueError(msg)
+
+        if processes:
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._max_workers = max_workers
+        self._processes = processes
+        self._mpi = mpi
+        self._futures = []
+
+    def __enter__(self):
+        """
+        x.__enter__() <==> with x
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Shut the pool down, waiting for outstanding runs
+        """
+        self.shutdown(wait=True)
+        return False
+
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        return 'BertiniPool({0}, processes={1})'.format(self._max_workers, self._processes)
+
+    def as_completed(self, futures=None, timeout=None):
+        """
+        Yield futures as their runs finish
+
+        Keyword arguments:
+        futures -- optional iterable of futures from this pool; defaults
+                   to every run submitted since the last such call
+        timeout -- optional float, seconds to wait before raising
+                   concurrent.futures.TimeoutError
+        """
+        from concurrent.futures import as_completed
+
+        if futures is None:
+            futures = self._futures
+            self._futures = []
+        return as_completed(futures, timeout=timeout)
+
+    def map(self, runs, rerun_on_fail=False, timeout=None):
+        """
+        Run each of `runs' and return an iterator over their results,
+        in the order given
+        """
+        futures = [self._submit(r, rerun_on_fail) for r in runs]
+
+        def results():
+            for f in futures:
+                yield f.result(timeout=timeout)
+        return results()
+
+    def shutdown(self, wait=True):
+        """
+        Stop accepting runs and free the workers once outstanding runs
+        finish
+        """
+        self._executor.shutdown(wait=wait)
+
+    def submit(self, bertini_run, rerun_on_fail=False):
+        """
+        Schedule `bertini_run' and return a concurrent.futures.Future
+        holding what its `run' method returns
+        """
+        future = self._submit(bertini_run, rerun_on_fail)
+        self._futures.append(future)
+
+        return future
+
+    def _submit(self, bertini_run, rerun_on_fail):
+        if self._processes:
+            # render the input here, where it's kept, not in a worker
+            bertini_run._input_section(bertini_run._system)
+        inner = self._executor.submit(_run, bertini_run, rerun_on_fail, self._mpi)
+
+        return _RunFuture(inner, bertini_run)
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+    @property
+    def processes(self):
+        return self._processes
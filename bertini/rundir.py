@@ -0,0 +1,239 @@
+from __future__ import print_function
+
+import os
+from shutil import rmtree
+from threading import Lock
+from weakref import WeakSet
+
+from naglib.core.base import NAGobject
+
+# every manager, so their directories can be removed at exit
+_managers = WeakSet()
+
+def _empty(dirname):
+    """
+    Remove everything inside `dirname', leaving the directory itself
+    """
+    for f in os.listdir(dirname):
+        path = os.path.join(dirname, f)
+        if os.path.isdir(path) and not os.path.islink(path):
+            rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def _size(dirname):
+    """
+    Return the number of bytes in the files under `dirname'
+    """
+    total = 0
+    for root, dirs, files in os.walk(dirname):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total
+
+_default = None
+
+def default_manager():
+    """
+    Return the RunDirectoryManager used by BertiniRuns unless told
+    otherwise
+    """
+    global _default
+    if _default is None:
+        _default = RunDirectoryManager()
+    return _default
+
+def cleanup():
+    """
+    Clean up after every RunDirectoryManager; called at exit
+    """
+    for manager in list(_managers):
+        manager.cleanup()
+
+class RunDirectoryManager(NAGobject):
+    """
+    Hand out working directories for BertiniRuns and clean up after them
+
+    Released directories are emptied and handed out again rather than
+    removed, up to `max_free' of them. Directories of failed runs are
+    kept for debugging under `failed' in the base directory, oldest
+    first out once they take up more than `keep_failed' bytes. At exit,
+    only directories this manager handed out are removed, so processes
+    may share a base directory.
+    """
+    def __init__(self, basedir=None, shm=False, keep_failed=64*2**20, max_free=16):
+        """
+        Initialize the RunDirectoryManager object
+
+        Keyword arguments:
+        basedir     -- optional string, the directory to work under;
+                       defaults to TEMPDIR
+        shm         -- optional boolean, work in memory under /dev/shm
+                       if it exists (ignored if `basedir' is given)
+        keep_failed -- optional int, bytes of failed runs to keep
+        max_free    -- optional int, released directories to keep for
+                       reuse
+        """
+        from naglib.startup import TEMPDIR
+
+        if basedir is None:
+            if shm and os.path.isdir('/dev/shm'):
+                basedir = '/dev/shm/naglib'
+            else:
+                basedir = TEMPDIR
+        if not os.path.isdir(basedir):
+            try:
+                os.makedirs(basedir)
+            except OSError:
+                # another process got there first
+                if not os.path.isdir(basedir):
+                    raise
+
+        self._basedir = basedir
+        self._keep_failed = keep_failed
+        self._max_free = max_free
+        self._live = set()
+        self._failed = set()
+        self._free = []
+        self._lock = Lock()
+        _managers.add(self)
+
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        return 'RunDirectoryManager({0})'.format(repr(self._basedir))
+
+    def __reduce__(self):
+        """
+        Support pickling, e.g., to send a BertiniRun to a process pool;
+        the copy starts out with no directories of its own
+        """
+        if self is _default:
+            return (default_manager, ())
+        return (self.__class__, (self._basedir, False, self._keep_failed, self._max_free))
+
+    def _retain(self, dirname):
+        """
+        Move the directory of a failed run under `failed', then trim the
+        failed runs kept to `keep_failed' bytes
+        """
+        failed_dir = self.failed_dir
+        if not os.path.isdir(failed_dir):
+            try:
+                os.makedirs(failed_dir)
+            except OSError:
+                pass
+        try:
+            os.rename(dirname, os.path.join(failed_dir, os.path.basename(dirname)))
+        except OSError:
+            rmtree(dirname, ignore_errors=True)
+            return
+
+        kept = []
+        for d in os.listdir(failed_dir):
+            path = os.path.join(failed_dir, d)
+            try:
+                kept.append((os.path.getmtime(path), _size(path), path))
+            except OSError:
+                continue
+        kept.sort()
+        total = sum([k[1] for k in kept])
+        while total > self._keep_failed and kept:
+            mtime, size, path = kept.pop(0)
+            rmtree(path, ignore_errors=True)
+            total -= size
+
+    def acquire(self):
+        """
+        Return an empty directory for a run
+        """
+        from tempfile import mkdtemp
+
+        with self._lock:
+            while self._free:
+                dirname = self._free.pop()
+                if os.path.isdir(dirname):
+                    self._live.add(dirname)
+                    return dirname
+        dirname = mkdtemp(dir=self._basedir)
+        with self._lock:
+            self._live.add(dirname)
+        return dirname
+
+    def cleanup(self):
+        """
+        Remove every directory handed out and not yet released, keeping
+        those of failed runs; called at exit
+        """
+        from naglib.startup import NAGLIB_DEBUG
+
+        with self._lock:
+            live = list(self._live)
+            free = list(self._free)
+            self._live = set()
+            self._free = []
+        if NAGLIB_DEBUG:
+            return
+
+        for dirname in free:
+            rmtree(dirname, ignore_errors=True)
+        for dirname in live:
+            if dirname in self._failed and self._keep_failed > 0:
+                self._retain(dirname)
+            else:
+                rmtree(dirname, ignore_errors=True)
+        self._failed = set()
+
+    def fail(self, dirname):
+        """
+        Mark `dirname' as the directory of a failed run, to be kept
+        when it is released
+        """
+        with self._lock:
+            self._failed.add(dirname)
+
+    def release(self, dirname):
+        """
+        Give back a directory once its run's files are no longer needed
+        """
+        with self._lock:
+            if dirname not in self._live:
+                return
+            self._live.discard(dirname)
+            failed = dirname in self._failed
+            self._failed.discard(dirname)
+            reuse = not failed and len(self._free) < self._max_free
+
+        if not os.path.isdir(dirname):
+            return
+        if failed and self._keep_failed > 0:
+            self._retain(dirname)
+        elif reuse:
+            _empty(dirname)
+            with self._lock:
+                self._free.append(dirname)
+        else:
+            rmtree(dirname, ignore_errors=True)
+
+    @property
+    def basedir(self):
+        return self._basedir
+    @property
+    def failed_dir(self):
+        return os.path.join(self._basedir, 'failed')
+    @property
+    def keep_failed(self):
+        return self._keep_failed
+    @keep_failed.setter
+    def keep_failed(self, size):
+        self._keep_failed = size
+    @property
+    def live(self):
+        return sorted(self._live)
@@ -0,0 +1,86 @@
+from __future__ import print_function
+
+import numpy as np
+
+def parameter_sweep(system, targets, workers=None, start=None, start_parameters=None, processes=False):
+    """
+    Solve a parameterized system at each of many parameter values with
+    Bertini
+
+    Unless `start' and `start_parameters' are given, one ab initio run
+    (ParameterHomotopy:1) finds the solutions at random complex
+    parameters. Its solutions are then tracked to each row of
+    `targets' with ParameterHomotopy:2 runs, `workers' at a time.
+
+    Keyword arguments:
+    system           -- PolynomialSystem with parameters
+    targets          -- array-like of shape (num_targets, num_parameters)
+    workers          -- optional int, runs going at once; defaults to
+                        the number of processors
+    start            -- optional start points, as for BertiniRun
+    start_parameters -- optional parameter values at the start points
+    processes        -- optional boolean, use a process pool
+
+    Yields (index, solutions) pairs as runs finish, where index is the
+    row of `targets' and solutions is an array with one solution per row
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from naglib.core.base import AffinePoint
+    from naglib.bertini.pool import BertiniPool
+    from naglib.bertini.sysutils import BertiniRun
+
+    num_params = len(system.parameters)
+    if not num_params:
+        msg = "system has no parameters to sweep"
+        raise ValueError(msg)
+    if (start is None) != (start_parameters is None):
+        msg = "specify both start points and start parameters or neither"
+        raise ValueError(msg)
+    targets = np.asarray(targets, dtype=np.complex128).reshape(-1, num_params)
+
+    if start is None:
+        ab_initio = BertiniRun(system, BertiniRun.TZERODIM,
+                               config={'ParameterHomotopy':1},
+                               as_array=True)
+        try:
+            start, start_parameters = ab_initio.run()
+        finally:
+            ab_initio.close()
+
+    pool = BertiniPool(workers, processes=processes)
+    # keep a couple of runs queued per worker rather than creating a
+    # run directory for every target up front; each run gives its
+    # directory back as soon as its solutions are read
+    max_pending = 2*pool.max_workers
+    pending = {}
+    runs = {}
+    index = 0
+    try:
+        while index < len(targets) or pending:
+            while index < len(targets) and len(pending) < max_pending:
+                run = BertiniRun(system, BertiniRun.TZERODIM,
+                                 config={'ParameterHomotopy':2},
+                                 start=start,
+                                 start_parameters=start_parameters,
+                                 final_parameters=AffinePoint(targets[index]),
+                                 as_array=True)
+                future = pool.submit(run)
+                pending[future] = index
+                runs[future] = run
+                index += 1
+
+            done = wait(list(pending.keys()), return_when=FIRST_COMPLETED)[0]
+            for future in done:
+                run = runs.pop(future)
+                try:
+                    solutions = future.result().array
+                finally:
+                    run.close()
+                yield pending.pop(future), solutions
+    finally:
+        # the caller may stop early
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+        for run in runs.values():
+            run.close()
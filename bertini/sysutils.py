@@ -2,54 +2,63 @@ from __future__ import print_function
 
 from subprocess import check_output, CalledProcessError
 
-from naglib.startup import TOL, TEMPDIR as basedir
-from naglib.core.base import NAGobject
-from naglib.exceptions import BertiniError, NoBertiniException
+from numpy import ndarray
 
-def __os():
-    from sys import platform
-
-    if platform.startswith('win'):
-        return 'WINDOWS'
-    elif platform.startswith('cygwin'):
-        return 'CYGWIN'
-    elif platform.startswith('linux'):
-        return 'LINUX'
-    elif platform.startswith('darwin'):
-        return 'OSX'
-
-def __has_bertini():
-    platform = __os()
-    if platform == 'WINDOWS':
-        cmd = 'where.exe'
-    else:
-        cmd = 'which'
+from naglib.startup import TOL
+from naglib.core.base import NAGobject, PointArray
+from naglib.exceptions import BertiniError, NoBertiniException
 
+def _which(program):
+    """
+    Return the full path of `program' on the PATH, or '' if it isn't there
+    """
     try:
-        bertinipath = check_output([cmd, 'bertini'], universal_newlines=True)
-    except CalledProcessError:
-        bertinipath = ''
-
-    return bertinipath.strip()
-
-def __has_mpi():
-    platform = __os()
-    if platform == 'WINDOWS':
-        cmd = 'where.exe'
+        from shutil import which
+    except ImportError: # Python 2
+        from distutils.spawn import find_executable as which
+
+    return which(program) or ''
+
+def _discover(name):
+    """
+    Find the value of BERTINI, MPIRUN or PCOUNT: $NAGLIB_BERTINI,
+    $NAGLIB_MPIRUN or $NAGLIB_PCOUNT if set, otherwise the program on the
+    PATH or the number of processors
+    """
+    from os import getenv
+
+    value = getenv('NAGLIB_' + name)
+    if name == 'PCOUNT':
+        from multiprocessing import cpu_count
+        if value:
+            try:
+                count = int(value)
+            except ValueError:
+                count = 0
+            if count > 0:
+                return count
+            from warnings import warn
+            msg = "NAGLIB_PCOUNT should be a positive integer, not {0}; using the number of processors".format(repr(value))
+            warn(msg)
+        return cpu_count()
+    elif value is not None:
+        return value
+    elif name == 'BERTINI':
+        return _which('bertini')
     else:
-        cmd = 'which'
+        return _which('mpirun')
 
-    try:
-        mpipath = check_output([cmd, 'mpirun'], universal_newlines=True)
-    except CalledProcessError:
-        mpipath = ''
-
-    return mpipath.strip()
-
-def __proc_count():
-    from multiprocessing import cpu_count
+_DISCOVERED = ('BERTINI', 'MPIRUN', 'PCOUNT')
 
-    return cpu_count()
+def __getattr__(name):
+    # BERTINI, MPIRUN and PCOUNT are found on first use, sparing every
+    # import the search
+    if name in _DISCOVERED:
+        value = _discover(name)
+        globals()[name] = value
+        return value
+    msg = "module {0} has no attribute {1}".format(repr(__name__), repr(name))
+    raise AttributeError(msg)
 
 def __proc_err_output(output):
     lines = output.split('\n')
@@ -66,9 +75,112 @@ def __proc_err_output(output):
         # strip 'Bertini will now exit due to this error'
         return '\n'.join(lines[dex:-1])
 
-BERTINI = __has_bertini()
-MPIRUN  = __has_mpi()
-PCOUNT  = __proc_count()
+import sys
+if sys.version_info < (3, 7):
+    # no module __getattr__, so find them now
+    BERTINI, MPIRUN, PCOUNT = [_discover(name) for name in _DISCOVERED]
+del sys
+
+def _render_input(system, input_form):
+    """
+    Return the lines of a Bertini INPUT section for `system' in
+    `input_form', one of 'factor', 'expand', 'raw' or 'slp'
+    """
+    from re import sub as resub
+
+    variables    = system.variables
+    parameters   = system.parameters
+    homvar       = system.homvar
+    num_polys    = system.shape[0]
+
+    str_vars = [str(v) for v in variables]
+    str_pars = [str(p) for p in parameters]
+
+    poly_names = ['f{0}'.format(i+1) for i in range(num_polys)]
+    if input_form == 'slp':
+        poly_lines = system.slp().bertini_lines(poly_names)
+    else:
+        if input_form == 'factor':
+            polynomials = [p.factor() for p in system.polynomials]
+        elif input_form == 'expand':
+            polynomials = [p.expand() for p in system.polynomials]
+        else:
+            polynomials = system.polynomials
+        str_poly = [str(p) for p in polynomials]
+        str_poly = [resub(string=p, pattern=r'\*\*', repl='^') for p in str_poly]
+        # e.g., 'f1 = x^2 - 1;'
+        poly_lines = ['{0} = {1};'.format(n, p) for n, p in zip(poly_names, str_poly)]
+
+    poly_list = ','.join([f for f in poly_names])
+    vars_list = ','.join([v for v in str_vars])
+    pars_list = ','.join([p for p in str_pars])
+
+    lines = ['INPUT']
+    if parameters:
+        lines.append('parameter {0};'.format(pars_list))
+    if homvar:
+        lines.append('hom_variable_group {0};'.format(vars_list))
+    else:
+        lines.append('variable_group {0};'.format(vars_list))
+    lines.append('function {0};'.format(poly_list))
+    lines += poly_lines
+    lines.append('END')
+
+    return lines
+
+def _as_points(points):
+    """
+    Return `points' as a sequence of points: tuples, lists, PointArrays
+    and 2-dimensional arrays already are; a single point, including a
+    1-dimensional array, is wrapped in a list
+    """
+    if isinstance(points, ndarray) and points.ndim == 1:
+        return [points]
+    if type(points) in (tuple, list) or isinstance(points, (PointArray, ndarray)):
+        return points
+    return [points]
+
+def _witness_point(point, comp_isprojective, homogeneous):
+    """
+    Build a WitnessPoint from a point parsed out of witness_data, for a
+    system which is `homogeneous' or not
+    """
+    from naglib.core.base import AffinePoint, ProjectivePoint
+    from naglib.core.witnessdata import WitnessPoint
+
+    hcoord = None
+    if comp_isprojective:
+        hcoord = point['coordinates']
+        if homogeneous:
+            coord = ProjectivePoint(hcoord)
+        else:
+            coord = ProjectivePoint(hcoord).dehomogenize()
+    else:
+        coord = AffinePoint(point['coordinates'])
+
+    return WitnessPoint(coord, point['component number'],
+                        corank=point['corank'],
+                        condition_number=point['condition number'],
+                        smallest_nonzero=point['smallest nonzero'],
+                        largest_zero=point['largest zero'],
+                        point_type=point['type'],
+                        multiplicity=point['multiplicity'],
+                        deflations=point['deflations'],
+                        precision=point['precision'],
+                        last_approximation=point['last approximation'],
+                        homogeneous_coordinates=hcoord)
+
+def _load_witness_points(witness_data, i, comp_id, comp_isprojective, homogeneous):
+    """
+    Decode the witness points of a single component from a
+    LazyWitnessData; bound to the witness data alone, so lazy witness
+    sets don't keep their BertiniRun alive
+    """
+    if witness_data.closed:
+        msg = "witness data {0} was closed with its run; load the witness points before closing the run".format(repr(witness_data.filename))
+        raise ValueError(msg)
+    points = witness_data.points(i, comp_id)
+    return [_witness_point(p, comp_isprojective, homogeneous) for p in points]
 
 class BertiniRun(NAGobject):
     TEVALP    = -4
@@ -101,6 +213,9 @@ class BertiniRun(NAGobject):
             self._parallel = True
         else:
             self._parallel = False
+        # allow the user to keep a parallel run off MPI
+        if 'parallel' in kkeys and not kwargs['parallel']:
+            self._parallel = False
 
         # check to see if tracktype jives with kwargs
         msg = ''
@@ -109,7 +224,7 @@ class BertiniRun(NAGobject):
             msg = "specify a point or points to evaluate with the keyword argument `start'"
         elif 'start' in kkeys:
             start = kwargs['start']
-            if type(start) not in (list, tuple):
+            if type(start) not in (list, tuple) and not isinstance(start, (PointArray, ndarray)):
                 start = [start]
             self._start = start
         ## component required
@@ -137,6 +252,75 @@ class BertiniRun(NAGobject):
         else:
             self._tol = TOL
 
+        # stream solutions: True for one point at a time, or an int
+        # to yield NumPy blocks of that many points
+        if 'stream' in kkeys:
+            self._stream = kwargs['stream']
+        else:
+            self._stream = False
+
+        # reuse the output of identical runs: True for the default
+        # cache, a ResultCache, or False (the default) to always run
+        # Bertini; off unless asked for, since runs from random starts
+        # would otherwise give the same result every time
+        if 'cache' in kkeys:
+            cache = kwargs['cache']
+        else:
+            cache = False
+        if cache is True:
+            from naglib.bertini.cache import default_cache
+            cache = default_cache()
+        elif cache is False:
+            cache = None
+        self._cache = cache
+
+        # how to start Bertini: a Launcher, or None for the default
+        if 'launcher' in kkeys and kwargs['launcher'] is not None:
+            self._launcher = kwargs['launcher']
+        else:
+            from naglib.bertini.launch import default_launcher
+            self._launcher = default_launcher()
+
+        # where to get working directories from
+        if 'rundirs' in kkeys:
+            rundirs = kwargs['rundirs']
+        else:
+            from naglib.bertini.rundir import default_manager
+            rundirs = default_manager()
+        self._rundirs = rundirs
+
+        # read points into a single array rather than SymPy points
+        if 'as_array' in kkeys:
+            self._as_array = kwargs['as_array']
+        else:
+            self._as_array = False
+
+        # index witness_data and decode points only on access
+        if 'lazy' in kkeys:
+            self._lazy = kwargs['lazy']
+        else:
+            self._lazy = False
+
+        # how to write the polynomials: 'factor' to write each factored,
+        # 'expand' to write each expanded, 'raw' to write them as they
+        # are, or 'slp' to share common subexpressions as Bertini
+        # functions
+        if 'input_form' in kkeys:
+            input_form = kwargs['input_form']
+        else:
+            input_form = 'factor'
+        if input_form not in ('factor', 'expand', 'raw', 'slp'):
+            msg = "specify an input form of 'factor', 'expand', 'raw' or 'slp'"
+            raise ValueError(msg)
+        if input_form == 'slp':
+            # a straight-line program only has registers for these
+            num_gens = len(system.variables) + len(system.parameters)
+            others = system._gens()[num_gens:]
+            if others:
+                msg = "can't write a straight-line program with symbols {0}, which are neither variables nor parameters".format(others)
+                raise ValueError(msg)
+        self._input_form = input_form
+
         # parameter homotopy
         self._parameter_homotopy = {'key':'', 'arg':0}
         if 'parameterhomotopy' in ckeys:
@@ -162,44 +346,42 @@ class BertiniRun(NAGobject):
             raise KeyError(msg)
 
         if 'start' in kkeys:
-            start = kwargs['start']
-            if type(start) not in (tuple, list):
-                start = [start]
+            start = _as_points(kwargs['start'])
             # this doesn't go in self._parameter_homotopy because other kinds of run use start files
             self._start = start
         if 'start_parameters' in kkeys:
-            startp = kwargs['start_parameters']
-            if type(startp) not in (tuple, list):
-                startp = [startp]
+            startp = _as_points(kwargs['start_parameters'])
             self._parameter_homotopy['start parameters'] = startp
         else:
             startp = None
         if 'final_parameters' in kkeys:
-            finalp = kwargs['final_parameters']
-            if type(finalp) not in (tuple, list):
-                finalp = [finalp]
+            finalp = _as_points(kwargs['final_parameters'])
             self._parameter_homotopy['final parameters'] = finalp
         else:
             finalp = None
 
         # if a system specifies one of start parameters or final parameters it must specify the other
-        if (startp and not finalp) or (finalp and not startp):
+        # (len rather than truth, which arrays don't have)
+        has_startp = startp is not None and len(startp) > 0
+        has_finalp = finalp is not None and len(finalp) > 0
+        if has_startp != has_finalp:
             msg = "specify both start parameters and final parameters or neither"
             raise BertiniError(msg)
 
         # user did not specify start or final parameters
         if 'parameterhomotopy' in ckeys and self._parameter_homotopy['arg'] > 1:
-            if not (startp or finalp):
+            if not (has_startp or has_finalp):
                 msg = "specify start and/or final parameters with the keyword arguments `start_parameters' and/or `final_parameters'"
                 raise KeyError(msg)
 
-        from tempfile import mkdtemp
-        self._dirname = mkdtemp(prefix=basedir)
+        self._dirname = rundirs.acquire()
         self._bertini = BERTINI
         self._system = system
         self._config = config
         self._complete = False
         self._inputf = []
+        self._timings = {}
+        self._path_stats = None
 
     def _parse_witness_data(self, filename):
         """
@@ -208,210 +390,9 @@ class BertiniRun(NAGobject):
         Keyword arguments:
         filename -- string, path to witness_data file
         """
-        from os.path import isfile
-        from sympy import I, Integer, Float, Rational, Matrix
-        from naglib.core.misc import dps, striplines
-        from naglib.exceptions import UnclassifiedException
-
-        if not isfile(filename):
-            msg = "{0} does not exist".format(filename)
-            raise IOError(msg)
-
-        fh = open(filename, 'r')
-        lines = striplines(fh.readlines())
-        fh.close()
-
-        num_vars, nonempty_codims = int(lines[0]), int(lines[1])
-        # previous line includes additional homogenizing variable(s),
-        # as appropriate
-        lines = lines[2:]
-
-        # following block represents a single codim; repeated for each
-        codims = []
-        for i in range(nonempty_codims):
-            codim = int(lines[0])
-            codims.append({'codim':codim})
-            num_points = int(lines[1])
-            lines = lines[2:]
-            # following block represents a single point; repeated for each
-            pts = []
-            for j in range(num_points):
-                prec = int(lines[0])
-
-                lines = lines[1:]
-                pt = []
-                for k in range(num_vars):
-                    real,imag = lines[k].split(' ')
-                    pt.append(Float(real, dps(real)) + I*Float(imag, dps(imag)))
-                pt = Matrix(pt)
-                lines = lines[num_vars:]
-                # the next point is the last approximation of the point
-                # on the path before convergence
-                prec = int(lines[0])
-                lines = lines[1:]
-                approx_pt = []
-                for k in range(num_vars):
-                    real,imag = lines[k].split(' ')
-                    approx_pt.append(Float(real, dps(real)) + I*Float(imag, dps(imag)))
-
-                lines = lines[num_vars:]
-                condition_number = float(lines[0])
-                corank = int(lines[1]) # corank of Jacobian at this point
-                smallest_nonzero_singular = float(lines[2])
-                largest_zero_singular = float(lines[3])
-                pt_type = int(lines[4])
-                multiplicity = int(lines[5])
-                component_number = int(lines[6])
-                if component_number == -1:
-                    msg = "components in {0} have unclassified points".format(filename)
-                    raise UnclassifiedException(msg)
-                deflations = int(lines[7])
-                lines = lines[8:]
-                pts.append({'coordinates':pt,
-                            'corank':corank,
-                            'condition number':condition_number,
-                            'smallest nonzero':smallest_nonzero_singular,
-                            'largest zero':largest_zero_singular,
-                            'type':pt_type,
-                            'multiplicity':multiplicity,
-                            'component number':component_number,
-                            'deflations':deflations,
-                            'precision':prec,
-                            'last approximation':approx_pt})
-            codims[-1]['points'] = pts
-
-        # -1 designates the end of witness points
-        lines = lines[1:]
-
-        INT = 0
-        DOUBLE = 1
-        RATIONAL = 2
-
-        # remaining data is related to slices, randomization,
-        # homogenization, and patches
-        num_format = int(lines[0])
-        # previous line describes format for remainder of data
-        lines = lines[1:]
-
-        # the following block is repeated for each nonempty codim.
-        # first, matrix A used for randomization
-        # second, matrix W
-        for i in range(nonempty_codims):
-            num_rows, num_cols = lines[0].split(' ')
-            num_rows = int(num_rows)
-            num_cols = int(num_cols)
-            AW_size = num_rows*num_cols
-
-            lines = lines[1:]
-
-            if AW_size == 0:
-                A = None
-                W = None
-            else:
-                A = lines[:AW_size]
-                lines = lines[AW_size:]
-                W = lines[:AW_size]
-                lines = lines[AW_size:]
-
-                A = [a.split(' ') for a in A] # A is complex-valued
-                if num_format == INT:
-                    A = [Integer(a[0]) + I*Integer(a[1]) for a in A]
-                elif num_format == DOUBLE:
-                    for j in range(len(A)):
-                        a = A[j]
-                        real,imag = a.split(' ')
-                        A[j] = Float(real, dps(real)) + I*Float(imag, dps(imag))
-                elif num_format == RATIONAL:
-                    A = [Rational(a[0]) + I*Rational(a[1]) for a in A]
-                A = [A[j:j+num_cols] for j in range(0,AW_size,num_cols)]
-                A = Matrix(A)
-
-                W = [int(w) for w in W] # W is integer-valued
-                W = [W[j:j+num_cols] for j in range(0,AW_size,num_cols)]
-                W = Matrix(W)
-
-            # third, a vector H used for homogenization
-            # random if projective input
-            H_size = int(lines[0])
-            lines = lines[1:]
-            H = lines[:H_size]
-            H = [h.split(' ') for h in H] # H is complex-valued
-            if num_format == INT:
-                H = [Integer(h[0]) + I*Integer(h[1]) for h in H]
-            elif num_format == DOUBLE:
-                for j in range(len(H)):
-                    h = H[j]
-                    real,imag = h.split(' ')
-                    H[j] = Float(real, dps(real)) + I*Float(imag, dps(imag))
-            elif num_format == RATIONAL:
-                H = [Rational(h[0]) + I*Rational(h[1]) for h in H]
-
-            H = Matrix(H)
-            lines = lines[H_size:]
-
-            # fourth, a number homVarConst
-            # 0 for affine, random for projective
-            hvc = lines[0].split(' ')
-            if num_format == INT:
-                hvc = Integer(hvc[0]) + I*Integer(hvc[1])
-            elif num_format == DOUBLE:
-                real,imag = hvc
-                hvc = Float(real, dps(real)) + I*Float(imag, dps(imag))
-            elif num_format == RATIONAL:
-                hvc = Rational(hvc[0]) + I*Rational(hvc[1])
-
-            lines = lines[1:]
-
-            # fifth, matrix B for linear slice coefficients
-            num_rows, num_cols = lines[0].split(' ')
-            num_rows, num_cols = int(num_rows), int(num_cols)
-            B_size = num_rows*num_cols
-            lines = lines[1:]
-
-            if B_size == 0:
-                B = None
-            else:
-                B = lines[:B_size]
-                lines = lines[B_size:]
-
-                B = [b.split(' ') for b in B] # B is complex-valued
-                if num_format == INT:
-                    B = [Integer(b[0]) + I*Integer(b[1]) for b in B]
-                elif num_format == DOUBLE:
-                    for j in range(len(B)):
-                        real,imag = B[j]
-                        B[j] = Float(real, dps(real)) + I*Float(imag, dps(imag))
-                elif num_format == RATIONAL:
-                    B = [Rational(b[0]) + I*Rational(b[1]) for b in B]
-                B = [B[j:j+num_cols] for j in range(0,B_size,num_cols)]
-                B = Matrix(B)
-
-            # sixth and finally, vector p for patch coefficients
-            p_size = int(lines[0])
-            lines = lines[1:]
+        from naglib.bertini.fileutils import parse_witness_data
 
-            p = lines[:p_size]
-            lines = lines[p_size:]
-
-            p = [q.split(' ') for q in p]
-            if num_format == INT:
-                p = [Integer(q[0]) + I*Integer(q[1]) for q in p]
-            elif num_format == DOUBLE:
-                for j in range(len(p)):
-                    real,imag = p[j]
-                    p[j] = Float(real, dps(real)) + I*Float(imag, dps(imag))
-            elif num_format == RATIONAL:
-                p = [Rational(q[0]) + I*Rational(q[1]) for q in p]
-
-            p = Matrix(p)
-            codims[i]['A'] = A
-            codims[i]['W'] = W
-            codims[i]['H'] = H
-            codims[i]['homVarConst'] = hvc
-            codims[i]['slice'] = B
-            codims[i]['p'] = p
-
-        return codims
+        return parse_witness_data(filename)
 
     def _proc_err_output(self, output):
         lines = output.split('\n')
@@ -431,11 +412,11 @@ class BertiniRun(NAGobject):
     def _recover_components(self, witness_data):
         """
         """
+        from functools import partial
         from sympy import sympify
         from naglib.core.algebra import LinearSlice
-        from naglib.core.base import AffinePoint, ProjectivePoint
         from naglib.core.geometry import IrreducibleComponent
-        from naglib.core.witnessdata import WitnessPoint, WitnessSet
+        from naglib.core.witnessdata import WitnessSet
         system = self._system
         variables = system.variables
 #        if system.homvar:
@@ -449,13 +430,21 @@ class BertiniRun(NAGobject):
             homvar = sympify('_' + str(homvar))
         homsys  = system.homogenize(homvar)
         homvars = homsys.variables
+        homogeneous = bool(system.homvar)
+
+        from naglib.bertini.fileutils import LazyWitnessData
+        from naglib.core.witnessdata import LazyWitnessPoints
+        lazy = isinstance(witness_data, LazyWitnessData)
 
         components = []
 
-        for c in witness_data:
+        for i in range(len(witness_data)):
+            if lazy:
+                c = witness_data.codim_data(i)
+            else:
+                c = witness_data[i]
             codim       = c['codim']
             homVarConst = c['homVarConst']
-            points      = c['points']
             coeffs      = c['slice']
             rand_mat    = c['A']
             homog_mat   = c['W']
@@ -466,7 +455,7 @@ class BertiniRun(NAGobject):
             comp_isprojective = homVarConst == 0
 
             hslice = None
-            if coeffs:
+            if coeffs is not None:
                 if comp_isprojective:
                     hslice = LinearSlice(coeffs, homvars, homvar)
                     if not system.homvar:
@@ -478,32 +467,22 @@ class BertiniRun(NAGobject):
 
             dim_list = {}
 
-            hcoord = None
-            for point in points:
-                comp_id = point['component number']
-                if comp_isprojective:
-                    hcoord = point['coordinates']
-                    if not system.homvar:
-                        coord = ProjectivePoint(hcoord).dehomogenize()
-                else:
-                    coord = AffinePoint(point['coordinates'])
-
-                wpoint = WitnessPoint(coord, comp_id,
-                                      corank=point['corank'],
-                                      condition_number=point['condition number'],
-                                      smallest_nonzero=point['smallest nonzero'],
-                                      largest_zero=point['largest zero'],
-                                      point_type=point['type'],
-                                      multiplicity=point['multiplicity'],
-                                      deflations=point['deflations'],
-                                      precision=point['precision'],
-                                      last_approximation=point['last approximation'],
-                                      homogeneous_coordinates=hcoord)
+            if lazy:
+                # points are decoded when the witness set first needs them
+                for comp_id in witness_data.components(i):
+                    count = witness_data.num_points(i, comp_id)
+                    loader = partial(_load_witness_points, witness_data, i, comp_id,
+                                     comp_isprojective, homogeneous)
+                    dim_list[comp_id] = LazyWitnessPoints(loader, count, comp_id)
+            else:
+                for point in c['points']:
+                    comp_id = point['component number']
+                    wpoint = _witness_point(point, comp_isprojective, homogeneous)
 
-                if not dim_list.has_key(comp_id):
-                    dim_list[comp_id] = []
+                    if comp_id not in dim_list:
+                        dim_list[comp_id] = []
 
-                dim_list[comp_id].append(wpoint)
+                    dim_list[comp_id].append(wpoint)
 
             for comp_id in dim_list.keys():
                 ws = WitnessSet(system.copy(),
@@ -522,6 +501,32 @@ class BertiniRun(NAGobject):
 
         return components
 
+    def _read_witness_data(self, filename):
+        """
+        Parse witness_data, or only index it if reading lazily
+        """
+        from naglib.bertini.fileutils import LazyWitnessData
+
+        if self._lazy:
+            return LazyWitnessData(filename)
+        else:
+            return self._parse_witness_data(filename)
+
+    def _read_points(self, filename, projective=False):
+        """
+        Read points from an output file, lazily if streaming
+        """
+        from naglib.bertini.fileutils import iter_points, read_points
+
+        tol = self._tol
+        stream = self._stream
+        if stream is True:
+            return iter_points(filename, tol=tol, projective=projective)
+        elif stream:
+            return iter_points(filename, chunk=stream, tol=tol, projective=projective)
+        else:
+            return read_points(filename, tol=tol, projective=projective, as_array=self._as_array)
+
     def _recover_data(self):
         """
         recover the information pertinent to a run
@@ -540,6 +545,7 @@ class BertiniRun(NAGobject):
         fh = open(main_data, 'r')
         self._main_data = striplines(fh.readlines())
         fh.close()
+        self._path_stats = None
 
         projective = not not system.homvar
 
@@ -554,7 +560,7 @@ class BertiniRun(NAGobject):
         elif tracktype == self.TZERODIM:
             finites = dirname + '/finite_solutions'
             startp = dirname + '/start_parameters'
-            finite_solutions = read_points(finites, tol=tol, projective=projective)
+            finite_solutions = self._read_points(finites, projective)
 
             ptype  = self._parameter_homotopy['arg']
             if ptype == 1:
@@ -564,22 +570,22 @@ class BertiniRun(NAGobject):
             return finite_solutions
         elif tracktype == self.TPOSDIM:
             wdfile = dirname + '/witness_data'
-            self._witness_data = self._parse_witness_data(wdfile)
+            self._witness_data = self._read_witness_data(wdfile)
             components = self._recover_components(self._witness_data)
 
             return components
         elif tracktype == self.TSAMPLE:
             wdfile = dirname + '/witness_data'
-            self._witness_data = self._parse_witness_data(wdfile)
+            self._witness_data = self._read_witness_data(wdfile)
             samplef = dirname + '/sampled'
-            sampled = read_points(samplef, tol=tol, projective=projective)
+            sampled = self._read_points(samplef, projective)
 
             return sampled
         elif tracktype == self.TMEMTEST:
             from sympy import zeros
 
             wdfile = dirname + '/witness_data'
-            self._witness_data = self._parse_witness_data(wdfile)
+            self._witness_data = self._read_witness_data(wdfile)
             inmat = dirname + '/incidence_matrix'
             fh = open(inmat, 'r')
             lines = striplines(fh.readlines())
@@ -627,7 +633,7 @@ class BertiniRun(NAGobject):
             pointsfile = dirname + '/points.out'
             #sysfile    = dirname + '/sys.out'
 
-            points = read_points(pointsfile, tol=tol, projective=projective)
+            points = self._read_points(pointsfile, projective)
             #TODO: parse linear system file and return a LinearSystem
 
             return points
@@ -646,14 +652,14 @@ class BertiniRun(NAGobject):
                         break
             if cws and config[cws] == 1:
                 wdfile = dirname + '/witness_data'
-                self._witness_data = self._parse_witness_data(wdfile)
+                self._witness_data = self._read_witness_data(wdfile)
                 components = self._recover_components(self._witness_data)
                 return components
 
             #TODO: read isosingular_summary and maybe output_isosingular
         elif tracktype == self.TREGENEXT:
             wdfile = dirname + '/witness_data'
-            self._witness_data = self._parse_witness_data(wdfile)
+            self._witness_data = self._read_witness_data(wdfile)
             components = self._recover_components(self._witness_data)
 
             return components
@@ -696,6 +702,8 @@ class BertiniRun(NAGobject):
         if not exists(dirname):
             from os import mkdir
             mkdir(dirname)
+        # every file written for Bertini, for the result cache
+        self._input_files = []
 
         ### write the system
         sysconfig = self._config.copy()
@@ -710,6 +718,7 @@ class BertiniRun(NAGobject):
             else:
                 startfile = dirname + '/start'
             fprint(start, startfile)
+            self._input_files.append(startfile)
         if self._parameter_homotopy:
             phtpy = self._parameter_homotopy
             pkeys = phtpy.keys()
@@ -717,10 +726,12 @@ class BertiniRun(NAGobject):
                 startp = phtpy['start parameters']
                 startpfile = dirname + '/start_parameters'
                 fprint(startp, startpfile)
+                self._input_files.append(startpfile)
             if 'final parameters' in pkeys:
                 finalp = phtpy['final parameters']
                 finalpfile = dirname + '/final_parameters'
                 fprint(finalp, finalpfile)
+                self._input_files.append(finalpfile)
 
         ### write out component information
         if '_component' in dir(self):
@@ -761,34 +772,28 @@ class BertiniRun(NAGobject):
         for line in lines:
             fh.write(line + '\n')
         fh.close()
+        self._input_files.append(filename)
+
+    def _input_section(self, system):
+        """
+        Return the lines of the INPUT section for `system', rendered in
+        this run's input form
+
+        The lines are kept by the system, so writing the same system
+        again (e.g., for every sample or membership test) doesn't render
+        it again.
+        """
+        input_form = self._input_form
+        return system._rendered_input(input_form, lambda s: _render_input(s, input_form))
 
     def _write_system(self, system, inputf='input', config=None):
-        from re import sub as resub
         if not config:
             config = self._config
         dirname = self._dirname
         filename = dirname + '/' + inputf
 
-        polynomials  = [p.factor() for p in system.polynomials]
-        variables    = system.variables
-        parameters   = system.parameters
-        homvar       = system.homvar
-        num_polys    = system.shape[0]
-
         options = config.keys()
 
-        str_poly = [str(p) for p in polynomials]
-        str_poly = [resub(string=p, pattern=r'\*\*', repl='^') for p in str_poly]
-        str_vars = [str(v) for v in variables]
-        str_pars = [str(p) for p in parameters]
-
-        poly_names = ['f{0}'.format(i+1) for i in range(num_polys)]
-        polys_named = zip(poly_names, str_poly)
-
-        poly_list = ','.join([f for f in poly_names])
-        vars_list = ','.join([v for v in str_vars])
-        pars_list = ','.join([p for p in str_pars])
-
         fh = open(filename, 'w')
 
         # write the CONFIG section
@@ -798,30 +803,32 @@ class BertiniRun(NAGobject):
         print('END', file=fh)
 
         # write the INPUT section
-        print('INPUT', file=fh)
-        if parameters:
-            print('parameter {0};'.format(pars_list), file=fh)
-        if homvar:
-            print('hom_variable_group {0};'.format(vars_list), file=fh)
-        else:
-            print('variable_group {0};'.format(vars_list), file=fh)
-        print('function {0};'.format(poly_list), file=fh)
-
-        for p in polys_named:
-            # p is a key-value pair, e.g., ('f1', 'x^2 - 1')
-            print('{0} = {1};'.format(p[0], p[1]), file=fh)
-        print('END', file=fh)
+        for line in self._input_section(system):
+            print(line, file=fh)
 
         # finish up
         fh.close()
+        self._input_files.append(filename)
 
         return filename
 
     def _write_witness_data(self, witness_data, dirname, filename='witness_data'):
         """
         """
-        from sympy import Integer, Float
-        fh = open(dirname + '/' + filename, 'w')
+        from numpy import number
+        from sympy import Integer, Float, sympify
+
+        # numbers parsed from DOUBLE format files are Python/NumPy types
+        native = (int, float, complex, number)
+        def real_imag(c):
+            if isinstance(c, native):
+                c = complex(c)
+                return c.real, c.imag
+            return sympify(c).as_real_imag()
+
+        filename = dirname + '/' + filename
+        fh = open(filename, 'w')
+        self._input_files.append(filename)
 
         nonempty_codims = len(witness_data)
         num_vars = len(witness_data[0]['points'][0]['coordinates'])
@@ -839,13 +846,13 @@ class BertiniRun(NAGobject):
 
                 coordinates = p['coordinates']
                 for c in coordinates:
-                    real,imag = c.as_real_imag()
+                    real,imag = real_imag(c)
                     fh.write('{0} {1}\n'.format(real, imag))
 
                 fh.write('{0}\n'.format(prec))
                 approx = p['last approximation']
                 for a in approx:
-                    real,imag = a.as_real_imag()
+                    real,imag = real_imag(a)
                     fh.write('{0} {1}\n'.format(real, imag))
                 fh.write('{0}\n'.format(p['condition number']))
                 fh.write('{0}\n'.format(p['corank']))
@@ -858,12 +865,16 @@ class BertiniRun(NAGobject):
         fh.write('-1\n\n') # -1 designates the end of witness points
 
         h1 = witness_data[0]['H'][0]
-        if type(h1) == Integer:
-            numtype = 0
-        elif type(h1) == Float:
+        if isinstance(h1, native):
             numtype = 1
         else:
-            numtype = 2
+            parts = sympify(h1).as_real_imag()
+            if all([isinstance(q, Integer) for q in parts]):
+                numtype = 0
+            elif any([isinstance(q, Float) for q in parts]):
+                numtype = 1
+            else:
+                numtype = 2
         fh.write('{0}\n'.format(numtype))
 
         for i in range(nonempty_codims):
@@ -875,12 +886,12 @@ class BertiniRun(NAGobject):
             B   = wd_codim['slice']
             P   = wd_codim['p']
 
-            if A: # also W
+            if A is not None and len(A) > 0: # also W
                 num_rows, num_cols = A.shape
                 fh.write('{0} {1}\n'.format(num_rows, num_cols))
                 for j in range(num_rows):
                     for k in range(num_cols):
-                        real, imag = A[j,k].as_real_imag()
+                        real, imag = real_imag(A[j,k])
                         fh.write('{0} {1}\n'.format(real, imag))
                 for j in range(num_rows):
                     for k in range(num_cols):
@@ -892,18 +903,18 @@ class BertiniRun(NAGobject):
             h = len(H)
             fh.write('{0}\n'.format(h))
             for j in range(h):
-                real, imag = H[j].as_real_imag()
+                real, imag = real_imag(H[j])
                 fh.write('{0} {1}\n'.format(real, imag))
 
             fh.write('\n')
-            real,imag = hvc.as_real_imag()
+            real,imag = real_imag(hvc)
             fh.write('{0} {1}\n'.format(real, imag))
-            if B:
+            if B is not None and len(B) > 0:
                 num_rows, num_cols = B.shape
                 fh.write('{0} {1}\n'.format(num_rows, num_cols))
                 for j in range(num_rows):
                     for k in range(num_cols):
-                        real, imag = B[j,k].as_real_imag()
+                        real, imag = real_imag(B[j,k])
                         fh.write('{0} {1}\n'.format(real, imag))
             else:
                 fh.write('1 0\n')
@@ -911,40 +922,100 @@ class BertiniRun(NAGobject):
             p = len(P)
             fh.write('{0}\n'.format(p))
             for j in range(p):
-                real, imag = P[j].as_real_imag()
+                real, imag = real_imag(P[j])
                 fh.write('{0} {1}\n'.format(real, imag))
 
         fh.close()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self._rundirs.fail(self._dirname)
+        self.close()
+
+    def close(self):
+        """
+        Give back the run directory; anything read lazily from it (streamed
+        points, lazy witness data) is no longer available afterward
+        """
+        from naglib.bertini.fileutils import LazyWitnessData
+
+        if '_witness_data' in dir(self) and isinstance(self._witness_data, LazyWitnessData):
+            self._witness_data.close()
+        self._rundirs.release(self._dirname)
+
+    def path_count(self):
+        """
+        Estimate the number of paths the run will track: the number of
+        start points if there are any, otherwise the Bezout number of
+        the system; None if there is no telling
+        """
+        if '_start' in dir(self):
+            return len(self._start)
+
+        system = self._system
+        try:
+            numvars = len(system.variables)
+            if system.homvar:
+                numvars -= 1
+            degrees = sorted([int(d) for d in system.degree], reverse=True)
+        except (TypeError, ValueError):
+            return None
+
+        count = 1
+        for d in degrees[:numvars]:
+            count *= d
+        return count
+
     def rerun(self, config={}):
+        """
+        Run Bertini again, with `config' updating the run's config; the
+        result cache is not consulted, so a failed or ill-conditioned
+        run is really repeated. The timings of the new attempt are added
+        to those of the run, as 'bertini[2]' and so on.
+        """
+        from naglib.bertini.timing import _call_hooks
+
         if not self._complete:
             return self.run()
         else:
             self._config.update(config)
-            return self.run()
+            data = self._run(lookup=False)
+            _call_hooks(self, self._timings)
+            return data
+
+    def _prepare_run(self):
+        """
+        Write out the input files for a run
 
-    def run(self, rerun_on_fail=False):
-        from os import chdir
+        Returns the command to run and the path of the file to feed
+        Bertini on stdin (None if there is none)
+        """
         from os.path import exists
-        # in case the user has changed any of these
+        # in case the user has changed it
         from naglib import BERTINI
-        from naglib import MPIRUN as mpirun
-        from naglib import PCOUNT as nump
+        from naglib.bertini.launch import LocalLauncher
 
-        if not BERTINI:
+        if not BERTINI and not isinstance(self._launcher, LocalLauncher):
             raise NoBertiniException()
 
         self._bertini = BERTINI
 
-        if self._parallel and mpirun:
-            cmd = mpirun
-            arg = [cmd, '-np', str(nump), self._bertini]
-        else:
-            arg = [self._bertini]
+        arg = self._launcher.command(self)
+        # the program actually run, for the result cache
+        self._executable = arg[-1]
 
         dirname = self._dirname
+        # reuse the directory, but not the output of the last run
+        if self._complete:
+            from naglib.bertini.rundir import _empty
+            _empty(dirname)
 
-        input_file = self._write_files()
+        from naglib.bertini.timing import _Phase
+        with _Phase(self._timings, 'write files'):
+            input_file = self._write_files()
 
         if exists(dirname + '/instructions'):
             stdin = dirname + '/instructions'
@@ -953,33 +1024,249 @@ class BertiniRun(NAGobject):
 
         arg += [input_file]
 
-        chdir(dirname)
-        if stdin:
-            stdin = open(stdin, 'r')
+        return arg, stdin
+
+    def _failed_paths(self):
+        """
+        Return the numbers of the paths main_data reports as failed
+        """
+        stats = self.path_stats
+        if stats is None or len(stats) == 0:
+            return []
+        return sorted(set(stats.path[stats.failure_code != 0].tolist()))
+
+    def _retry_config(self):
+        """
+        Return the config with path tracking tightened for a retry:
+        tracking tolerances and maximum step size cut, more steps allowed
+        and adaptive precision on
+        """
+        config = self._config.copy()
+        keys = dict([(k.lower(), k) for k in config.keys()])
+
+        def tighten(key, default, factor, kind=float):
+            key = keys.get(key.lower(), key)
+            config[key] = kind(float(config.get(key, default))*factor)
+
+        tighten('TrackTolBeforeEG', 1e-5, 1e-2)
+        tighten('TrackTolDuringEG', 1e-6, 1e-2)
+        tighten('MaxStepSize', 0.1, 0.1)
+        tighten('MaxNumberSteps', 10000, 10, int)
+        config[keys.get('mptype', 'MPType')] = 2
+
+        return config
+
+    def _merge_points(self, found, more):
+        """
+        Add to the points `found' those of `more' not already among them
+        """
+        from numpy import array, asarray, vstack
+        from numpy.linalg import norm
+
+        if len(more) == 0:
+            return found
+        if len(found) == 0:
+            return more
+
+        def coordinates(points):
+            if isinstance(points, (PointArray, ndarray)):
+                return asarray(points)
+            return array([p._numeric() for p in points])
+
+        old = coordinates(found)
+        new = coordinates(more)
+        keep = [i for i in range(len(new))
+                if norm(old - new[i], axis=1).min() > 1e-8*(1 + norm(new[i]))]
+
+        if isinstance(found, PointArray):
+            return found.__class__(vstack((old, new[keep])))
+        return list(found) + [more[i] for i in keep]
+
+    def _retry_failed(self, data):
+        """
+        Track the failed paths of a finished run again with tighter
+        settings, and merge what they find into `data'
+
+        The retry is a run of its own, so this run is left as it is.
+        When the run has start points, only the failed paths are
+        retracked, from a start file holding theirs. Bertini doesn't
+        report the start points of paths from a start system it made
+        itself (e.g., total degree), so then the whole run is repeated
+        with the tighter settings instead. Ab initio parameter homotopy
+        runs (ParameterHomotopy:1) aren't retried, with a warning.
+        """
+        failed = self._failed_paths()
+        if not failed or self._tracktype != self.TZERODIM or self._stream:
+            return data
+        if self._parameter_homotopy['arg'] == 1:
+            from warnings import warn
+            msg = "can't retry {0} failed paths of an ab initio parameter homotopy run; run it again to solve at new start parameters".format(len(failed))
+            warn(msg)
+            return data
+
+        config = self._retry_config()
+
+        kwargs = {'tol':self._tol, 'as_array':self._as_array,
+                  'cache':self._cache if self._cache is not None else False, 'rundirs':self._rundirs,
+                  'parallel':self._parallel, 'input_form':self._input_form}
+        if '_start' in dir(self):
+            start = self._start
+            kwargs['start'] = [start[i] for i in failed if i < len(start)]
+        if 'start parameters' in self._parameter_homotopy:
+            kwargs['start_parameters'] = self._parameter_homotopy['start parameters']
+            kwargs['final_parameters'] = self._parameter_homotopy['final parameters']
+
+        retry = BertiniRun(self._system, self._tracktype, config, **kwargs)
         try:
-            output = check_output(arg, stdin=stdin, universal_newlines=True)
-        except CalledProcessError as e:
-            msg = self._proc_err_output(e.output)
-            raise BertiniError(msg)
+            more = retry.run()
+        finally:
+            retry.close()
+            from naglib.bertini.timing import _record
+            for name in sorted(retry.timings):
+                _record(self._timings, name, retry.timings[name])
 
-        if stdin:
-            stdin.close()
+        return self._merge_points(data, more)
+
+    def _fetch_cached(self, rerun_on_fail=False, lookup=True):
+        """
+        Look for the results of this run in the result cache, unless
+        `lookup' is False (the key is still found, for storing the
+        results)
+
+        Returns whether there was a hit, and the recovered data if so
+        """
+        cache = self._cache
+        if cache is None:
+            return False, None
+
+        from naglib.bertini.timing import _Phase
+        with _Phase(self._timings, 'fetch cached'):
+            self._cache_key = cache.key(self._executable, self._input_files)
+            if lookup:
+                output = cache.fetch(self._cache_key, self._dirname)
+            else:
+                output = None
+        if output is None:
+            return False, None
+
+        try:
+            return True, self._finish_run(output, rerun_on_fail)
+        except (IOError, OSError, ValueError, IndexError, BertiniError):
+            # a truncated or corrupt entry; forget it and run Bertini
+            # after all
+            cache.discard(self._cache_key)
+            return False, None
+
+    def _store_cached(self, output):
+        """
+        Keep the output of a successful run in the result cache
+        """
+        cache = self._cache
+        if cache is None:
+            return
+        try:
+            cache.store(self._cache_key, self._dirname, self._input_files, output)
+        except (IOError, OSError):
+            pass
+
+    def _finish_run(self, output, rerun_on_fail=False):
+        """
+        Record Bertini's output and recover the results of a run
+        """
+        from naglib.bertini.timing import _Phase
 
         self._complete = True
         self._output = output
 
+        timings = self._timings
         if rerun_on_fail:
             try:
-                self._inputf = self._recover_input()
-                data = self._recover_data()
+                with _Phase(timings, 'recover input'):
+                    self._inputf = self._recover_input()
+                with _Phase(timings, 'recover data'):
+                    data = self._recover_data()
             except:
-                data = self.rerun()
+                data = self._run(lookup=False)
         else:
-            self._inputf = self._recover_input()
-            data = self._recover_data()
+            with _Phase(timings, 'recover input'):
+                self._inputf = self._recover_input()
+            with _Phase(timings, 'recover data'):
+                data = self._recover_data()
+
+        return data
+
+    def run(self, rerun_on_fail=False, retry_failed=False):
+        """
+        Run Bertini and return the results
+
+        Keyword arguments:
+        rerun_on_fail -- optional boolean, run again if the results can't
+                         be recovered
+        retry_failed  -- optional boolean, track failed paths again with
+                         tighter settings and merge in what they find;
+                         only the failed paths if the run has start
+                         points, otherwise (e.g., total degree) the
+                         whole run. Zero-dimensional runs only, and not
+                         ab initio parameter homotopies
+        """
+        from naglib.bertini.timing import _call_hooks
+
+        # phases of later attempts (reruns, retries) are added as
+        # 'bertini[2]' and so on
+        self._timings = {}
+        data = self._run(rerun_on_fail, lookup=True)
+        _call_hooks(self, self._timings)
+        if retry_failed:
+            data = self._retry_failed(data)
+
+        return data
+
+    def _run(self, rerun_on_fail=False, lookup=True):
+        """
+        Run Bertini, or fetch its output from the result cache if
+        `lookup' is True, and return the results
+        """
+        from naglib.bertini.timing import _Phase
+
+        arg, stdin = self._prepare_run()
+        hit, data = self._fetch_cached(rerun_on_fail, lookup)
+        if hit:
+            return data
+
+        # run Bertini in its own directory without changing the working
+        # directory of this process, so runs may go on concurrently
+        if stdin:
+            stdin = open(stdin, 'r')
+        try:
+            with _Phase(self._timings, 'bertini', dirname=self._dirname,
+                        input_files=self._input_files):
+                output = check_output(arg, stdin=stdin, cwd=self._dirname, universal_newlines=True)
+        except CalledProcessError as e:
+            self._rundirs.fail(self._dirname)
+            msg = self._proc_err_output(e.output)
+            raise BertiniError(msg)
+        finally:
+            if stdin:
+                stdin.close()
+
+        try:
+            data = self._finish_run(output, rerun_on_fail)
+        except:
+            self._rundirs.fail(self._dirname)
+            raise
+        self._store_cached(output)
 
         return data
 
+    def run_async(self, rerun_on_fail=False, on_output=None, retry_failed=False):
+        """
+        Return a coroutine running Bertini without blocking the event
+        loop; see naglib.bertini.aio.run_async (Python 3 only)
+        """
+        from naglib.bertini.aio import run_async
+        return run_async(self, rerun_on_fail=rerun_on_fail, on_output=on_output,
+                         retry_failed=retry_failed)
+
     @property
     def bertini(self):
         return self._bertini
@@ -987,17 +1274,56 @@ class BertiniRun(NAGobject):
     def bertini(self, bert):
         self._bertini = bert
     @property
+    def cache(self):
+        return self._cache
+    @cache.setter
+    def cache(self, cache):
+        if cache is True:
+            from naglib.bertini.cache import default_cache
+            cache = default_cache()
+        elif cache is False:
+            cache = None
+        self._cache = cache
+    @property
     def complete(self):
         return self._complete
     @property
+    def parallel(self):
+        return self._parallel
+    @parallel.setter
+    def parallel(self, parallel):
+        self._parallel = parallel
+    @property
     def dirname(self):
         return self._dirname
     @dirname.setter
     def dirname(self, name):
         self._dirname = name
     @property
+    def launcher(self):
+        return self._launcher
+    @launcher.setter
+    def launcher(self, launcher):
+        self._launcher = launcher
+    @property
+    def path_stats(self):
+        # parsed from main_data on first access
+        if self._path_stats is None and '_main_data' in dir(self):
+            from naglib.bertini.fileutils import parse_main_data
+            self._path_stats = parse_main_data(self._main_data)
+        return self._path_stats
+    @property
+    def timings(self):
+        return self._timings
+    @property
+    def rundirs(self):
+        return self._rundirs
+    @property
     def inputf(self):
         return self._inputf
     @property
+    def input_form(self):
+        return self._input_form
+    @property
     def output(self):
         return self._output
@@ -0,0 +1,139 @@
+from __future__ import print_function
+
+import os
+import time
+
+# called as hook(bertini_run, timings) when a run finishes
+_hooks = []
+
+def add_timing_hook(hook):
+    """
+    Register `hook' to be called as hook(bertini_run, timings) when a
+    BertiniRun finishes, e.g., to send the timings to a metrics system
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+def remove_timing_hook(hook):
+    """
+    Stop calling `hook' when a BertiniRun finishes
+    """
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+def _call_hooks(bertini_run, timings):
+    for hook in list(_hooks):
+        hook(bertini_run, timings)
+
+def _record(timings, name, timing):
+    """
+    Record `timing' under `name' in `timings', or, if a phase of that
+    name was already recorded (by an earlier attempt at the run), under
+    'name[2]', 'name[3]', ...
+    """
+    key = name
+    attempt = 1
+    while key in timings:
+        attempt += 1
+        key = '{0}[{1}]'.format(name, attempt)
+    timings[key] = timing
+
+def _cpu_time():
+    """
+    Return the CPU time used by this thread, or by the whole process if
+    that isn't available
+    """
+    if hasattr(time, 'thread_time'):
+        return time.thread_time()
+    elif hasattr(time, 'process_time'):
+        return time.process_time()
+    else:
+        return time.clock()
+
+def _child_cpu_time():
+    """
+    Return the CPU time used by finished child processes, or None if
+    that isn't available
+    """
+    try:
+        from resource import getrusage, RUSAGE_CHILDREN
+    except ImportError:
+        return None
+    usage = getrusage(RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def _io_counts():
+    """
+    Return the bytes read and written so far by this thread (or process),
+    or (None, None) where /proc doesn't say
+    """
+    for filename in ('/proc/thread-self/io', '/proc/self/io'):
+        try:
+            fh = open(filename, 'r')
+            lines = fh.readlines()
+            fh.close()
+        except (IOError, OSError):
+            continue
+        counts = dict([l.split(':') for l in lines if ':' in l])
+        return int(counts['rchar']), int(counts['wchar'])
+    return None, None
+
+def _dir_size(dirname):
+    total = 0
+    for f in os.listdir(dirname):
+        try:
+            total += os.path.getsize(os.path.join(dirname, f))
+        except OSError:
+            pass
+    return total
+
+class _Phase(object):
+    """
+    Time the code in a `with' block, recording the result under `name'
+    in `timings'
+
+    A phase already in `timings' (e.g., when a run is repeated) is
+    recorded again as 'name[2]', 'name[3]', ...
+
+    For in-process phases, CPU time is that of the current thread and
+    bytes are what /proc reports it read and wrote. For a Bertini
+    subprocess (`dirname' given), CPU time is that of reaped child
+    processes, bytes read are the sizes of `input_files' and bytes
+    written the growth of `dirname'; with concurrent runs, child CPU
+    time may include that of other runs.
+    """
+    def __init__(self, timings, name, dirname=None, input_files=()):
+        self._timings = timings
+        self._name = name
+        self._dirname = dirname
+        self._input_files = input_files
+
+    def __enter__(self):
+        if self._dirname is None:
+            self._cpu = _cpu_time()
+            self._read, self._written = _io_counts()
+        else:
+            self._cpu = _child_cpu_time()
+            self._size = _dir_size(self._dirname)
+        self._wall = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall = time.time() - self._wall
+        if self._dirname is None:
+            cpu = _cpu_time() - self._cpu
+            read, written = _io_counts()
+            if read is not None:
+                read -= self._read
+                written -= self._written
+        else:
+            cpu = _child_cpu_time()
+            if cpu is not None:
+                cpu -= self._cpu
+            read = sum([os.path.getsize(f) for f in self._input_files if os.path.exists(f)])
+            written = max(_dir_size(self._dirname) - self._size, 0)
+
+        _record(self._timings, self._name, {'wall time':wall,
+                                            'cpu time':cpu,
+                                            'bytes read':read,
+                                            'bytes written':written})
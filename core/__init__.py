@@ -1,4 +1,5 @@
 from .algebra import PolynomialSystem
-from .base import AffinePoint, ProjectivePoint
+from .base import AffinePoint, AffinePointArray, PointArray, ProjectivePoint, ProjectivePointArray
 from .geometry import IrreducibleComponent
-from .witnessdata import WitnessPoint, WitnessSet
\ No newline at end of file
+from .slp import StraightLineProgram
+from .witnessdata import LazyWitnessPoints, WitnessPoint, WitnessSet
\ No newline at end of file
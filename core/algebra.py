@@ -1,43 +1,149 @@
-from sympy import I, Matrix as spmatrix, sympify, zeros
+import numpy as np
 
 from naglib.startup import TOL
 from naglib.exceptions import BertiniError, NonPolynomialException, NonHomogeneousException
-from naglib.core.base import NAGobject, scalar_num, Point, AffinePoint
-        
+from naglib.core.base import NAGobject, scalar_num, Point, AffinePoint, PointArray
+
+def _as_batch(points, width):
+    """
+    Return points as a complex array of shape (N, width), along with
+    whether a single point was given
+    """
+    if isinstance(points, Point):
+        points = points._numeric()
+        if points is None:
+            msg = "point does not have numeric coordinates"
+            raise TypeError(msg)
+    elif isinstance(points, (list, tuple)) and points and isinstance(points[0], Point):
+        points = [p._numeric() for p in points]
+    points = np.asarray(points, dtype=np.complex128)
+    if points.size == 0 and points.ndim == 1:
+        # an empty batch, e.g., []
+        points = points.reshape(0, width)
+
+    single = points.ndim == 1
+    if single:
+        points = points.reshape(1, -1)
+    if points.ndim != 2 or points.shape[1] != width:
+        msg = "expected points with {0} coordinates".format(width)
+        raise ValueError(msg)
+
+    return points, single
+
+def _compile_batch(exprs, variables, parameters, shape):
+    """
+    Compile exprs, in variables and parameters, into a function taking
+    an array of points of shape (N, len(variables)) and optionally
+    parameter values, and returning a complex array of shape
+    (N,) + shape
+    """
+    from sympy import lambdify
+
+    variables = list(variables)
+    parameters = list(parameters)
+    num_vars = len(variables)
+    num_pars = len(parameters)
+    num_exprs = len(exprs)
+    func = lambdify(variables + parameters, list(exprs), modules='numpy')
+
+    def evaluate(points, params=None):
+        points, single = _as_batch(points, num_vars)
+        N = points.shape[0]
+        if num_pars:
+            if params is None:
+                msg = "specify values for the parameters {0}".format(parameters)
+                raise ValueError(msg)
+            params = np.asarray(params, dtype=np.complex128)
+            params = np.broadcast_to(params.reshape(-1, num_pars), (N, num_pars))
+            args = [points[:,j] for j in range(num_vars)] + [params[:,j] for j in range(num_pars)]
+        else:
+            args = [points[:,j] for j in range(num_vars)]
+
+        values = np.empty((N, num_exprs), dtype=np.complex128)
+        if num_exprs:
+            for i,v in enumerate(func(*args)):
+                values[:,i] = v # constants are broadcast
+        values = values.reshape((N,) + tuple(shape))
+        if single:
+            return values[0]
+        return values
+
+    return evaluate
+
+def _compile_sparse(polynomials, num_vars, num_pars, shape):
+    """
+    As _compile_batch, but evaluating SparsePolynomials `polynomials'
+    in num_vars variables and num_pars parameters
+    """
+    def evaluate(points, params=None):
+        points, single = _as_batch(points, num_vars)
+        N = points.shape[0]
+        if num_pars:
+            if params is None:
+                msg = "specify values for the {0} parameters".format(num_pars)
+                raise ValueError(msg)
+            params = np.asarray(params, dtype=np.complex128)
+            params = np.broadcast_to(params.reshape(-1, num_pars), (N, num_pars))
+            points = np.hstack((points, params))
+
+        values = polynomials.evaluate(points).reshape((N,) + tuple(shape))
+        if single:
+            return values[0]
+        return values
+
+    return evaluate
+
 class PolynomialSystem(NAGobject):
     """
     A polynomial system
     """
-    def __init__(self, polynomials, variables=None, parameters=None, homvar=None):
+    def __init__(self, polynomials, variables=None, parameters=None, homvar=None, validate=True):
         """
         Initialize the PolynomialSystem object
+
+        Keyword arguments:
+        polynomials -- string, SymPy expression or iterable of these
+        variables   -- optional iterable, the variables; by default the
+                       free symbols which aren't parameters, sorted
+        parameters  -- optional iterable, the parameters
+        homvar      -- optional, the homogenizing variable
+        validate    -- optional boolean; if False, trust that the
+                       polynomials are polynomials (and homogeneous, with
+                       a homvar), and take a SymPy Matrix of them as is;
+                       degrees are then found on first use
         """
+        from sympy import Matrix as spmatrix, sympify
+        from sympy.matrices import MatrixBase
         from re import sub as resub
         from functools import reduce
         
-        if type(polynomials) == str:
-            polynomials = [polynomials]
-        try:
-            polynomials = list(polynomials)
-        except TypeError:
-            polynomials = [polynomials]
-        
-        self._polynomials = []
-        
-        # check if any polynomial is a string and contains '^'
-        for p in polynomials:
-            if type(p) == str:
-                p = resub(r'\^', r'**', p)
-            p = sympify(p)
-            self._polynomials.append(p)
+        if not validate and isinstance(polynomials, MatrixBase):
+            self._polynomials = polynomials
+        else:
+            if type(polynomials) == str:
+                polynomials = [polynomials]
+            try:
+                polynomials = list(polynomials)
+            except TypeError:
+                polynomials = [polynomials]
+
+            self._polynomials = []
 
-        self._polynomials = spmatrix(self._polynomials)
+            # check if any polynomial is a string and contains '^'
+            for p in polynomials:
+                if type(p) == str:
+                    p = resub(r'\^', r'**', p)
+                p = sympify(p)
+                self._polynomials.append(p)
+
+            self._polynomials = spmatrix(self._polynomials)
             
         # check if any given functions are actually not polynomials
-        for p in self._polynomials:
-            if not p.is_polynomial():
-                msg = "function {0} is not a polynomial".format(p)
-                raise NonPolynomialException(msg)
+        if validate:
+            for p in self._polynomials:
+                if not p.is_polynomial():
+                    msg = "function {0} is not a polynomial".format(p)
+                    raise NonPolynomialException(msg)
         
         # set parameters, if given...
         if parameters:
@@ -99,31 +205,64 @@ class PolynomialSystem(NAGobject):
             self._domain = len(self._variables)
             
             
-        d = []
-        params = list(self._parameters)
-        ones = [1 for param in params]
-        paramsubs = zip(params,ones)
-        
-        # keep parameters out of degree calculation
-        for poly in self._polynomials:
-            p = poly.subs(paramsubs)
-            if p.is_number: # p should never be a number, but...
-                deg = 0
-            else:
-                polyp = p.as_poly(domain='CC')
-                deg = polyp.total_degree()
-            # check if polynomial is homogeneous
-                if self._homvar:
-                    polyp = p.as_poly(domain='CC')
-                    if not polyp.is_homogeneous:
+        # derived data (e.g., compiled functions) built on demand
+        self._cache = {}
+        self._degree = None
+
+        # degrees and homogeneity come from the supports, which leave
+        # parameters out
+        if validate:
+            sparse = self._sparse()
+            if self._homvar:
+                homogeneous = sparse.homogeneous()
+                for i, p in enumerate(self._polynomials):
+                    if not homogeneous[i]:
                         msg = "polynomial {0} is not homogeneous".format(p)
                         raise NonHomogeneousException(msg)
-            d.append(deg)
-            
-        self._degree = tuple(d)
+            self._degree = sparse.degrees()
+
         self._num_variables = len(self._variables)
         self._num_polynomials = len(self._polynomials)
+
+    @classmethod
+    def _from_trusted(cls, polynomials, variables, parameters, homvar, degree=None, sparse=None):
+        """
+        Build a system from parts known to be good, skipping __init__
+
+        `polynomials', `variables', `parameters' and `homvar' are SymPy
+        matrices as a PolynomialSystem keeps them; `degree' and `sparse'
+        (the supports), if known, are carried over rather than found
+        again
+        """
+        system = cls.__new__(cls)
+        system._polynomials = polynomials
+        system._variables = variables
+        system._parameters = parameters
+        system._homvar = homvar
+        if homvar:
+            system._domain = len(variables) - 1
+        else:
+            system._domain = len(variables)
+        system._degree = degree
+        system._num_variables = len(variables)
+        system._num_polynomials = len(polynomials)
+        system._cache = {}
+        if sparse is not None:
+            system._cache['sparse'] = sparse
+
+        return system
             
+    def __getstate__(self):
+        """
+        Leave out compiled functions when pickling, but keep any
+        rendered Bertini input, which is only text
+        """
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        if 'input section' in self._cache:
+            state['_cache']['input section'] = self._cache['input section']
+        return state
+
     def __str__(self):
         """
         x.__str__() <==> str(x)
@@ -164,6 +303,7 @@ class PolynomialSystem(NAGobject):
         """
         x.__getslice__(i,j) <==> x[i:j]
         """
+        from sympy import Matrix as spmatrix
         polynomials = self._polynomials
         return spmatrix(polynomials[i:j])
     
@@ -181,12 +321,13 @@ class PolynomialSystem(NAGobject):
         variables = self._variables
         parameters = self._parameters
         homvar = self._homvar
-        return PolynomialSystem(npolynomials, variables, parameters, homvar)
+        return self._from_trusted(npolynomials, variables, parameters, homvar, self._degree)
     
     def __add__(self, other):
         """
         x.__add__(y) <==> x + y
         """
+        from sympy import sympify
         from functools import reduce
         
         if not isinstance(other, PolynomialSystem):
@@ -206,8 +347,8 @@ class PolynomialSystem(NAGobject):
         
         shomvar = self._homvar
         ohomvar = other._homvar
-        sdeg    = self._degree
-        odeg    = other._degree
+        sdeg    = self.degree
+        odeg    = other.degree
         
         # check homogenizing variables
         if shomvar and ohomvar and shomvar == ohomvar:
@@ -233,7 +374,7 @@ class PolynomialSystem(NAGobject):
                 newvars = sympify(newvars)
                 newpars = sympify(newpars)
                 
-                return PolynomialSystem(newpoly, newvars, newpars, shomvar)
+                return PolynomialSystem(newpoly, newvars, newpars, shomvar, validate=False)
             else:
                 msg = "multihomogeneous systems not yet supported"
                 raise NotImplementedError(msg)
@@ -261,7 +402,7 @@ class PolynomialSystem(NAGobject):
             newvars = sympify(newvars)
             newpars = sympify(newpars)
             
-            return PolynomialSystem(newpoly, newvars, newpars)
+            return PolynomialSystem(newpoly, newvars, newpars, validate=False)
     
     def __sub__(self, other):
         """
@@ -329,7 +470,7 @@ class PolynomialSystem(NAGobject):
             if other == 0:
                 return PolynomialSystem(polynomials)
             else:
-                return PolynomialSystem(polynomials, variables, parameters, homvar)
+                return self._from_trusted(polynomials, variables, parameters, homvar, self._degree)
         else:
             t = type(other)
             msg = "unsupported operand type(s) for *: 'PolynomialSystem' and '{0}'".format(t)
@@ -340,6 +481,48 @@ class PolynomialSystem(NAGobject):
         x.__rmul__(y) <==> y*x
         """
         return self.__mul__(other)
+
+    def _clear_cache(self):
+        """
+        Forget derived data; call whenever self is modified in place
+        """
+        self._cache = {}
+        self._degree = None
+
+    def _rendered_input(self, form, render):
+        """
+        Return the lines of a Bertini INPUT section for self in input
+        form `form', found with `render(self)' the first time and kept
+        until self is modified
+        """
+        rendered = self._cache.setdefault('input section', {})
+        if form not in rendered:
+            rendered[form] = render(self)
+        return rendered[form]
+
+    def _gens(self):
+        """
+        Return the variables, then the parameters, then any other
+        symbols in the polynomials
+        """
+        gens = list(self._variables) + list(self._parameters)
+        others = set(self._polynomials.free_symbols).difference(gens)
+        return gens + sorted(others, key=str)
+
+    def _sparse(self):
+        """
+        Return the supports of the polynomials as SparsePolynomials,
+        built once and kept until the system is modified
+        """
+        from naglib.core.sparse import SparsePolynomials
+
+        if 'sparse' not in self._cache:
+            gens = self._gens()
+            num_vars = len(self._variables)
+            self._cache['sparse'] = SparsePolynomials.from_sympy(self._polynomials,
+                                                                 gens[:num_vars],
+                                                                 gens[num_vars:])
+        return self._cache['sparse']
             
     def __div__(self, other):
         """
@@ -363,12 +546,13 @@ class PolynomialSystem(NAGobject):
             variables = self._variables
             parameters = self._parameters
             homvar = self._homvar
-            return PolynomialSystem(polynomials, variables, parameters, homvar)
+            return self._from_trusted(polynomials, variables, parameters, homvar, self._degree)
         
     def assign_parameters(self, params):
         """
         Set params as parameters in self
         """
+        from sympy import Matrix as spmatrix, sympify
         if not hasattr(params, '__iter__'):
             params = [params]
         params = set(sympify(params))
@@ -381,11 +565,13 @@ class PolynomialSystem(NAGobject):
         
         self._parameters = spmatrix(sympify(str_pars))
         self._variables  = spmatrix(sympify(str_vars))
+        self._clear_cache()
         
     def cat(self, other):
         """
         concatenate a polynomial at the end of self
         """
+        from sympy import Matrix as spmatrix, sympify
         if not other:
             return self
         other = sympify(other)
@@ -399,6 +585,31 @@ class PolynomialSystem(NAGobject):
         
         newpols = polynomials.col_join(other)
         return PolynomialSystem(newpols, parameters=parameters, homvar=homvar)
+
+    def compile(self):
+        """
+        Return a function evaluating the system at a batch of points
+
+        The function takes an array of shape (N, num_variables) (or a
+        single point, a list of points or a PointArray) and, if the
+        system has parameters, parameter values of shape
+        (N, num_parameters) or (num_parameters,). It returns a complex
+        array of shape (N, num_polynomials), evaluating every point in
+        one vectorized call. The function is built once and kept until
+        the system is modified.
+        """
+        if 'function' not in self._cache:
+            polynomials = list(self._polynomials)
+            num_vars = len(self._variables)
+            num_pars = len(self._parameters)
+            if len(self._gens()) == num_vars + num_pars:
+                func = _compile_sparse(self._sparse(), num_vars, num_pars,
+                                       (len(polynomials),))
+            else:
+                func = _compile_batch(polynomials, self._variables,
+                                      self._parameters, (len(polynomials),))
+            self._cache['function'] = func
+        return self._cache['function']
     
     def copy(self):
         polynomials = self._polynomials.copy()
@@ -406,7 +617,8 @@ class PolynomialSystem(NAGobject):
         parameters  = self._parameters.copy()
         homvar      = self._homvar.copy()
         
-        return PolynomialSystem(polynomials, variables, parameters, homvar)
+        return self._from_trusted(polynomials, variables, parameters, homvar,
+                                  self._degree, self._cache.get('sparse'))
         
     def dehomogenize(self):
         """
@@ -414,8 +626,7 @@ class PolynomialSystem(NAGobject):
         
         If already nonhomogeneous, return self
         """
-        hompolys = self._polynomials
-        hompolys = spmatrix([p.expand() for p in hompolys])
+        from sympy import Matrix as spmatrix
         homvars = self._variables
         parameters = self._parameters
         
@@ -428,16 +639,21 @@ class PolynomialSystem(NAGobject):
         dex = homvars.index(homvar)
         homvars.pop(dex)
         variables = spmatrix(homvars)
+
+        gens = self._gens()
+        gens.pop(dex)
+        sparse = self._sparse().dehomogenize(dex)
+        polynomials = spmatrix(sparse.as_exprs(gens))
         
-        polynomials = hompolys.subs({homvar:1})
-        
-        return PolynomialSystem(polynomials, variables, parameters)
+        return self._from_trusted(polynomials, variables, parameters, spmatrix(), sparse=sparse)
         
-    def equals(self, other, strict=True):
+    def equals(self, other, strict=True, tol=TOL, trials=4):
         """
         x.equals(y) <==> x == y
         
-        A probability-1 algorithm to determine equality
+        A probability-1 algorithm to determine equality: both systems
+        are evaluated at a batch of random complex points and must agree
+        at each of them
         Optional arguments:
         strict -- if True, force each system to have the same variables,
                   parameters, by name; otherwise, allow the same number
@@ -447,40 +663,41 @@ class PolynomialSystem(NAGobject):
                    G = PolynomialSystem('y**2 - 1')
                    F.equals(G, strict=True) == False
                    F.equals(G, strict=False) == True`
+        tol    -- tolerance on the difference of the values, relative to
+                  their size and no tighter than the square root of
+                  double precision
+        trials -- number of random points to evaluate at
         """
+        from naglib.core.numeric import _random_complex
         if not isinstance(other, PolynomialSystem):
             return False
         # shape test
         if self.shape != other.shape:
             return False
+        if len(self._parameters) != len(other._parameters):
+            return False
         
         svars = list(self._variables)
         ovars = list(other._variables)
         spars = list(self._parameters)
         opars = list(other._parameters)
-        spoly = self._polynomials
-        opoly = other._polynomials
         salls = svars + spars
         oalls = ovars + opars
         
         if strict and salls != oalls:
                 return False
+        if not len(self._polynomials):
+            return True
         
-        from random import random as rand
-        rsubs = []
-        for vp in salls:
-            try:
-                real = rand()/rand()
-                imag = rand()/rand()
-            except ZeroDivisionError:
-                return self == other
-            rsubs.append(real + I*imag)
-        
-        ssubs = zip(salls, rsubs)
-        osubs = zip(oalls, rsubs)
+        # variables and parameters correspond by position
+        points = _random_complex(trials, len(svars))
+        params = _random_complex(trials, len(spars))
+        svals = self.compile()(points, params)
+        ovals = other.compile()(points, params)
         
-        res = spoly.subs(ssubs) - opoly.subs(osubs)
-        return res.norm() < TOL
+        tol = max(tol, np.sqrt(np.finfo(float).eps))
+        scale = np.maximum(np.maximum(abs(svals), abs(ovals)), 1)
+        return bool((abs(svals - ovals) <= tol*scale).all())
     
     def evalf(self, varpt, parpt=[]):
         """
@@ -509,7 +726,7 @@ class PolynomialSystem(NAGobject):
         
         If already homogeneous, return self
         """
-        polynomials = [p.as_poly(domain='CC') for p in self._polynomials]
+        from sympy import Matrix as spmatrix, sympify
         variables = list(self._variables)
         parameters = list(self._parameters)
         
@@ -517,24 +734,68 @@ class PolynomialSystem(NAGobject):
             return self
         
         homvar = sympify(homvar)
+        if homvar in variables or homvar in parameters:
+            msg = "homogenizing variable {0} is already a variable or parameter".format(homvar)
+            raise ValueError(msg)
         homvars = [homvar] + variables
-        hompolys = [p.homogenize(homvar).as_expr() for p in polynomials]
-        return PolynomialSystem(hompolys, homvars, parameters, homvar)
+        sparse = self._sparse().homogenize()
+        hompolys = spmatrix(sparse.as_exprs([homvar] + self._gens()))
+        return self._from_trusted(hompolys, spmatrix(homvars), self._parameters,
+                                  spmatrix([homvar]), self.degree, sparse)
         
     def jacobian(self):
         """
         Returns the Jacobian, the polynomial system, and the variables,
         all as symbolic matrices
         """
+        from sympy import zeros
         variables = self._variables
         polynomials = self._polynomials
-        num_polynomials,num_variables = len(polynomials),len(variables)
-        jac = zeros(num_polynomials,num_variables)
-        for i in range(num_polynomials):
-            for j in range(num_variables):
-                jac[i,j] = polynomials[i].diff(variables[j])
+        if 'jacobian' not in self._cache:
+            num_polynomials,num_variables = len(polynomials),len(variables)
+            jac = zeros(num_polynomials,num_variables)
+            for i in range(num_polynomials):
+                for j in range(num_variables):
+                    jac[i,j] = polynomials[i].diff(variables[j])
+            self._cache['jacobian'] = jac
         
-        return jac,polynomials,variables
+        return self._cache['jacobian'].copy(),polynomials,variables
+
+    def compile_jacobian(self):
+        """
+        Return a function evaluating the Jacobian at a batch of points
+
+        Takes the same arguments as the function returned by `compile'
+        and returns a complex array of shape
+        (N, num_polynomials, num_variables). The function is built once
+        and kept until the system is modified.
+        """
+        if 'jacobian function' not in self._cache:
+            num_vars = len(self._variables)
+            num_pars = len(self._parameters)
+            shape = (len(self._polynomials), num_vars)
+            if len(self._gens()) == num_vars + num_pars:
+                func = _compile_sparse(self._sparse().jacobian(), num_vars,
+                                       num_pars, shape)
+            else:
+                jac = self.jacobian()[0]
+                func = _compile_batch(list(jac), self._variables,
+                                      self._parameters, shape)
+            self._cache['jacobian function'] = func
+        return self._cache['jacobian function']
+
+    def cond(self, points, parameters=None):
+        """
+        Return the 2-norm condition number of the Jacobian at each of
+        a batch of points, as an array of shape (N,)
+        """
+        jac = self.compile_jacobian()(points, parameters)
+        if jac.ndim == 3 and jac.shape[0] == 0:
+            # an empty batch, which older NumPy can't decompose
+            return np.zeros(0)
+        sv = np.linalg.svd(jac, compute_uv=False)
+        with np.errstate(divide='ignore'):
+            return sv[...,0]/sv[...,-1]
     
     def matmul(self, other):
         """
@@ -544,13 +805,57 @@ class PolynomialSystem(NAGobject):
         """
         res_polys = list(other * self._polynomials)
         res = PolynomialSystem(res_polys)
-            
+
         return res
 
+    def newton(self, points, parameters=None, tol=1e-11, maxit=20, multiprec=True):
+        """
+        Refine points with Newton's method, without calling Bertini
+
+        Points are corrected together in double precision; those which
+        fail to converge are retried in multiple precision if
+        `multiprec' is True. See naglib.core.numeric.newton for the
+        keyword arguments and the dict of results returned.
+        """
+        from naglib.core.numeric import newton
+        return newton(self, points, parameters, tol=tol, maxit=maxit, multiprec=multiprec)
+
+    def parameter_sweep(self, targets, workers=None, start=None, start_params=None, usebertini=True):
+        """
+        Solve the system at each row of `targets', an array of parameter
+        values, reusing one set of start solutions
+
+        Unless `start' and `start_params' are given, solutions at random
+        complex parameters are found first. They are then tracked to
+        each target, with `workers' Bertini runs going at once or, if
+        `usebertini' is False, in-process in large batches.
+
+        Yields (index, solutions) pairs, where solutions is a complex
+        array with one solution per row
+        """
+        if usebertini:
+            from naglib.bertini.sweep import parameter_sweep
+            return parameter_sweep(self, targets, workers=workers, start=start,
+                                   start_parameters=start_params)
+        else:
+            from naglib.core.numeric import parameter_sweep
+            if start is None or start_params is None:
+                start, start_params = self.solve(usebertini=False)
+            return parameter_sweep(self, start, start_params, targets)
+
+    def residuals(self, points, parameters=None):
+        """
+        Return the 2-norm of the system at each of a batch of points,
+        as an array of shape (N,)
+        """
+        values = self.compile()(points, parameters)
+        return np.linalg.norm(values, axis=-1)
+
     def fix_parameters(self, parsubs):
         """
         Substitute parsubs in for parameters
         """
+        from sympy import sympify
         polynomials = self._polynomials
         parameters = self._parameters
         if type(parsubs) == dict:
@@ -581,8 +886,10 @@ class PolynomialSystem(NAGobject):
             parameters = sympify(parameters)
         self._parameters = parameters
         self._polynomials = polynomials
+        self._clear_cache()
     
     def pop(self, index=-1):
+        from sympy import Matrix as spmatrix, sympify
         polynomials = list(self._polynomials)
         variables = self._variables
         parameters = self._parameters
@@ -606,40 +913,60 @@ class PolynomialSystem(NAGobject):
         self._polynomials = polynomials
         self._variables = spmatrix(variables)
         self._parameters = spmatrix(parameters)
+        self._clear_cache()
         
         return poly
     
-    def rank(self, tol=TOL):
+    def rank(self, tol=TOL, trials=4):
         """
         Return a numeric value, the rank of the Jacobian at
         a 'generic' point.
+
+        The rank is taken at each of `trials' random complex points,
+        counting singular values larger than `tol' times the largest
+        (and no tighter than double precision allows); as the rank can
+        only drop at special points, the largest is returned.
         """
-        from random import random as rand
-        parameters = list(self._parameters)
-        variables = list(self._variables)
-        if parameters:
-            allvars = variables + parameters
-        else:
-            allvars = variables
+        sv = self.singular_values(trials)
+        if sv.size == 0:
+            return 0
         
-        varsubs = zeros(len(allvars), 1)
-        # compute sufficiently generic complex points
-        for i in range(len(varsubs)):
-            # rand()/rand() can vary magnitude satisfactorily
-            try:
-                real = rand()/rand()
-                imag = rand()/rand()
-            except ZeroDivisionError:
-                # try again
-                return self.rank()
-            varsubs[i] = real + I*imag
-            
-        jac = self.jacobian()[0]
-        jac = jac.subs(zip(allvars, varsubs))
+        # allow user to specify tolerance (what is 'zero'), relative to
+        # the largest singular value and no tighter than double precision
+        tol = max(tol, max(self.shape)*np.finfo(float).eps)
+        ranks = (sv > tol*sv[:,:1]).sum(axis=1)
+        return int(ranks.max())
+    
+    def singular_values(self, trials=4):
+        """
+        Return the singular values of the Jacobian at `trials' random
+        complex points, as an array of shape (trials, min(m, n)), each
+        row in decreasing order
+
+        The gap between consecutive singular values shows how clear-cut
+        the decision made by `rank' is.
+        """
+        from naglib.core.numeric import _random_complex
+        m, n = self.shape
+        if m == 0 or n == 0:
+            return np.zeros((trials, 0))
         
-        # allow user to specify tolerance (what is 'zero')
-        iszero = lambda x, tol=tol: True if abs(x) < tol else False
-        return jac.rank(iszero)
+        points = _random_complex(trials, n)
+        params = _random_complex(trials, len(self._parameters))
+        jac = self.compile_jacobian()(points, params)
+        return np.linalg.svd(jac, compute_uv=False)
+    
+    def slp(self):
+        """
+        Return the system as a StraightLineProgram, sharing common
+        subexpressions among the polynomials; built once and kept until
+        the system is modified
+        """
+        from naglib.core.slp import StraightLineProgram
+        if 'slp' not in self._cache:
+            self._cache['slp'] = StraightLineProgram(self._polynomials, self._variables,
+                                                     self._parameters)
+        return self._cache['slp']
     
     def solve(self, start_params=None, final_params=None, start=None, usebertini=True):
         """
@@ -648,6 +975,9 @@ class PolynomialSystem(NAGobject):
         If the system has parameters and you do not supply any parameters,
         perform ab initio run and return solutions along with start parameters.
         Otherwise if you supply parameters, just return the solutions.
+
+        If `usebertini' is False, track paths in-process instead; only
+        zero dimensional solving is supported this way.
         """
         polynomials = self._polynomials
         variables   = self._variables
@@ -681,8 +1011,23 @@ class PolynomialSystem(NAGobject):
             
             return solve_run.run()
         else:
-            msg = "nothing to use yet but Bertini"
-            raise NotImplementedError(msg)
+            from naglib.core.numeric import solve_parameter_homotopy, solve_total_degree
+
+            # parameter homotopy
+            if parameters:
+                if start_params and final_params:
+                    return solve_parameter_homotopy(self, start, start_params, final_params)
+                elif start_params or final_params:
+                    msg = "specify both start parameters and final parameters or neither"
+                    raise BertiniError(msg)
+                else:
+                    # ab initio run at random complex parameters
+                    from naglib.core.numeric import _random_complex
+                    start_params = _random_complex(len(parameters))
+                    solutions = solve_total_degree(self, start_params)
+                    return solutions, [AffinePoint(start_params)]
+            else:
+                return solve_total_degree(self)
         
     def subs(self, *args, **kwargs):
         """
@@ -716,39 +1061,30 @@ class PolynomialSystem(NAGobject):
             return self._homvar
     @homvar.setter
     def homvar(self, h):
+        from sympy import Matrix as spmatrix, sympify
         if h is None:
             self._homvar = spmatrix()
+            self._clear_cache()
             return
         h = sympify(h)
         if h not in self._variables:
             msg = "homogenizing variable {0} not found in list of variables".format(h)
             raise ValueError(msg)
         
-        parameters = self._parameters
-        polynomials = self._polynomials
-        paramsubs = zip(parameters, [1 for p in parameters])
-        for poly in polynomials:
-            p = poly.subs(paramsubs)
-            if p.is_number:
-                deg = 0
-            else:
-                deg = p.as_poly(domain='CC').total_degree()
-            # now check if polynomial is homogeneous
-            terms = p.as_ordered_terms()
-            for t in terms:
-                if t.is_number and deg != 0:
-                    msg = "polynomial {0} is not homogeneous".format(p)
-                    raise NonHomogeneousException(msg)
-                elif t.is_number:
-                    pass
-                elif t.as_poly(domain='CC').total_degree() != deg:
-                    msg = "polynomial {0} is not homogeneous".format(p)
-                    raise NonHomogeneousException(msg)
+        homogeneous = self._sparse().homogeneous()
+        for i, p in enumerate(self._polynomials):
+            if not homogeneous[i]:
+                msg = "polynomial {0} is not homogeneous".format(p)
+                raise NonHomogeneousException(msg)
         
         if h in self._variables:
             self._homvar = spmatrix([h])
+            self._clear_cache()
     @property
     def degree(self):
+        # found on first use for systems built without validation
+        if self._degree is None:
+            self._degree = self._sparse().degrees()
         return self._degree
     @property
     def shape(self):
@@ -763,6 +1099,7 @@ class LinearSlice(NAGobject):
     !!!Use this only for slicing!!!
     """
     def __init__(self, coeffs, variables, homvar=None):
+        from sympy import Matrix as spmatrix, sympify
         self._coeffs = spmatrix(coeffs)
         self._variables = spmatrix(variables)
         if homvar:
@@ -1,4 +1,4 @@
-from sympy import I, Float, Rational, ShapeError, sympify, Matrix
+import numpy as np
 
 from naglib.exceptions import ExitSpaceError, AffineInfinityException
 from naglib.startup import TOL
@@ -7,32 +7,100 @@ def scalar_num(x):
     """
     Determine if x is a scalar type for purposes of multiplication
     """
-    from sympy import Number
+    from sympy import Number, sympify
     x = sympify(str(x))
     re, im = x.as_real_imag()
 
     return isinstance(re, Number) and isinstance(im, Number)
 
+def _numeric_coordinates(coordinates):
+    """
+    Return coordinates as a complex128 array if they are Python or
+    NumPy floating point numbers, or as an object array of mpmath mpc
+    if any is an mpmath number; None if any is not a number, or if
+    they are all integers
+    """
+    from mpmath import mpc, mpf
+
+    inexact = False
+    multiprec = False
+    for c in coordinates:
+        if isinstance(c, (mpf, mpc)):
+            multiprec = True
+        elif isinstance(c, (float, complex, np.inexact)):
+            inexact = True
+        elif not isinstance(c, (int, np.integer)) or isinstance(c, bool):
+            return None
+
+    if multiprec:
+        data = np.empty(len(coordinates), dtype=object)
+        for i,c in enumerate(coordinates):
+            if isinstance(c, (mpf, mpc)):
+                data[i] = mpc(c)
+            else:
+                data[i] = mpc(complex(c))
+        return data
+    elif inexact:
+        return np.array(coordinates, dtype=np.complex128)
+    else:
+        return None
+
+def _vnorm(v, ord=None):
+    """
+    The norm of a complex128 or mpmath object array
+    """
+    if v.dtype == object:
+        from mpmath import inf, norm
+        if ord is None:
+            ord = 2
+        elif ord == np.inf:
+            ord = inf
+        elif ord == -np.inf:
+            ord = -inf
+        return norm(list(v), ord)
+    return np.linalg.norm(v, ord)
+
 class NAGobject(object):
     """
     A meta class. Nothing here (yet)
     """
-    pass
+    __slots__ = ()
 
 class Point(NAGobject):
     """
     A point in affine or projective space
     """
+    __slots__ = ('_data', '_matrix')
 
     def __init__(self, coordinates):
         """
         Initialize the Point object
+
+        Floating point coordinates are kept as a complex128 array (or
+        as mpmath mpc, if given) until SymPy coordinates are needed. A
+        complex NumPy array is kept as is (not copied), so a row of a
+        PointArray can back a Point without a copy.
         """
+        self._data = None
+        self._matrix = None
+
+        if isinstance(coordinates, Point) and coordinates._data is not None:
+            coordinates = coordinates._data.copy()
+        if isinstance(coordinates, np.ndarray) and coordinates.dtype.kind in 'fc':
+            self._data = np.asarray(coordinates, dtype=np.complex128).reshape(-1)
+            return
+
         try:
             coordinates = list(coordinates)
         except TypeError:
             coordinates = [coordinates]
 
+        data = _numeric_coordinates(coordinates)
+        if data is not None:
+            self._data = data
+            return
+
+        from sympy import Matrix, sympify
         coordinates = [sympify(c) for c in coordinates]
         self._coordinates = Matrix(coordinates)
 
@@ -50,6 +118,7 @@ class Point(NAGobject):
         oco = other._coordinates
 
         if len(sco) != len(oco):
+            from sympy import ShapeError
             msg = "dimension mismatch"
             raise ShapeError(msg)
 
@@ -139,6 +208,8 @@ class Point(NAGobject):
         """
         x.__len__() <==> len(x)
         """
+        if self._data is not None:
+            return len(self._data)
         coordinates = self._coordinates
         return len(coordinates)
 
@@ -153,10 +224,15 @@ class Point(NAGobject):
         """
         x.__setitem__(y, z) <==> x[y] = z
         """
+        from sympy import sympify
         if not scalar_num(value):
             msg = "must assign a number"
             raise TypeError(msg)
 
+        if self._data is not None:
+            # the point no longer matches its numeric coordinates
+            from sympy import Matrix
+            self._coordinates = Matrix(self._coordinate_list())
         coordinates = self._coordinates
         coordinates[key] = sympify(value)
 
@@ -164,6 +240,7 @@ class Point(NAGobject):
         """
         x.__setslice__(i,j,sequence) <==> x[i:j] = sequence
         """
+        from sympy import sympify, Matrix
         coordinates = self._coordinates
 
         sequence = sympify(list(sequence))
@@ -191,6 +268,7 @@ class Point(NAGobject):
         return cls(scoords + ocoords)
 
     def float(self, prec=None):
+        from sympy import I, Float
         cls = self.__class__
         coordinates = self._coordinates
         newcoords = []
@@ -207,6 +285,7 @@ class Point(NAGobject):
         return cls(newcoords)
 
     def insert(self, index, item):
+        from sympy import Matrix
         if not scalar_num(item):
             msg = "only takes scalar number types"
             raise TypeError(msg)
@@ -215,6 +294,8 @@ class Point(NAGobject):
         self._coordinates = Matrix(coordinates)
 
     def is_zero(self, tol=TOL*10):
+        if self._data is not None:
+            return _vnorm(self._data) < tol
         coordinates = self._coordinates
         summa = sum([abs(c)**2 for c in coordinates])**0.5
         return summa < tol
@@ -223,10 +304,13 @@ class Point(NAGobject):
         """
         Returns the normalized version of ``self''
         """
+        if self._data is not None:
+            return self.__class__(self._data/_vnorm(self._data))
         coordinates = self._coordinates
         return self.__class__(coordinates.normalized())
 
     def pop(self, index=-1):
+        from sympy import Matrix
         coordinates = list(self._coordinates)
         popped = coordinates.pop(index)
         self._coordinates = Matrix(coordinates)
@@ -237,6 +321,7 @@ class Point(NAGobject):
         """
         Returns a rational approximation of self
         """
+        from sympy import I, Rational
         cls = self.__class__
         coordinates = self._coordinates
         newcoords = []
@@ -249,9 +334,50 @@ class Point(NAGobject):
         return cls(newcoords)
 
     def is_real(self, tol=1e-13):
+        if self._data is not None:
+            imag = np.array([complex(c).imag for c in self._data]) if self._data.dtype == object else self._data.imag
+            return np.linalg.norm(imag) < tol
         coordinates = self._coordinates
         return coordinates.as_real_imag()[1].norm() < tol
 
+    def _coordinate_list(self):
+        """
+        Return the coordinates as a list of SymPy numbers
+        without converting numeric coordinates in place
+        """
+        from sympy import sympify
+        if self._data is not None:
+            return [sympify(c) for c in self._data]
+        return list(self._matrix)
+
+    def _numeric(self):
+        """
+        Return the coordinates as a complex128 array, or None if
+        they are not all numbers
+        """
+        if self._data is not None and self._data.dtype != object:
+            return self._data
+        elif self._data is not None:
+            return np.array([complex(c) for c in self._data], dtype=np.complex128)
+        try:
+            return np.array([complex(c) for c in self._matrix], dtype=np.complex128)
+        except TypeError:
+            return None
+
+    @property
+    def _coordinates(self):
+        # SymPy coordinates of a numeric point are built once and kept
+        # alongside the numeric view, immutable so they can't drift
+        # from it
+        if self._matrix is None:
+            from sympy import ImmutableMatrix
+            self._matrix = ImmutableMatrix(self._coordinate_list())
+        return self._matrix
+    @_coordinates.setter
+    def _coordinates(self, coordinates):
+        self._matrix = coordinates
+        self._data = None
+
     @property
     def coordinates(self):
         return self._coordinates
@@ -260,11 +386,13 @@ class AffinePoint(Point):
     """
     Point object living in affine space
     """
+    __slots__ = ()
+
     def __init__(self, coordinates):
         super(AffinePoint, self).__init__(coordinates)
 
     def __repr__(self):
-        coordinates = [str(c.n()) for c in self._coordinates]
+        coordinates = [str(c.n()) for c in self._coordinate_list()]
         repstr = 'AffinePoint(['
         if len(coordinates) > 6:
             repstr += ', '.join(coordinates[:3] + ['...'] + coordinates[-3:]) + '])'
@@ -277,7 +405,7 @@ class AffinePoint(Point):
         """
         x.__str__ <==> str(x)
         """
-        coordinates = self._coordinates
+        coordinates = self._coordinate_list()
         repstr = '[' + ', '.join([str(c) for c in coordinates]) + ']'
 
         return repstr
@@ -286,12 +414,13 @@ class AffinePoint(Point):
         """
         x.__abs__ <==> abs(x)
         """
-        coordinates = self._coordinates
-        return coordinates.norm()
+        return self.norm()
 
     def homogenize(self):
         """
         """
+        if self._data is not None:
+            return ProjectivePoint(np.concatenate(([1], self._data)))
         homcoordinates = [1] + list(self._coordinates)
 
         return ProjectivePoint(homcoordinates)
@@ -305,29 +434,33 @@ class AffinePoint(Point):
         -inf <==> min(abs(x))
           n  <==> sum(abs(x)**n)**(1./n)
         """
+        if self._data is not None:
+            return _vnorm(self._data, ord)
         coordinates = self._coordinates
         return coordinates.norm(ord)
 
     @property
     def dim(self):
-        return len(self._coordinates)
+        return len(self)
 
 class ProjectivePoint(Point):
     """
     Point object living in affine space
     """
+    __slots__ = ('_dim', '_tol')
+
     def __init__(self, coordinates, tol=TOL*10):
         super(ProjectivePoint, self).__init__(coordinates)
 
         if self.is_zero(tol):
-            corstr = '[' + ' : '.join([str(c) for c in self._coordinates]) + ']'
+            corstr = '[' + ' : '.join([str(c) for c in self._coordinate_list()]) + ']'
             msg = "{0} is not in projective space".format(corstr)
             raise ExitSpaceError(msg)
-        self._dim = len(self._coordinates) - 1
+        self._dim = len(self) - 1
         self._tol = tol
 
     def __repr__(self):
-        coordinates = [str(c.n()) for c in self._coordinates]
+        coordinates = [str(c.n()) for c in self._coordinate_list()]
         repstr = 'ProjectivePoint(['
         if len(coordinates) > 6:
             repstr += ', '.join(coordinates[:3] + ['...'] + coordinates[-3:]) + '])'
@@ -340,7 +473,7 @@ class ProjectivePoint(Point):
         """
         x.__str__ <==> str(x)
         """
-        coordinates = self._coordinates
+        coordinates = self._coordinate_list()
         repstr = '[' + ' : '.join([str(c) for c in coordinates]) + ']'
 
         return repstr
@@ -448,6 +581,12 @@ class ProjectivePoint(Point):
             raise ExitSpaceError(msg)
 
     def at_infinity(self, tol=TOL):
+        if self._data is not None:
+            coordinates = self._data
+            # division by zero gives an infinite or NaN norm
+            if (coordinates[1:] == 0).any():
+                return False
+            return _vnorm(coordinates[0]/coordinates[1:]) < tol
         coordinates = self._coordinates
         c0 = coordinates[0]
         div_coord = [c0/c for c in coordinates[1:]]
@@ -457,6 +596,10 @@ class ProjectivePoint(Point):
         """
         Return ProjectivePoint with coordinates rescaled
         """
+        if self._data is not None:
+            coordinates = self._data
+            nz = np.flatnonzero(np.abs(coordinates) >= TOL)[0]
+            return ProjectivePoint(coordinates/coordinates[nz])
         coordinates = self._coordinates
         nz = 0
         while abs(coordinates[nz]) < TOL and nz < len(coordinates):
@@ -470,6 +613,8 @@ class ProjectivePoint(Point):
         Return Affine Point, if not at at infinity
         """
         if not self.at_infinity():
+            if self._data is not None:
+                return AffinePoint(self._data[1:]/self._data[0])
             coordinates = self._coordinates
             return AffinePoint([c/coordinates[0] for c in coordinates[1:]])
         else:
@@ -478,7 +623,207 @@ class ProjectivePoint(Point):
 
     @property
     def dim(self):
-        return len(self._coordinates)-1
+        return len(self)-1
+    @property
+    def tol(self):
+        return self._tol
+    @tol.setter
+    def tol(self, t):
+        self._tol = t
+
+class PointArray(NAGobject):
+    """
+    A batch of points stored as the rows of one contiguous complex array
+    """
+    _point_class = Point
+
+    def __init__(self, points):
+        """
+        Initialize the PointArray object
+
+        Keyword arguments:
+        points -- array of shape (numpoints, dim), or an iterable of
+                  Points or of coordinate sequences
+        """
+        if isinstance(points, PointArray):
+            data = points._data
+        elif isinstance(points, np.ndarray):
+            data = points
+        else:
+            data = []
+            for p in points:
+                if isinstance(p, Point):
+                    coordinates = p._numeric()
+                    if coordinates is None:
+                        msg = "point {0} does not have numeric coordinates".format(p)
+                        raise TypeError(msg)
+                else:
+                    coordinates = [complex(c) for c in p]
+                data.append(coordinates)
+
+        data = np.ascontiguousarray(data, dtype=np.complex128)
+        if data.ndim == 1:
+            if data.size == 0:
+                data = data.reshape(0, 0)
+            else:
+                data = data.reshape(1, -1)
+        elif data.ndim != 2:
+            from sympy import ShapeError
+            msg = "points must be given as a 2-dimensional array"
+            raise ShapeError(msg)
+
+        self._data = data
+
+    def __len__(self):
+        """
+        x.__len__() <==> len(x)
+        """
+        return self._data.shape[0]
+
+    def __getitem__(self, key):
+        """
+        x.__getitem__(y) <==> x[y]
+
+        An integer key gives a single point sharing memory with self;
+        anything else gives a PointArray
+        """
+        if isinstance(key, (int, np.integer)):
+            return self._point_class(self._data[key])
+        return self.__class__(self._data[key])
+
+    def __iter__(self):
+        """
+        x.__iter__() <==> iter(x)
+        """
+        for i in range(len(self)):
+            yield self[i]
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        Support np.asarray(x)
+        """
+        if dtype is None:
+            return self._data
+        return self._data.astype(dtype)
+
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        return '{0}({1})'.format(self.__class__.__name__, repr(self._data))
+
+    def is_real(self, tol=1e-13):
+        """
+        Return a boolean array, True where a point is real
+        """
+        return np.linalg.norm(self._data.imag, axis=1) < tol
+
+    def is_zero(self, tol=TOL*10):
+        """
+        Return a boolean array, True where a point is zero
+        """
+        return self.norms() < tol
+
+    def normalized(self):
+        """
+        Returns the normalized version of ``self''
+        """
+        return self.__class__(self._data/self.norms()[:, np.newaxis])
+
+    def norms(self, ord=None):
+        """
+        Return the norm of every point, with `ord' as for AffinePoint.norm
+        """
+        if len(self) == 0:
+            return np.zeros(0)
+        return np.linalg.norm(self._data, ord=ord, axis=1)
+
+    def tolist(self):
+        """
+        Return a list of single points, each sharing memory with self
+        """
+        return list(self)
+
+    @property
+    def array(self):
+        return self._data
+    @property
+    def dim(self):
+        return self._data.shape[1]
+    @property
+    def shape(self):
+        return self._data.shape
+
+class AffinePointArray(PointArray):
+    """
+    A batch of points living in affine space
+    """
+    _point_class = AffinePoint
+
+    def homogenize(self):
+        """
+        """
+        ones = np.ones((len(self), 1), dtype=np.complex128)
+        return ProjectivePointArray(np.hstack((ones, self._data)))
+
+class ProjectivePointArray(PointArray):
+    """
+    A batch of points living in projective space
+    """
+    _point_class = ProjectivePoint
+
+    def __init__(self, points, tol=TOL*10):
+        super(ProjectivePointArray, self).__init__(points)
+
+        zero = self.is_zero(tol)
+        if zero.any():
+            msg = "{0} of the points given are not in projective space".format(zero.sum())
+            raise ExitSpaceError(msg)
+        self._tol = tol
+
+    def __getitem__(self, key):
+        """
+        x.__getitem__(y) <==> x[y]
+        """
+        if isinstance(key, (int, np.integer)):
+            return ProjectivePoint(self._data[key], self._tol)
+        return ProjectivePointArray(self._data[key], self._tol)
+
+    def at_infinity(self, tol=TOL):
+        """
+        Return a boolean array, True where a point is at infinity
+        """
+        data = self._data
+        with np.errstate(divide='ignore', invalid='ignore'):
+            div_coord = data[:, :1]/data[:, 1:]
+        return np.linalg.norm(div_coord, axis=1) < tol
+
+    def canonical(self):
+        """
+        Return ProjectivePointArray with each point rescaled by its
+        first nonzero coordinate
+        """
+        data = self._data
+        nz = np.argmax(np.abs(data) >= TOL, axis=1)
+        c1 = data[np.arange(len(data)), nz]
+
+        return ProjectivePointArray(data/c1[:, np.newaxis], self._tol)
+
+    def dehomogenize(self):
+        """
+        Return AffinePointArray, if no point is at infinity
+        """
+        infinite = self.at_infinity()
+        if infinite.any():
+            msg = "cannot create affine points; {0} of the points are at infinity".format(infinite.sum())
+            raise AffineInfinityException(msg)
+        data = self._data
+
+        return AffinePointArray(data[:, 1:]/data[:, :1])
+
+    @property
+    def dim(self):
+        return self._data.shape[1] - 1
     @property
     def tol(self):
         return self._tol
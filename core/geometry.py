@@ -1,7 +1,5 @@
 from __future__ import print_function
 
-from sympy import Matrix
-
 from naglib.bertini.sysutils import BertiniRun
 from naglib.exceptions import BertiniError
 from naglib.core.base import NAGobject
@@ -21,10 +19,11 @@ class IrreducibleComponent(NAGobject):
         
         Optional keyword arguments:
         """
+        from sympy import Matrix
         self._witness_set = witness_set
         self._codim = codim
         self._component_id = component_id
-        self._degree = len(witness_set.witness_points)
+        self._degree = len(witness_set)
         
         # optional keyword arguments
         kkeys = kwargs.keys()
@@ -91,8 +90,10 @@ class IrreducibleComponent(NAGobject):
     def _construct_witness_data(self):
         codim = self._codim
         wpoints = self.witness_set.witness_points
-        hslice = self.witness_set.homogeneous_slice.coeffs
-        if not hslice:
+        hslice = self.witness_set.homogeneous_slice
+        if hslice:
+            hslice = hslice.coeffs
+        else:
             hslice = self.witness_set.linear_slice.coeffs
         homogenization_matrix = self._homogenization_matrix
         homogenization_variable = self._homogenization_variable
@@ -112,14 +113,20 @@ class IrreducibleComponent(NAGobject):
             }
 
         for p in wpoints:
-            if p.homogeneous_coordinates:
-                coordinates = p.homogeneous_coordinates
+            hcoordinates = p.homogeneous_coordinates
+            if hcoordinates is not None and len(hcoordinates) > 0:
+                coordinates = hcoordinates
             else:
                 coordinates = p.coordinates
+            approximation = p.last_approximation
+            if approximation is None:
+                approximation = coordinates
+            else:
+                approximation = approximation.coordinates
             wd['points'].append({
             'precision':p.precision,
             'coordinates':coordinates,
-            'last approximation':p.last_approximation.coordinates,
+            'last approximation':approximation,
             'condition number':p.condition_number,
             'corank':p.corank,
             'smallest nonzero':p.smallest_nonzero,
@@ -150,6 +157,9 @@ class IrreducibleComponent(NAGobject):
     def sample(self, numpoints=1, usebertini=True):
         """
         Sample points from self
+
+        If `usebertini' is False, move the witness slice in-process
+        instead of running Bertini.
         """
         if numpoints < 1:
             msg = "sample at least one point"
@@ -161,8 +171,8 @@ class IrreducibleComponent(NAGobject):
             sample_run = BertiniRun(system, BertiniRun.TSAMPLE, sample=numpoints, component=self)
             points = sample_run.run()
         else:
-            msg = "nothing to use yet but Bertini"
-            raise NotImplementedError(msg)
+            from naglib.core.numeric import sample
+            points = sample(self, numpoints)
         
         return points
     
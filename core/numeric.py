@@ -0,0 +1,978 @@
+"""Numerical methods run in-process on the compiled form of a system"""
+from __future__ import print_function
+
+import numpy as np
+
+from naglib.startup import DPS
+from naglib.core.base import NAGobject, AffinePoint, AffinePointArray
+
+def _lstsq_step(jac, values):
+    """
+    Return the (least squares, least norm) Newton step -J^+ F for each
+    of a batch of Jacobians J and residual vectors F, along with the
+    singular values of each J
+    """
+    U, sv, Vh = np.linalg.svd(jac, full_matrices=False)
+    # drop singular values which are zero to machine precision
+    cutoff = sv[...,:1]*max(jac.shape[1:])*np.finfo(float).eps
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = np.where(sv > cutoff, 1/sv, 0)
+    UhF = np.einsum('...ji,...j->...i', U.conj(), values)
+    step = -np.einsum('...ji,...j->...i', Vh.conj(), inv*UhF)
+
+    return step, sv
+
+def _mp_functions(system):
+    """
+    Return the system and its Jacobian lambdified for mpmath, building
+    them once per system
+    """
+    from sympy import lambdify
+
+    if 'mpmath function' not in system._cache:
+        allvars = list(system.variables) + list(system.parameters)
+        jac = system.jacobian()[0]
+        system._cache['mpmath function'] = lambdify(allvars, list(system.polynomials), modules='mpmath')
+        system._cache['mpmath jacobian'] = lambdify(allvars, list(jac), modules='mpmath')
+
+    return system._cache['mpmath function'], system._cache['mpmath jacobian']
+
+def _newton_mp(system, point, params, tol, maxit, dps):
+    """
+    Newton's method on a single point in multiple precision
+
+    Returns the refined point as a list of mpc, the residual, the
+    condition number of the Jacobian, whether the iteration converged
+    and the number of iterations taken
+    """
+    from mpmath import matrix, mpc, norm, svd_c, workdps
+
+    func, jacf = _mp_functions(system)
+    m, n = system.shape
+
+    with workdps(dps):
+        x = [mpc(c) for c in point]
+        p = [mpc(c) for c in params]
+        converged = False
+        it = 0
+        while it < maxit and not converged:
+            it += 1
+            F = matrix(func(*(x + p)))
+            J = matrix(m, n)
+            for k, entry in enumerate(jacf(*(x + p))):
+                J[k//n, k % n] = entry
+
+            try:
+                if m >= n:
+                    # least squares via the normal equations
+                    Jh = J.H
+                    dx = -(Jh*J)**-1*(Jh*F)
+                else:
+                    # least norm step
+                    dx = -J.H*((J*J.H)**-1*F)
+            except ZeroDivisionError:
+                break
+
+            x = [x[k] + dx[k] for k in range(n)]
+            converged = norm(dx) <= tol*(1 + norm(matrix(x)))
+
+        residual = norm(matrix(func(*(x + p))))
+        converged = converged and residual <= tol**0.5*(1 + norm(matrix(x)))
+        J = matrix(m, n)
+        for k, entry in enumerate(jacf(*(x + p))):
+            J[k//n, k % n] = entry
+        sv = svd_c(J, compute_uv=False)
+        sv = sorted([abs(s) for s in sv], reverse=True)
+        condition_number = float(sv[0]/sv[-1]) if sv[-1] != 0 else np.inf
+
+    return x, float(residual), condition_number, converged, it
+
+def newton(system, points, parameters=None, tol=1e-11, maxit=20, multiprec=True, dps=DPS):
+    """
+    Refine a batch of points with Newton's method
+
+    Every point is corrected at once in double precision, using the
+    compiled system and Jacobian. Points that fail to converge are then
+    retried one at a time in multiple precision with mpmath, if
+    `multiprec' is True.
+
+    Keyword arguments:
+    system     -- PolynomialSystem
+    points     -- array of shape (N, num_variables), PointArray, Point,
+                  or list of Points
+    parameters -- optional parameter values, (num_parameters,) or
+                  (N, num_parameters)
+    tol        -- optional float, a point has converged once the Newton
+                  step is smaller than tol*(1 + |x|) and the residual is
+                  smaller than sqrt(tol)*(1 + |x|)
+    maxit      -- optional int, maximum number of Newton iterations
+    multiprec  -- optional boolean, retry failures in multiple precision
+    dps        -- optional int, decimal digits to use in multiple precision
+
+    Returns a dict with entries
+    'points'            -- AffinePointArray, the refined points
+    'residuals'         -- array, 2-norm of the system at each point
+    'condition numbers' -- array, condition number of the Jacobian
+    'converged'         -- boolean array
+    'iterations'        -- int array, Newton iterations taken
+    'multiprecision'    -- dict, index to AffinePoint with mpc coordinates
+                           for each point refined in multiple precision
+    """
+    from naglib.core.algebra import _as_batch
+
+    m, n = system.shape
+    func = system.compile()
+    jacf = system.compile_jacobian()
+
+    points = _as_batch(points, n)[0].copy()
+    N = points.shape[0]
+    num_pars = len(system.parameters)
+    if num_pars:
+        if parameters is None:
+            msg = "specify values for the parameters {0}".format(list(system.parameters))
+            raise ValueError(msg)
+        params = np.asarray(parameters, dtype=np.complex128)
+        params = np.broadcast_to(params.reshape(-1, num_pars), (N, num_pars))
+    else:
+        params = np.zeros((N, 0), dtype=np.complex128)
+    pargs = lambda which: params[which] if params.shape[1] else None
+
+    x = points.copy()
+    converged = np.zeros(N, dtype=bool)
+    iterations = np.zeros(N, dtype=int)
+    active = np.arange(N)
+    with np.errstate(all='ignore'):
+        for it in range(maxit):
+            if len(active) == 0:
+                break
+            xa = x[active]
+            step, sv = _lstsq_step(jacf(xa, pargs(active)), func(xa, pargs(active)))
+            x[active] = xa + step
+            iterations[active] += 1
+
+            done = np.linalg.norm(step, axis=1) <= tol*(1 + np.linalg.norm(x[active], axis=1))
+            converged[active[done]] = True
+            # give up on points which have blown up
+            finite = np.isfinite(x[active]).all(axis=1)
+            active = active[~done & finite]
+
+        residuals = np.linalg.norm(func(x, pargs(slice(None))), axis=1)
+        if N:
+            sv = np.linalg.svd(jacf(x, pargs(slice(None))), compute_uv=False)
+            conds = sv[:,0]/sv[:,-1]
+        else:
+            # an empty batch, which older NumPy can't decompose
+            conds = np.zeros(0)
+        # a vanishing step at a point which is not a solution means
+        # Newton has stalled on a rank deficient Jacobian
+        norms = np.linalg.norm(x, axis=1)
+        converged &= residuals <= np.sqrt(tol)*(1 + norms)
+
+    multiprecision = {}
+    if multiprec:
+        for i in np.flatnonzero(~converged).tolist():
+            mpx, res, cond, conv, it = _newton_mp(system, points[i], list(params[i]), tol, maxit, dps)
+            if conv:
+                multiprecision[i] = AffinePoint(mpx)
+                x[i] = [complex(c) for c in mpx]
+                residuals[i] = res
+                conds[i] = cond
+                converged[i] = True
+                iterations[i] = it
+
+    return {'points':AffinePointArray(x),
+            'residuals':residuals,
+            'condition numbers':conds,
+            'converged':converged,
+            'iterations':iterations,
+            'multiprecision':multiprecision}
+
+# status of a path being tracked
+_TRACKING, _SUCCESS, _FAILED, _INFINITE = 0, 1, 2, 3
+
+def _random_complex(*shape):
+    """
+    Return an array of random complex numbers of unit variance
+    """
+    re = np.random.standard_normal(shape)
+    im = np.random.standard_normal(shape)
+    return (re + 1j*im)/np.sqrt(2)
+
+def _random_gamma():
+    """
+    Return a random complex number of modulus 1, for the gamma trick
+    """
+    theta = np.random.uniform(0, 2*np.pi)
+    return complex(np.cos(theta), np.sin(theta))
+
+def _mp_matrix(array):
+    """
+    Return a complex ndarray of dimension 1 (as a column) or 2 as an
+    mpmath matrix
+    """
+    from mpmath import matrix, mpc
+
+    array = np.asarray(array)
+    if array.ndim == 1:
+        return matrix([mpc(complex(a)) for a in array])
+    return matrix([[mpc(complex(a)) for a in row] for row in array])
+
+def _mp_reshape(entries, m, n):
+    """
+    Return the flat list `entries' as an m x n mpmath matrix
+    """
+    from mpmath import matrix
+
+    mat = matrix(m, n)
+    for k, entry in enumerate(entries):
+        mat[k//n, k % n] = entry
+    return mat
+
+def _mp_stack(top, bottom):
+    """
+    Return the mpmath matrices top and bottom stacked vertically
+    """
+    from mpmath import matrix
+
+    mat = matrix(top.rows + bottom.rows, top.cols)
+    for i in range(top.rows):
+        for j in range(top.cols):
+            mat[i,j] = top[i,j]
+    for i in range(bottom.rows):
+        for j in range(bottom.cols):
+            mat[top.rows + i,j] = bottom[i,j]
+    return mat
+
+def _parameter_jacobian(system):
+    """
+    Return the compiled Jacobian of the system with respect to its
+    parameters, building it once per system
+    """
+    from naglib.core.algebra import _compile_batch
+
+    if 'parameter jacobian function' not in system._cache:
+        jac = system.polynomials.jacobian(system.parameters)
+        system._cache['parameter jacobian function'] = _compile_batch(list(jac),
+                                                                      system.variables,
+                                                                      system.parameters,
+                                                                      jac.shape)
+    return system._cache['parameter jacobian function']
+
+def _mp_parameter_jacobian(system):
+    """
+    Return the Jacobian of the system with respect to its parameters
+    lambdified for mpmath, building it once per system
+    """
+    from sympy import lambdify
+
+    if 'mpmath parameter jacobian' not in system._cache:
+        allvars = list(system.variables) + list(system.parameters)
+        jac = system.polynomials.jacobian(system.parameters)
+        system._cache['mpmath parameter jacobian'] = lambdify(allvars, list(jac), modules='mpmath')
+    return system._cache['mpmath parameter jacobian']
+
+class _Target(NAGobject):
+    """
+    The square system [R*f(x, p); c*x - 1] tracked toward, where f is a
+    polynomial system, R randomizes f down to the number of equations
+    needed and the optional row c is a random patch fixing the scale of
+    homogeneous coordinates
+    """
+    def __init__(self, system, randomization, patch=None):
+        self._system = system
+        self._randomization = randomization
+        self._patch = patch
+        self._function = system.compile()
+        self._jacobian = system.compile_jacobian()
+
+    def evaluate(self, x, p=None, parameter_jacobian=False):
+        """
+        Return the target and its Jacobian at a batch of points x, and
+        also its Jacobian with respect to the parameters if asked
+        """
+        R = self._randomization
+        patch = self._patch
+        N = x.shape[0]
+
+        F = np.einsum('ij,kj->ki', R, self._function(x, p))
+        JF = np.einsum('ij,kjl->kil', R, self._jacobian(x, p))
+        if parameter_jacobian:
+            JP = np.einsum('ij,kjl->kil', R, _parameter_jacobian(self._system)(x, p))
+        if patch is not None:
+            F = np.hstack((F, (x.dot(patch) - 1)[:,None]))
+            JF = np.concatenate((JF, np.broadcast_to(patch, (N, 1, len(patch)))), axis=1)
+            if parameter_jacobian:
+                JP = np.concatenate((JP, np.zeros((N, 1, JP.shape[2]))), axis=1)
+
+        if parameter_jacobian:
+            return F, JF, JP
+        return F, JF
+
+    def evaluate_mp(self, x, p=[], parameter_jacobian=False):
+        """
+        Return the target and its Jacobian(s) at a single point x, a list
+        of mpc, as mpmath matrices
+        """
+        from mpmath import matrix
+
+        system = self._system
+        patch = self._patch
+        m, n = system.shape
+        R = _mp_matrix(self._randomization)
+        func, jacf = _mp_functions(system)
+        args = list(x) + list(p)
+
+        F = R*matrix(func(*args))
+        JF = R*_mp_reshape(jacf(*args), m, n)
+        if parameter_jacobian:
+            q = len(system.parameters)
+            JP = R*_mp_reshape(_mp_parameter_jacobian(system)(*args), m, q)
+        if patch is not None:
+            c = _mp_matrix(patch.reshape(1, -1))
+            F = _mp_stack(F, c*matrix(x) - matrix([1]))
+            JF = _mp_stack(JF, c)
+            if parameter_jacobian:
+                JP = _mp_stack(JP, matrix(1, q))
+
+        if parameter_jacobian:
+            return F, JF, JP
+        return F, JF
+
+class _TotalDegreeHomotopy(NAGobject):
+    """
+    H(x, t) = (1 - t)*F(x) + gamma*t*G(x), where G is the total degree
+    start system x_i^d_i - 1 (or x_i^d_i - h^d_i for homogeneous
+    coordinates) and the patch row of F, if any, is left alone
+    """
+    def __init__(self, target, degrees, gamma, parameters=None, homvar=None):
+        self._target = target
+        self._degrees = np.asarray(degrees)
+        self._gamma = gamma
+        self._parameters = parameters
+        self._homvar = homvar
+
+        k = len(degrees)
+        if homvar is None:
+            self._start_vars = np.arange(k)
+        else:
+            self._start_vars = np.array([i for i in range(k+1) if i != homvar])
+
+    def evaluate(self, x, t, paths):
+        """
+        Return H, dH/dx and dH/dt at a batch of points x and times t
+        """
+        degrees = self._degrees
+        gamma = self._gamma
+        homvar = self._homvar
+        start_vars = self._start_vars
+        N = x.shape[0]
+        k = len(degrees)
+        rows = np.arange(k)
+
+        F, JF = self._target.evaluate(x, self._parameters)
+
+        y = x[:,start_vars]
+        JG = np.zeros((N, k, x.shape[1]), dtype=np.complex128)
+        JG[:,rows,start_vars] = degrees*y**(degrees - 1)
+        if homvar is None:
+            G = y**degrees - 1
+        else:
+            h = x[:,homvar:homvar+1]
+            G = y**degrees - h**degrees
+            JG[:,rows,homvar] = -degrees*h**(degrees - 1)
+
+        s = t[:,None]
+        H = F.copy()
+        H[:,:k] = (1 - s)*F[:,:k] + gamma*s*G
+        Hx = JF.copy()
+        Hx[:,:k] = (1 - s[:,:,None])*JF[:,:k] + gamma*s[:,:,None]*JG
+        Ht = np.zeros_like(F)
+        Ht[:,:k] = gamma*G - F[:,:k]
+
+        return H, Hx, Ht
+
+    def evaluate_mp(self, x, t, path):
+        """
+        Return H, dH/dx and dH/dt at a single point x and time t as
+        mpmath matrices
+        """
+        from mpmath import matrix, mpc
+
+        degrees = [int(d) for d in self._degrees]
+        gamma = mpc(self._gamma)
+        homvar = self._homvar
+        start_vars = [int(i) for i in self._start_vars]
+        k = len(degrees)
+        parameters = [] if self._parameters is None else [mpc(complex(p)) for p in self._parameters]
+
+        F, JF = self._target.evaluate_mp(x, parameters)
+        H = F.copy()
+        Hx = JF.copy()
+        Ht = matrix(F.rows, 1)
+        for i in range(k):
+            d = degrees[i]
+            y = x[start_vars[i]]
+            h = 1 if homvar is None else x[homvar]
+            G = y**d - h**d
+            H[i] = (1 - t)*F[i] + gamma*t*G
+            Ht[i] = gamma*G - F[i]
+            for j in range(JF.cols):
+                Hx[i,j] = (1 - t)*JF[i,j]
+            Hx[i,start_vars[i]] += gamma*t*d*y**(d - 1)
+            if homvar is not None:
+                Hx[i,homvar] -= gamma*t*d*h**(d - 1)
+
+        return H, Hx, Ht
+
+    def start_points(self, patch=None):
+        """
+        Return every solution of the start system, as an array of shape
+        (prod(degrees), num_variables)
+        """
+        degrees = self._degrees
+        homvar = self._homvar
+        k = len(degrees)
+
+        roots = [np.exp(2j*np.pi*np.arange(d)/d) for d in degrees]
+        grid = np.meshgrid(*roots, indexing='ij')
+        starts = np.stack([g.ravel() for g in grid], axis=1).reshape(-1, k)
+        if homvar is not None:
+            starts = np.insert(starts, homvar, 1, axis=1)
+            starts /= starts.dot(patch)[:,None]
+
+        return starts
+
+class _ParameterHomotopy(NAGobject):
+    """
+    H(x, t) = F(x, p(t)), where p(t) = t*p0 + (1 - t)*p1 moves the
+    parameters in a straight line from p0 to p1; p1 may be given per
+    path, as an array of shape (num_paths, num_parameters)
+    """
+    def __init__(self, target, start_parameters, final_parameters):
+        self._target = target
+        self._start_parameters = start_parameters
+        self._final_parameters = final_parameters
+
+    def evaluate(self, x, t, paths):
+        """
+        Return H, dH/dx and dH/dt at a batch of points x and times t
+        """
+        p0 = self._start_parameters
+        p1 = self._final_parameters
+        if p1.ndim > 1:
+            p1 = p1[paths]
+        p = t[:,None]*p0 + (1 - t[:,None])*p1
+
+        F, JF, JP = self._target.evaluate(x, p, parameter_jacobian=True)
+        Ht = np.einsum('kij,kj->ki', JP, np.broadcast_to(p0 - p1, p.shape))
+
+        return F, JF, Ht
+
+    def evaluate_mp(self, x, t, path):
+        """
+        Return H, dH/dx and dH/dt at a single point x and time t as
+        mpmath matrices
+        """
+        p0 = _mp_matrix(self._start_parameters)
+        p1 = self._final_parameters
+        p1 = _mp_matrix(p1[path] if p1.ndim > 1 else p1)
+        p = t*p0 + (1 - t)*p1
+
+        F, JF, JP = self._target.evaluate_mp(x, [p[i] for i in range(p.rows)],
+                                             parameter_jacobian=True)
+        return F, JF, JP*(p0 - p1)
+
+class _SliceHomotopy(NAGobject):
+    """
+    H(x, t) = [F(x); L(t)*x], where L(t) = (1 - t)*L1 + gamma*t*L0 moves
+    a linear slice L0 of a positive dimensional component to a slice L1
+    chosen per path. In affine coordinates x is extended by a 1 so the
+    slices may have constant terms.
+    """
+    def __init__(self, target, start_slice, final_slices, gamma, affine=True):
+        self._target = target
+        self._start_slice = start_slice
+        self._final_slices = final_slices
+        self._gamma = gamma
+        self._affine = affine
+
+    def evaluate(self, x, t, paths):
+        """
+        Return H, dH/dx and dH/dt at a batch of points x and times t
+        """
+        gamma = self._gamma
+        L0 = self._start_slice
+        L1 = self._final_slices[paths]
+        N, n = x.shape
+
+        F, JF = self._target.evaluate(x)
+        if self._affine:
+            xh = np.hstack((x, np.ones((N, 1))))
+        else:
+            xh = x
+        s = t[:,None,None]
+        L = (1 - s)*L1 + gamma*s*L0
+
+        H = np.hstack((F, np.einsum('kij,kj->ki', L, xh)))
+        Hx = np.concatenate((JF, L[:,:,:n]), axis=1)
+        Ht = np.hstack((np.zeros_like(F), np.einsum('kij,kj->ki', gamma*L0 - L1, xh)))
+
+        return H, Hx, Ht
+
+    def evaluate_mp(self, x, t, path):
+        """
+        Return H, dH/dx and dH/dt at a single point x and time t as
+        mpmath matrices
+        """
+        from mpmath import matrix, mpc
+
+        gamma = mpc(self._gamma)
+        L0 = _mp_matrix(self._start_slice)
+        L1 = _mp_matrix(self._final_slices[path])
+        n = len(x)
+
+        F, JF = self._target.evaluate_mp(x)
+        xh = matrix(list(x) + [1]) if self._affine else matrix(x)
+        L = (1 - t)*L1 + gamma*t*L0
+
+        Lx = matrix(L.rows, n)
+        for i in range(L.rows):
+            for j in range(n):
+                Lx[i,j] = L[i,j]
+
+        H = _mp_stack(F, L*xh)
+        Hx = _mp_stack(JF, Lx)
+        Ht = _mp_stack(matrix(F.rows, 1), (gamma*L0 - L1)*xh)
+
+        return H, Hx, Ht
+
+def _track(homotopy, x, t1=0., tol=1e-6, maxnorm=1e8, minstep=1e-13, maxstep=0.1, maxsteps=10000, tfinal=1e-12, tcheck=1e-6):
+    """
+    Track a batch of paths of a homotopy from t = 1 to t = t1
+
+    Each step takes a fourth order Runge-Kutta prediction along
+    dx/dt = -Hx^-1 Ht and corrects it with up to three Newton
+    iterations. The step size of each path is halved when correction
+    fails and doubled after five successful steps in a row, and never
+    covers more than half the remaining distance to t1 until within
+    tfinal of it. A path whose norm grows more than tenfold between
+    t = tcheck and t1, or passes maxnorm, is taken to diverge.
+
+    Returns the points reached, the values of t reached, the status of
+    each path and the norm of each path at tcheck
+    """
+    x = np.array(x, dtype=np.complex128)
+    N = x.shape[0]
+    t = np.ones(N)
+    dt = np.full(N, min(0.01, maxstep))
+    successes = np.zeros(N, dtype=int)
+    status = np.full(N, _TRACKING)
+    scale = np.full(N, np.nan)
+
+    def velocity(xv, tv, paths):
+        H, Hx, Ht = homotopy.evaluate(xv, tv, paths)
+        return _lstsq_step(Hx, Ht)[0]
+
+    norm = lambda v: np.linalg.norm(v, axis=1)
+    with np.errstate(all='ignore'):
+        for step in range(maxsteps):
+            active = np.flatnonzero(status == _TRACKING)
+            if len(active) == 0:
+                break
+
+            xa = x[active]
+            ta = t[active]
+            # approach t1 geometrically, so paths diverging or meeting
+            # near t1 are followed rather than jumped across
+            h = np.minimum(dt[active], (ta - t1)/2)
+            h = np.where(ta - t1 <= 2*tfinal, ta - t1, h)
+            hh = h[:,None]
+
+            # predict, stepping t down by h
+            k1 = velocity(xa, ta, active)
+            k2 = velocity(xa - hh/2*k1, ta - h/2, active)
+            k3 = velocity(xa - hh/2*k2, ta - h/2, active)
+            k4 = velocity(xa - hh*k3, ta - h, active)
+            xp = xa - hh/6*(k1 + 2*k2 + 2*k3 + k4)
+            tp = np.where(h >= ta - t1, t1, ta - h)
+
+            # correct
+            for it in range(3):
+                H, Hx, Ht = homotopy.evaluate(xp, tp, active)
+                dx = _lstsq_step(Hx, H)[0]
+                xp = xp + dx
+                corrected = norm(dx) <= tol*(1 + norm(xp))
+                if corrected.all():
+                    break
+            accept = corrected & np.isfinite(xp).all(axis=1)
+
+            accepted = active[accept]
+            rejected = active[~accept]
+            x[accepted] = xp[accept]
+            t[accepted] = tp[accept]
+
+            successes[accepted] += 1
+            grow = accepted[successes[accepted] >= 5]
+            dt[grow] = np.minimum(2*dt[grow], maxstep)
+            successes[grow] = 0
+
+            dt[rejected] /= 2
+            successes[rejected] = 0
+
+            checked = accepted[(t[accepted] <= tcheck) & np.isnan(scale[accepted])]
+            scale[checked] = norm(x[checked])
+
+            status[rejected[dt[rejected] < minstep]] = _FAILED
+            ended = accepted[t[accepted] <= t1]
+            status[ended] = _SUCCESS
+            status[ended[norm(x[ended]) > 10*np.fmax(1, scale[ended])]] = _INFINITE
+            status[accepted[norm(x[accepted]) > maxnorm]] = _INFINITE
+
+    status[status == _TRACKING] = _FAILED
+
+    return x, t, status, scale
+
+def _track_mp(homotopy, x, t, path, scale=np.nan, t1=0., tol=1e-6, maxnorm=1e8, minstep=1e-13, maxstep=0.1, maxsteps=10000, tfinal=1e-12, tcheck=1e-6, dps=DPS):
+    """
+    Continue tracking a single path of a homotopy in multiple precision,
+    from the point x at time t to t = t1, given the norm `scale' of the
+    path at tcheck if it has been reached (see `_track')
+
+    Returns the point reached as a list of mpc, the value of t reached
+    and the status of the path
+    """
+    from mpmath import lu_solve, matrix, mpc, mpf, norm, workdps
+
+    with workdps(dps):
+        x = [mpc(complex(c)) for c in x]
+        t = mpf(t)
+        t1 = mpf(t1)
+        dt = mpf(min(0.01, maxstep))
+        successes = 0
+        status = _FAILED
+
+        def velocity(xv, tv):
+            H, Hx, Ht = homotopy.evaluate_mp(xv, tv, path)
+            v = lu_solve(Hx, -Ht)
+            return [v[i] for i in range(v.rows)]
+
+        def axpy(a, u, v):
+            return [vi + a*ui for ui, vi in zip(u, v)]
+
+        for step in range(maxsteps):
+            if t <= t1:
+                status = _SUCCESS
+                if norm(matrix(x)) > 10*max(1, scale):
+                    status = _INFINITE
+                break
+
+            h = min(dt, (t - t1)/2)
+            if t - t1 <= 2*tfinal:
+                h = t - t1
+            tp = t1 if h >= t - t1 else t - h
+            corrected = False
+            try:
+                k1 = velocity(x, t)
+                k2 = velocity(axpy(-h/2, k1, x), t - h/2)
+                k3 = velocity(axpy(-h/2, k2, x), t - h/2)
+                k4 = velocity(axpy(-h, k3, x), t - h)
+                k = [a + 2*b + 2*c + d for a, b, c, d in zip(k1, k2, k3, k4)]
+                xp = axpy(-h/6, k, x)
+
+                for it in range(3):
+                    H, Hx, Ht = homotopy.evaluate_mp(xp, tp, path)
+                    dx = lu_solve(Hx, -H)
+                    xp = [xp[i] + dx[i] for i in range(len(xp))]
+                    if norm(dx) <= tol*(1 + norm(matrix(xp))):
+                        corrected = True
+                        break
+            except ZeroDivisionError:
+                pass
+
+            if corrected:
+                x = xp
+                t = tp
+                if t <= tcheck and np.isnan(scale):
+                    scale = float(norm(matrix(x)))
+                successes += 1
+                if successes >= 5:
+                    dt = min(2*dt, maxstep)
+                    successes = 0
+                if norm(matrix(x)) > maxnorm:
+                    status = _INFINITE
+                    break
+            else:
+                dt /= 2
+                successes = 0
+                if dt < minstep**2:
+                    break
+
+    return x, float(t), status
+
+def _run_homotopy(homotopy, starts, multiprec=True, dps=DPS, finaltol=1e-11):
+    """
+    Track every start point of a homotopy to t = 0, retracking paths
+    which fail in double precision in multiple precision, and sharpen
+    the endpoints with Newton's method at t = 0
+
+    Returns the endpoints and the status of each path
+    """
+    x, t, status, scale = _track(homotopy, starts)
+
+    if multiprec:
+        for i in np.flatnonzero(status == _FAILED).tolist():
+            xi, ti, si = _track_mp(homotopy, x[i], t[i], i, scale[i], dps=dps)
+            if si != _FAILED:
+                x[i] = [complex(c) for c in xi]
+                status[i] = si
+
+    done = np.flatnonzero(status == _SUCCESS)
+    if len(done):
+        zero = np.zeros(len(done))
+        norm = lambda v: np.linalg.norm(v, axis=1)
+        with np.errstate(all='ignore'):
+            for it in range(5):
+                H, Hx, Ht = homotopy.evaluate(x[done], zero, done)
+                dx = _lstsq_step(Hx, H)[0]
+                finite = np.isfinite(dx).all(axis=1)
+                x[done[finite]] += dx[finite]
+                if (norm(dx) <= finaltol*(1 + norm(x[done]))).all():
+                    break
+            # Newton converges only linearly to singular endpoints, so
+            # reject just those endpoints it still moves far; these come
+            # from paths headed to infinity which reached t = 0 anyway
+            stalled = ~(norm(dx) <= np.sqrt(finaltol)*(1 + norm(x[done])))
+            status[done[stalled]] = _FAILED
+
+    return x, status
+
+def _square_target(system):
+    """
+    Return a _Target squaring up `system' for zero dimensional solving,
+    along with the degrees of its equations and the index of the
+    homogenizing variable (None if the system is affine)
+    """
+    m, n = system.shape
+    degrees = np.array(system.degree, dtype=int)
+    if system.homvar:
+        homvar = list(system.variables).index(system.homvar)
+        k = n - 1
+        patch = _random_complex(n)
+    else:
+        homvar = None
+        k = n
+        patch = None
+
+    if m < k or system.rank() < k:
+        msg = "solving positive dimensional systems requires Bertini"
+        raise NotImplementedError(msg)
+
+    # randomize f down to k equations; sorting by degree first ensures
+    # each randomized equation has the degree of its leading polynomial
+    order = np.argsort(-degrees, kind='mergesort')
+    R = np.zeros((k, m), dtype=np.complex128)
+    R[np.arange(k), order[:k]] = 1
+    R[:,order[k:]] = _random_complex(k, m - k)
+
+    return _Target(system, R, patch), degrees[order[:k]], homvar
+
+def _as_solutions(system, x):
+    """
+    Return rows of x as a list of points of the type Bertini would give
+    """
+    from naglib.core.base import ProjectivePoint
+
+    if system.homvar:
+        return [ProjectivePoint(row) for row in x]
+    return [AffinePoint(row) for row in x]
+
+def solve_total_degree(system, parameters=None, multiprec=True):
+    """
+    Solve a square (or overdetermined) system with a total degree
+    homotopy, without calling Bertini
+
+    Keyword arguments:
+    system     -- PolynomialSystem
+    parameters -- optional parameter values, if the system has any
+    multiprec  -- optional boolean, retrack paths which fail in double
+                  precision in multiple precision
+
+    Returns the finite solutions as a list of AffinePoints, or
+    ProjectivePoints if the system is homogeneous
+    """
+    if len(system.parameters):
+        if parameters is None:
+            msg = "specify values for the parameters {0}".format(list(system.parameters))
+            raise ValueError(msg)
+        parameters = np.asarray(parameters, dtype=np.complex128).ravel()
+
+    target, degrees, homvar = _square_target(system)
+    homotopy = _TotalDegreeHomotopy(target, degrees, _random_gamma(), parameters, homvar)
+    starts = homotopy.start_points(target._patch)
+    if len(starts) == 0:
+        return []
+
+    x, status = _run_homotopy(homotopy, starts, multiprec)
+    x = x[status == _SUCCESS]
+
+    # randomizing introduces solutions which are not solutions of f
+    if system.shape[0] > len(degrees) and len(x):
+        residuals = system.residuals(x, parameters)
+        x = x[residuals <= 1e-8*(1 + np.linalg.norm(x, axis=1))]
+
+    return _as_solutions(system, x)
+
+def solve_parameter_homotopy(system, start, start_parameters, final_parameters, multiprec=True):
+    """
+    Track the solutions `start' of a system at `start_parameters' to
+    the solutions at `final_parameters', without calling Bertini
+
+    Returns the finite solutions as a list of AffinePoints, or
+    ProjectivePoints if the system is homogeneous
+    """
+    from naglib.core.algebra import _as_batch
+
+    m, n = system.shape
+    p0 = _as_batch(start_parameters, len(system.parameters))[0][0]
+    p1 = _as_batch(final_parameters, len(system.parameters))[0][0]
+    if start is None:
+        msg = "specify start points with the keyword argument `start'"
+        raise ValueError(msg)
+    starts = _as_batch(start, n)[0]
+
+    target = _square_target(system)[0]
+    if target._patch is not None:
+        starts = starts/starts.dot(target._patch)[:,None]
+    homotopy = _ParameterHomotopy(target, p0, p1)
+
+    x, status = _run_homotopy(homotopy, starts, multiprec)
+    return _as_solutions(system, x[status == _SUCCESS])
+
+def parameter_sweep(system, start, start_parameters, targets, multiprec=True, max_paths=10000):
+    """
+    Track the solutions `start' of a system at `start_parameters' to
+    the solutions at each row of `targets', without calling Bertini
+
+    The paths for many targets are tracked together, at most about
+    `max_paths' at a time.
+
+    Yields (index, solutions) pairs in order, where solutions is an
+    array with one solution per row
+    """
+    from naglib.core.algebra import _as_batch
+
+    m, n = system.shape
+    q = len(system.parameters)
+    p0 = _as_batch(start_parameters, q)[0][0]
+    targets = np.asarray(targets, dtype=np.complex128).reshape(-1, q)
+    starts = _as_batch(start, n)[0]
+    num_starts = len(starts)
+
+    target = _square_target(system)[0]
+    if target._patch is not None:
+        starts = starts/starts.dot(target._patch)[:,None]
+
+    per_batch = max(1, max_paths//max(1, num_starts))
+    for first in range(0, len(targets), per_batch):
+        batch = targets[first:first+per_batch]
+        homotopy = _ParameterHomotopy(target, p0, np.repeat(batch, num_starts, axis=0))
+        x, status = _run_homotopy(homotopy, np.tile(starts, (len(batch), 1)), multiprec)
+
+        x = x.reshape(len(batch), num_starts, n)
+        success = (status == _SUCCESS).reshape(len(batch), num_starts)
+        for k in range(len(batch)):
+            yield first + k, x[k][success[k]]
+
+def _slice_coefficients(witness_set, affine):
+    """
+    Return the coefficients of the linear slice of `witness_set' as a
+    complex array acting on the system's variables, followed by a 1 if
+    `affine', or None if the witness set has no slice
+    """
+    variables = list(witness_set.system.variables)
+    hslice = witness_set.homogeneous_slice
+    lslice = witness_set.linear_slice
+    if affine and hslice is not None:
+        lslice = hslice
+        columns = variables + [hslice.homvar]
+    elif lslice is not None:
+        columns = variables
+    else:
+        return None
+
+    slice_vars = list(lslice.variables)
+    if not set(columns).issubset(slice_vars):
+        msg = "linear slice {0} is not in the variables {1}".format(lslice, columns)
+        raise ValueError(msg)
+    coeffs = np.array([[complex(c) for c in row] for row in lslice.coeffs.tolist()],
+                      dtype=np.complex128).reshape(lslice.shape)
+    coeffs = coeffs[:,[slice_vars.index(v) for v in columns]]
+    if affine and lslice is not hslice:
+        # a dehomogenized slice, coeffs*x + 1 = 0
+        coeffs = np.hstack((coeffs, np.ones((coeffs.shape[0], 1))))
+
+    return coeffs
+
+def sample(component, numpoints=1, multiprec=True):
+    """
+    Sample points from an irreducible component by moving the linear
+    slice cutting out its witness points, without calling Bertini
+
+    Each sample tracks one witness point to a new random slice. Witness
+    sets made without a slice start from a random one through their
+    witness points.
+
+    Returns a list of AffinePoints, or ProjectivePoints if the system
+    is homogeneous
+    """
+    from naglib.core.algebra import _as_batch
+
+    system = component.system
+    if len(system.parameters):
+        msg = "sampling parameterized systems requires Bertini"
+        raise NotImplementedError(msg)
+
+    m, n = system.shape
+    codim = component.codim
+    affine = not system.homvar
+    dim = n - codim if affine else n - codim - 1
+
+    points = _as_batch(component.witness_set.witness_points, n)[0]
+    if affine:
+        patch = None
+        coords = np.hstack((points, np.ones((len(points), 1))))
+    else:
+        patch = _random_complex(n)
+        points = points/points.dot(patch)[:,None]
+        coords = points
+
+    start_slice = _slice_coefficients(component.witness_set, affine)
+    if start_slice is None:
+        # the witness points lie on a linear space of codimension dim;
+        # take a random one out of those containing them all
+        U, sv, Vh = np.linalg.svd(coords)
+        rank = int((sv > 1e-8*sv[0]).sum())
+        null = Vh[rank:].conj()
+        if null.shape[0] < dim:
+            msg = "witness points do not lie on a linear space of codimension {0}".format(dim)
+            raise ValueError(msg)
+        start_slice = _random_complex(dim, null.shape[0]).dot(null)
+    else:
+        residuals = np.abs(coords.dot(start_slice.T)).max(axis=1)
+        scale = np.abs(start_slice).max()*np.abs(coords).max(axis=1)
+        if start_slice.shape[0] != dim or (residuals > 1e-6*scale).any():
+            msg = "witness points do not lie on the witness set's linear slice"
+            raise ValueError(msg)
+    final_slices = _random_complex(numpoints, dim, coords.shape[1])
+
+    if m > codim:
+        R = _random_complex(codim, m)
+    else:
+        R = np.eye(m)
+    target = _Target(system, R, patch)
+    homotopy = _SliceHomotopy(target, start_slice, final_slices, _random_gamma(), affine)
+
+    starts = points[np.arange(numpoints) % len(points)]
+    x, status = _run_homotopy(homotopy, starts, multiprec)
+
+    return _as_solutions(system, x[status == _SUCCESS])
@@ -0,0 +1,208 @@
+"""Straight-line programs: polynomials as a shared list of instructions"""
+from __future__ import print_function
+
+import numpy as np
+
+from naglib.core.base import NAGobject
+
+def _fresh_prefix(names, prefix='sub'):
+    """
+    Return a prefix which no name in `names' starts with, so numbered
+    names made from it are new
+    """
+    while any([n.startswith(prefix) for n in names]):
+        prefix += '_'
+    return prefix
+
+def _bertini_str(expr):
+    """
+    Return SymPy expression `expr' as Bertini reads it
+    """
+    from re import sub as resub
+    return resub(r'\*\*', '^', str(expr))
+
+def _ipow(x, e):
+    """
+    Return x**e for an array x and int e, by repeated squaring
+    """
+    if e < 0:
+        return 1/_ipow(x, -e)
+    result = None
+    while e:
+        if e & 1:
+            result = x if result is None else result*x
+        e >>= 1
+        if e:
+            x = x*x
+    if result is None:
+        return np.ones_like(x)
+    return result
+
+class StraightLineProgram(NAGobject):
+    """
+    A list of expressions compiled into one program of instructions
+
+    Common subexpressions (found by SymPy's `cse') are computed once and
+    shared by every expression using them. Registers 0 through
+    num_variables + num_parameters - 1 hold the variables, then the
+    parameters; then come the results of instructions, in order. Each
+    instruction is a tuple (op, dest, args), where op is one of 'const',
+    with args a 1-tuple of a complex constant, 'add' and 'mul', with
+    args the registers to add or multiply, or 'pow', with args a
+    register and an integer exponent.
+    """
+    def __init__(self, exprs, variables, parameters=()):
+        """
+        Initialize the StraightLineProgram object
+
+        Keyword arguments:
+        exprs      -- iterable of SymPy expressions, polynomial in
+                      `variables' and `parameters'
+        variables  -- iterable of SymPy symbols
+        parameters -- optional iterable of SymPy symbols
+        """
+        from sympy import cse, numbered_symbols, sympify
+
+        exprs = [sympify(e) for e in exprs]
+        variables = list(variables)
+        parameters = list(parameters)
+
+        names = [str(s) for s in variables + parameters]
+        for e in exprs:
+            names += [str(s) for s in e.free_symbols]
+        prefix = _fresh_prefix(names)
+        subexprs, reduced = cse(exprs, symbols=numbered_symbols(prefix), order='none')
+
+        self._variables = variables
+        self._parameters = parameters
+        self._subexprs = subexprs
+        self._reduced = list(reduced)
+
+        self._registers = dict([(s, i) for i, s in enumerate(variables + parameters)])
+        self._num_inputs = len(self._registers)
+        self._instructions = []
+        self._memo = {}
+        for symbol, expr in subexprs:
+            self._registers[symbol] = self._emit(expr)
+        self._outputs = [self._emit(expr) for expr in self._reduced]
+        del self._memo
+
+    def __len__(self):
+        """
+        x.__len__() <==> len(x)
+        """
+        return len(self._instructions)
+
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        return 'StraightLineProgram({0} expressions, {1} instructions)'.format(len(self._outputs), len(self))
+
+    def _emit(self, expr):
+        """
+        Add the instructions computing `expr' and return its register
+        """
+        if expr in self._registers:
+            return self._registers[expr]
+        if expr in self._memo:
+            return self._memo[expr]
+
+        if expr.is_number:
+            dest = self._append('const', (complex(expr),))
+        elif expr.is_Symbol:
+            msg = "symbol {0} is neither a variable nor a parameter".format(expr)
+            raise ValueError(msg)
+        elif expr.is_Add:
+            dest = self._append('add', tuple([self._emit(a) for a in expr.args]))
+        elif expr.is_Mul:
+            dest = self._append('mul', tuple([self._emit(a) for a in expr.args]))
+        elif expr.is_Pow and expr.exp.is_Integer:
+            dest = self._append('pow', (self._emit(expr.base), int(expr.exp)))
+        else:
+            msg = "cannot compile {0}, which is not polynomial".format(expr)
+            raise ValueError(msg)
+
+        self._memo[expr] = dest
+        return dest
+
+    def _append(self, op, args):
+        dest = self._num_inputs + len(self._instructions)
+        self._instructions.append((op, dest, args))
+        return dest
+
+    def bertini_lines(self, names):
+        """
+        Return the lines of a Bertini INPUT section defining the
+        expressions as `names', each shared subexpression written once
+        as an intermediate function
+        """
+        lines = []
+        for symbol, expr in self._subexprs:
+            lines.append('{0} = {1};'.format(symbol, _bertini_str(expr)))
+        for name, expr in zip(names, self._reduced):
+            lines.append('{0} = {1};'.format(name, _bertini_str(expr)))
+        return lines
+
+    def evaluate(self, points, params=None):
+        """
+        Evaluate the expressions at a batch of points
+
+        Takes an array of shape (N, num_variables) (or a single point)
+        and, if there are parameters, parameter values of shape
+        (N, num_parameters) or (num_parameters,), and returns a complex
+        array of shape (N, num_expressions).
+        """
+        from naglib.core.algebra import _as_batch
+
+        num_vars = len(self._variables)
+        num_pars = len(self._parameters)
+        points, single = _as_batch(points, num_vars)
+        N = points.shape[0]
+
+        registers = [points[:,j] for j in range(num_vars)]
+        if num_pars:
+            if params is None:
+                msg = "specify values for the parameters {0}".format(self._parameters)
+                raise ValueError(msg)
+            params = np.asarray(params, dtype=np.complex128)
+            params = np.broadcast_to(params.reshape(-1, num_pars), (N, num_pars))
+            registers += [params[:,j] for j in range(num_pars)]
+
+        for op, dest, args in self._instructions:
+            if op == 'const':
+                value = args[0]
+            elif op == 'add':
+                value = registers[args[0]]
+                for a in args[1:]:
+                    value = value + registers[a]
+            elif op == 'mul':
+                value = registers[args[0]]
+                for a in args[1:]:
+                    value = value*registers[a]
+            else:
+                value = _ipow(registers[args[0]], args[1])
+            registers.append(value)
+
+        values = np.empty((N, len(self._outputs)), dtype=np.complex128)
+        for i, r in enumerate(self._outputs):
+            values[:,i] = registers[r] # constants are broadcast
+        if single:
+            return values[0]
+        return values
+
+    @property
+    def instructions(self):
+        return self._instructions
+    @property
+    def outputs(self):
+        return self._outputs
+    @property
+    def parameters(self):
+        return self._parameters
+    @property
+    def subexpressions(self):
+        return self._subexprs
+    @property
+    def variables(self):
+        return self._variables
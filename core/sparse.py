@@ -0,0 +1,242 @@
+"""Polynomials stored by their supports, for work that needn't walk SymPy trees"""
+from __future__ import print_function
+
+import numpy as np
+
+from naglib.core.base import NAGobject
+
+class SparsePolynomials(NAGobject):
+    """
+    A list of polynomials stored by their supports
+
+    The terms of all the polynomials are kept together: row t of the
+    integer matrix `exponents' holds the exponents of term t in the
+    variables, then the parameters, and `coefficients' its (exact,
+    SymPy) coefficient. The terms of polynomial i are rows
+    offsets[i]:offsets[i+1]. Degrees are taken in the variables alone.
+    """
+    def __init__(self, exponents, coefficients, offsets, numvars):
+        """
+        Initialize the SparsePolynomials object
+
+        Keyword arguments:
+        exponents    -- int array of shape (numterms, numvars + numparams)
+        coefficients -- sequence of numterms SymPy numbers
+        offsets      -- int array of shape (numpolys + 1,), where the
+                        terms of each polynomial start
+        numvars      -- int, the number of variables
+        """
+        self._exponents = np.asarray(exponents, dtype=np.int64)
+        self._coefficients = list(coefficients)
+        self._offsets = np.asarray(offsets, dtype=np.int64)
+        self._numvars = numvars
+        self._numeric = None
+
+    @classmethod
+    def from_sympy(cls, polynomials, variables, parameters=()):
+        """
+        Return the supports of SymPy `polynomials' in `variables' and
+        `parameters'
+        """
+        from sympy import Poly, S
+
+        gens = list(variables) + list(parameters)
+        width = len(gens)
+        exponents = []
+        coefficients = []
+        offsets = [0]
+        for p in polynomials:
+            if gens:
+                terms = Poly(p, *gens).terms()
+            else:
+                terms = [((), S(p))]
+            for monomial, coeff in terms:
+                if coeff != 0:
+                    exponents.append(monomial)
+                    coefficients.append(coeff)
+            offsets.append(len(coefficients))
+
+        exponents = np.array(exponents, dtype=np.int64).reshape(len(coefficients), width)
+        return cls(exponents, coefficients, offsets, len(variables))
+
+    def __len__(self):
+        """
+        x.__len__() <==> len(x)
+        """
+        return len(self._offsets) - 1
+
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        return 'SparsePolynomials({0} polynomials, {1} terms)'.format(len(self), len(self._coefficients))
+
+    def _numeric_coefficients(self):
+        if self._numeric is None:
+            self._numeric = np.array([complex(c) for c in self._coefficients], dtype=np.complex128)
+        return self._numeric
+
+    def _term_degrees(self):
+        return self._exponents[:,:self._numvars].sum(axis=1)
+
+    def _owners(self):
+        """
+        Return the index of the polynomial each term belongs to
+        """
+        return np.repeat(np.arange(len(self)), np.diff(self._offsets))
+
+    def as_exprs(self, gens):
+        """
+        Return the polynomials as SymPy expressions in `gens', the
+        variables followed by the parameters
+        """
+        from sympy import Add, Mul, S
+
+        gens = list(gens)
+        exprs = []
+        for i in range(len(self)):
+            terms = []
+            for t in range(self._offsets[i], self._offsets[i+1]):
+                factors = [g**int(e) for g, e in zip(gens, self._exponents[t]) if e]
+                terms.append(Mul(self._coefficients[t], *factors))
+            exprs.append(Add(*terms) if terms else S.Zero)
+        return exprs
+
+    def degrees(self):
+        """
+        Return the total degree of each polynomial in the variables,
+        0 for the zero polynomial
+        """
+        degrees = np.zeros(len(self), dtype=np.int64)
+        if len(self._coefficients):
+            np.maximum.at(degrees, self._owners(), self._term_degrees())
+        return tuple(degrees.tolist())
+
+    def dehomogenize(self, index):
+        """
+        Return the polynomials with variable `index' set to 1
+        """
+        exponents = np.delete(self._exponents, index, axis=1)
+        owners = self._owners()
+        # terms differing only in the dropped variable combine
+        combined = {}
+        order = []
+        for t in range(len(self._coefficients)):
+            key = (owners[t],) + tuple(exponents[t].tolist())
+            if key in combined:
+                combined[key] += self._coefficients[t]
+            else:
+                combined[key] = self._coefficients[t]
+                order.append(key)
+
+        newexps = []
+        newcoeffs = []
+        offsets = [0]*(len(self) + 1)
+        for key in order:
+            if combined[key] != 0:
+                newexps.append(key[1:])
+                newcoeffs.append(combined[key])
+                offsets[key[0] + 1] += 1
+        offsets = np.cumsum(offsets)
+
+        newexps = np.array(newexps, dtype=np.int64).reshape(len(newcoeffs), exponents.shape[1])
+        return SparsePolynomials(newexps, newcoeffs, offsets, self._numvars - 1)
+
+    def diff(self, index):
+        """
+        Return the derivatives of the polynomials with respect to
+        variable (or parameter) `index'
+        """
+        exps = self._exponents[:,index]
+        keep = exps > 0
+        exponents = self._exponents[keep].copy()
+        exponents[:,index] -= 1
+        coefficients = [c*int(e) for c, e, k in zip(self._coefficients, exps, keep) if k]
+        counts = np.bincount(self._owners()[keep], minlength=len(self))
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        return SparsePolynomials(exponents, coefficients, offsets, self._numvars)
+
+    def jacobian(self):
+        """
+        Return the derivatives of every polynomial in every variable,
+        row by row: polynomial i*numvars + j is the derivative of
+        polynomial i in variable j
+        """
+        diffs = [self.diff(j) for j in range(self._numvars)]
+        exponents = []
+        coefficients = []
+        offsets = [0]
+        for i in range(len(self)):
+            for d in diffs:
+                start, stop = d._offsets[i], d._offsets[i+1]
+                exponents.append(d._exponents[start:stop])
+                coefficients.extend(d._coefficients[start:stop])
+                offsets.append(offsets[-1] + stop - start)
+
+        width = self._exponents.shape[1]
+        exponents = np.vstack(exponents) if exponents else np.zeros((0, width), dtype=np.int64)
+        return SparsePolynomials(exponents, coefficients, offsets, self._numvars)
+
+    def evaluate(self, values):
+        """
+        Evaluate the polynomials at each row of `values', an array of
+        shape (N, numvars + numparams), returning an array of shape
+        (N, numpolys)
+        """
+        values = np.asarray(values, dtype=np.complex128)
+        N = values.shape[0]
+        exponents = self._exponents
+        numterms = exponents.shape[0]
+
+        # each monomial from tables of powers, one variable at a time,
+        # touching only the terms the variable appears in
+        monomials = np.ones((numterms, N), dtype=np.complex128)
+        for j in range(exponents.shape[1]):
+            e = exponents[:,j]
+            terms = np.flatnonzero(e)
+            if not len(terms):
+                continue
+            e = e[terms]
+            maxe = int(e.max())
+            powers = np.empty((maxe + 1, N), dtype=np.complex128)
+            powers[0] = 1
+            for d in range(1, maxe + 1):
+                powers[d] = powers[d-1]*values[:,j]
+            monomials[terms] *= powers[e]
+        monomials *= self._numeric_coefficients()[:,np.newaxis]
+
+        result = np.zeros((len(self), N), dtype=np.complex128)
+        nonempty = self._offsets[1:] > self._offsets[:-1]
+        if nonempty.any():
+            result[nonempty] = np.add.reduceat(monomials, self._offsets[:-1][nonempty], axis=0)
+        return result.T
+
+    def homogeneous(self):
+        """
+        Return a boolean array, True where every term of a polynomial
+        has the same degree in the variables
+        """
+        degrees = np.array(self.degrees(), dtype=np.int64)
+        if not len(self._coefficients):
+            return np.ones(len(self), dtype=bool)
+        short = self._term_degrees() != degrees[self._owners()]
+        return np.bincount(self._owners()[short], minlength=len(self)) == 0
+
+    def homogenize(self):
+        """
+        Return the polynomials homogenized with a new first variable
+        """
+        degrees = np.array(self.degrees(), dtype=np.int64)
+        homexps = (degrees[self._owners()] - self._term_degrees()).reshape(-1, 1)
+        exponents = np.hstack((homexps, self._exponents))
+        return SparsePolynomials(exponents, self._coefficients, self._offsets, self._numvars + 1)
+
+    @property
+    def coefficients(self):
+        return self._coefficients
+    @property
+    def exponents(self):
+        return self._exponents
+    @property
+    def offsets(self):
+        return self._offsets
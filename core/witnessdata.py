@@ -1,12 +1,34 @@
-from sympy import I, Float, Rational, Matrix
-
 from naglib.exceptions import WitnessDataException
 from naglib.core.base import NAGobject, Point, AffinePoint, ProjectivePoint
 
+def _float_coordinates(coordinates, prec=None):
+    """
+    Return `coordinates' as a list of SymPy Floats, to `prec' digits if
+    given
+    """
+    from sympy import I, Float, sympify
+    newcoords = []
+    for c in coordinates:
+        real,imag = sympify(c).as_real_imag()
+        if prec:
+            real = Float(real, prec)
+            imag = Float(imag, prec)
+        else:
+            real = Float(real)
+            imag = Float(imag)
+        newcoords.append(real + I*imag)
+
+    return newcoords
+
 class WitnessPoint(Point):
     """
     A single witness point for an algebraic set
     """
+    __slots__ = ('_component_id', '_is_projective', '_corank',
+                 '_condition_number', '_smallest_nonzero', '_largest_zero',
+                 '_point_type', '_multiplicity', '_deflations', '_precision',
+                 '_last_approximation', '_homogeneous_coordinates')
+
     def __init__(self, coordinates, component_id, is_projective=False, **kwargs):
         """
         Initialize the WitnessPoint object.
@@ -65,15 +87,16 @@ class WitnessPoint(Point):
         else:
             self._precision = 0
             
+        # None until given
         if 'last_approximation' in kkeys:
             self._last_approximation = kwargs['last_approximation']
         else:
-            self._last_approximation = Matrix([])
+            self._last_approximation = None
             
         if 'homogeneous_coordinates' in kkeys:
             self._homogeneous_coordinates = kwargs['homogeneous_coordinates']
         else:
-            self._homogeneous_coordinates = Matrix([])
+            self._homogeneous_coordinates = None
         
         # TODO: sanity check projective point
 
@@ -81,7 +104,7 @@ class WitnessPoint(Point):
         """
         x.__repr__() <==> repr(x)
         """
-        coordinates = [str(c.n()) for c in self._coordinates]
+        coordinates = [str(c.n()) for c in self._coordinate_list()]
         component_id = self._component_id
         is_projective = self._is_projective
         
@@ -106,7 +129,7 @@ class WitnessPoint(Point):
         """
         x.__str__() <==> str(x)
         """
-        coordinates = self._coordinates
+        coordinates = self._coordinate_list()
         is_projective = self._is_projective
         
         if is_projective:
@@ -117,12 +140,11 @@ class WitnessPoint(Point):
         return repstr
         
     def as_point(self):
-        coordinates = self._coordinates
         is_projective = self._is_projective
         if is_projective:
-            return ProjectivePoint(coordinates)
+            return ProjectivePoint(self)
         else:
-            return AffinePoint(coordinates)
+            return AffinePoint(self)
     
     def dehomogenize(self):
         """
@@ -132,13 +154,7 @@ class WitnessPoint(Point):
         """
         cls = self.__class__
         component_id = self._component_id
-        coordinates = self._coordinates
-        is_projective = self._is_projective
-        
-        if is_projective:
-            point = ProjectivePoint(coordinates)
-        else:
-            point = AffinePoint(coordinates)
+        point = self.as_point()
             
         deh = cls(point, component_id)
         deh._is_projective = self._is_projective
@@ -157,24 +173,21 @@ class WitnessPoint(Point):
     def float(self, prec=None):
         cls = self.__class__
         component_id = self._component_id
-        coordinates = self._coordinates
-        newcoords = []
-        for c in coordinates:
-            real,imag = c.as_real_imag()
-            if prec:
-                real = Float(real, prec)
-                imag = Float(imag, prec)
-            else:
-                real = Float(real)
-                imag = Float(imag)
-            newcoords.append(real + I*imag)
-        flo = cls(coordinates, component_id)
+        newcoords = _float_coordinates(self._coordinates, prec)
+        flo = cls(newcoords, component_id)
+        
+        # the last approximation is converted like the coordinates
+        last_approximation = self._last_approximation
+        if isinstance(last_approximation, Point):
+            last_approximation = last_approximation.float(prec)
+        elif last_approximation is not None:
+            last_approximation = _float_coordinates(last_approximation, prec)
         
         flo._is_projective = self._is_projective
         flo._condition_number = self._condition_number
         flo._corank = self._corank
         flo._deflations = self._deflations
-        flo._last_approximation = self._last_approximation.float()
+        flo._last_approximation = last_approximation
         flo._largest_zero = self._largest_zero
         flo._multiplicity = self._multiplicity
         flo._point_type = self._point_type
@@ -190,6 +203,7 @@ class WitnessPoint(Point):
         """
         Returns a rational approximation of self
         """
+        from sympy import I, Rational
         cls = self.__class__
         component_id = self._component_id
         coordinates = self._coordinates
@@ -249,6 +263,8 @@ class WitnessPoint(Point):
     @property
     def last_approximation(self):
         coordinates = self._last_approximation
+        if coordinates is None:
+            return None
         is_projective = self._is_projective
         if is_projective:
             return ProjectivePoint(coordinates)
@@ -287,6 +303,64 @@ class WitnessPoint(Point):
         """
         return self._smallest_nonzero
 
+class LazyWitnessPoints(NAGobject):
+    """
+    The witness points of a single component, built on first access
+    """
+    def __init__(self, loader, count, component_id):
+        """
+        Keyword arguments:
+        loader       -- callable returning an iterable of WitnessPoints
+        count        -- int, the number of points loader will return
+        component_id -- int, the id of the component the points lie on
+        """
+        self._loader = loader
+        self._count = count
+        self._component_id = component_id
+        self._points = None
+
+    def __len__(self):
+        """
+        x.__len__() <==> len(x)
+        """
+        return self._count
+
+    def __getitem__(self, key):
+        """
+        x.__getitem__(y) <==> x[y]
+        """
+        return self.load()[key]
+
+    def __iter__(self):
+        """
+        x.__iter__() <==> iter(x)
+        """
+        return iter(self.load())
+
+    def __repr__(self):
+        """
+        x.__repr__() <==> repr(x)
+        """
+        if self._points is None:
+            return 'LazyWitnessPoints(<{0} points>,{1})'.format(self._count, self._component_id)
+        return repr(self._points)
+
+    def load(self):
+        """
+        Build the witness points, if not already built, and return them
+        """
+        if self._points is None:
+            self._points = list(self._loader())
+            self._loader = None
+        return self._points
+
+    @property
+    def component_id(self):
+        return self._component_id
+    @property
+    def loaded(self):
+        return self._points is not None
+
 class WitnessSet(NAGobject):
     """
     A witness set for a component
@@ -302,17 +376,16 @@ class WitnessSet(NAGobject):
         self._system = system
         self._slice = lslice
         self._witness_data = witness_data
-        try:
-            self._witness_points = list(witness_points)
-        except TypeError:
-            self._witness_points = [witness_points]
-            
-        wp = self._witness_points[0]
-        self._component_id = wp._component_id
-        for w in self._witness_points:
-            if w._component_id != self._component_id:
-                msg = 'WitnessPoint {0} and WitnessPoint {1} do not lie on the same component'.format(wp, w)
-                raise WitnessDataException(msg)
+        if isinstance(witness_points, LazyWitnessPoints):
+            # checked when loaded
+            self._witness_points = witness_points
+            self._component_id = witness_points.component_id
+        else:
+            try:
+                self._witness_points = list(witness_points)
+            except TypeError:
+                self._witness_points = [witness_points]
+            self._check_points()
         
         kkeys = kwargs.keys()
         
@@ -321,6 +394,12 @@ class WitnessSet(NAGobject):
         else:
             self._homogeneous_slice = None
     
+    def __len__(self):
+        """
+        x.__len__() <==> len(x)
+        """
+        return len(self._witness_points)
+
     def __repr__(self):
         """
         x.__repr__() <==> repr(x)
@@ -340,7 +419,17 @@ class WitnessSet(NAGobject):
         repstr = '{' + ', '.join([str(p) for p in wp]) + '}'
         
         return repstr
-        
+
+    def _check_points(self):
+        """
+        Ensure all witness points lie on the same component
+        """
+        wp = self._witness_points[0]
+        self._component_id = wp._component_id
+        for w in self._witness_points:
+            if w._component_id != self._component_id:
+                msg = 'WitnessPoint {0} and WitnessPoint {1} do not lie on the same component'.format(wp, w)
+                raise WitnessDataException(msg)
 
     @property
     def homogeneous_slice(self):
@@ -360,4 +449,7 @@ class WitnessSet(NAGobject):
         
     @property
     def witness_points(self):
+        if isinstance(self._witness_points, LazyWitnessPoints):
+            self._witness_points = self._witness_points.load()
+            self._check_points()
         return self._witness_points
\ No newline at end of file
@@ -25,8 +25,21 @@ def settempdir(dirname=TEMPDIR):
     
     return dirname
 
-from sympy import __version__ as spver
-spver = [int(n) for n in spver.split('.')[:3]]
+# check the SymPy version without importing SymPy, which is slow to load
+def __sympy_version():
+    import re
+    try:
+        from importlib.util import find_spec
+        spec = find_spec('sympy')
+        from os.path import dirname, join
+        fh = open(join(dirname(spec.origin), 'release.py'), 'r')
+        release = fh.read()
+        fh.close()
+        return re.search(r'__version__\s*=\s*[\'"]([^\'"]+)', release).group(1)
+    except Exception: # Python 2, or SymPy laid out some other way
+        from sympy import __version__
+        return __version__
+spver = [int(n) for n in __sympy_version().split('.')[:3]]
 if spver[0] == 0 and spver[1] == 7 and spver[2] < 6:
     msg = 'SymPy version 0.7.6 or above is required for NAGlib'
     raise ImportError(msg)
@@ -49,12 +62,10 @@ TEMPDIR = settempdir(TEMPDIR)
 import atexit
 @atexit.register
 def cleanup():
-    if NAGLIB_DEBUG:
-        pass
-    # bug here
-    #else:
-        #import os
-        #import shutil
-        #if os.path.exists(TEMPDIR):
-            #shutil.rmtree(TEMPDIR)
+    # remove only the run directories this process made; TEMPDIR may be
+    # shared with other processes whose runs are still going
+    import sys
+    rundir = sys.modules.get('naglib.bertini.rundir')
+    if rundir is not None:
+        rundir.cleanup()
 del atexit
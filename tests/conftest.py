@@ -0,0 +1,59 @@
+import os
+import stat
+
+import pytest
+
+# stands in for Bertini: writes the output files of a zero-dimensional
+# run and echoes the input file into main_data
+FAKE_BERTINI = """#!/bin/sh
+printf '1\\n\\n1.0 0.0\\n2.0 0.0\\n' > finite_solutions
+printf '1\\n\\n0.5 0.1\\n0.25 0.3\\n' > start_parameters
+{ echo "main"; echo "*************** input file needed to reproduce this run ***************"; echo; sed "s/^END$/END;/" "$1"; } > main_data
+echo "done in $(pwd)"
+"""
+
+# as FAKE_BERTINI, but path 1 fails unless adaptive precision is asked
+# for, as when failed paths are retried
+FAILING_BERTINI = """#!/bin/sh
+if grep -qi "mptype" "$1"; then
+  printf '1\n\n3.0 0.0\n' > finite_solutions
+  fail=""
+else
+  printf '2\n\n1.0 0.0\n\n2.0 0.0\n' > finite_solutions
+  fail="retVal: -21"
+fi
+printf '1\n\n0.5 0.1\n' > start_parameters
+{ echo "Path number: 0 (ID: 0)"; echo "Cycle number: 1"; echo "-----";
+  echo "Path number: 1 (ID: 1)"; echo "$fail"; echo "-----";
+  echo "*************** input file needed to reproduce this run ***************"; echo; sed "s/^END$/END;/" "$1"; } > main_data
+echo "done in $(pwd)"
+"""
+
+def _install(script, tmp_path, monkeypatch):
+    """
+    Point naglib at a stand-in for Bertini, without mpirun, and give
+    runs a RunDirectoryManager of their own, which is returned
+    """
+    import naglib
+    from naglib.bertini import rundir
+
+    bertini = str(tmp_path / 'bertini')
+    fh = open(bertini, 'w')
+    fh.write(script)
+    fh.close()
+    os.chmod(bertini, os.stat(bertini).st_mode | stat.S_IEXEC)
+
+    monkeypatch.setattr(naglib, 'BERTINI', bertini, raising=False)
+    monkeypatch.setattr(naglib, 'MPIRUN', '', raising=False)
+    manager = rundir.RunDirectoryManager(str(tmp_path / 'runs'))
+    monkeypatch.setattr(rundir, '_default', manager)
+
+    return manager
+
+@pytest.fixture
+def fake_bertini(tmp_path, monkeypatch):
+    return _install(FAKE_BERTINI, tmp_path, monkeypatch)
+
+@pytest.fixture
+def failing_bertini(tmp_path, monkeypatch):
+    return _install(FAILING_BERTINI, tmp_path, monkeypatch)
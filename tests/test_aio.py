@@ -0,0 +1,53 @@
+import asyncio
+import os
+import stat
+
+import pytest
+
+from naglib.core.algebra import PolynomialSystem
+from naglib.bertini.launch import LocalLauncher
+from naglib.bertini.sysutils import BertiniRun
+
+def test_run_async(fake_bertini):
+    lines = []
+    run = BertiniRun(PolynomialSystem(['x**2 - 1', 'y - 2']), as_array=True)
+
+    solutions = asyncio.run(run.run_async(on_output=lines.append))
+    run.close()
+
+    assert solutions.array.shape == (1, 2)
+    assert lines and lines[0].startswith('done')
+    assert 'bertini' in run.timings
+    assert fake_bertini.live == []
+
+def test_cancel_gives_back_directory(fake_bertini, tmp_path):
+    slow = str(tmp_path / 'slow')
+    fh = open(slow, 'w')
+    fh.write('#!/bin/sh\nsleep 30\n')
+    fh.close()
+    os.chmod(slow, os.stat(slow).st_mode | stat.S_IEXEC)
+    run = BertiniRun(PolynomialSystem(['x**2 - 1']), launcher=LocalLauncher(slow))
+
+    async def cancel():
+        task = asyncio.ensure_future(run.run_async())
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(cancel(), 10))
+
+    assert fake_bertini.live == []
+
+def test_error_in_callback_fails_run(fake_bertini):
+    run = BertiniRun(PolynomialSystem(['x**2 - 1']))
+
+    def on_output(line):
+        raise RuntimeError(line)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run.run_async(on_output=on_output))
+    run.close()
+
+    assert fake_bertini.live == []
+    assert os.listdir(fake_bertini.failed_dir) == [os.path.basename(run.dirname)]
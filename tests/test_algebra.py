@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from naglib.core.algebra import PolynomialSystem
+
+@pytest.mark.parametrize('empty', [[], np.zeros((0, 2))])
+def test_empty_batch(empty):
+    system = PolynomialSystem(['x**2 - 1', 'x*y - 2', 'y**3'])
+
+    assert system.compile()(empty).shape == (0, 3)
+    assert system.compile_jacobian()(empty).shape == (0, 3, 2)
+    assert system.slp().evaluate(empty).shape == (0, 3)
+    assert system.cond(empty).shape == (0,)
+
+def _random_arguments(N=4):
+    np.random.seed(3)
+    points = np.random.randn(N, 2) + 1j*np.random.randn(N, 2)
+    params = np.random.randn(N, 1) + 1j*np.random.randn(N, 1)
+    return points, params
+
+def test_compile_matches_lambdify():
+    from sympy import lambdify
+
+    system = PolynomialSystem(['x**2*a - y + 1', 'x*y - a**2'], parameters=['a'])
+    points, params = _random_arguments()
+    gens = list(system.variables) + list(system.parameters)
+
+    func = lambdify(gens, list(system.polynomials), modules='numpy')
+    expected = np.array(func(points[:,0], points[:,1], params[:,0])).T
+    assert np.allclose(system.compile()(points, params), expected)
+
+def test_compile_jacobian_matches_lambdify():
+    from sympy import lambdify
+
+    system = PolynomialSystem(['x**2*a - y + 1', 'x*y - a**2'], parameters=['a'])
+    points, params = _random_arguments()
+    gens = list(system.variables) + list(system.parameters)
+
+    jac = system.jacobian()[0]
+    func = lambdify(gens, list(jac), modules='numpy')
+    values = func(points[:,0], points[:,1], params[:,0])
+    expected = np.array([np.broadcast_to(v, (4,)) for v in values]).T.reshape(4, 2, 2)
+    assert np.allclose(system.compile_jacobian()(points, params), expected)
+
+def test_homogenize_round_trip_with_parameters():
+    system = PolynomialSystem(['x**2*a - y + 1', 'x*y*z - a**2'], parameters=['a'])
+    hom = system.homogenize('h')
+
+    assert str(hom.homvar) == 'h'
+    assert list(hom.parameters) == list(system.parameters)
+    assert hom.degree == system.degree
+
+    # homogeneous in the variables, not the parameters
+    np.random.seed(4)
+    point = np.random.randn(4) + 1j*np.random.randn(4)
+    params = np.random.randn(1) + 1j*np.random.randn(1)
+    t = 0.7 - 0.2j
+    scaled = hom.compile()(t*point, params)
+    assert np.allclose(scaled, hom.compile()(point, params)*t**np.array(hom.degree))
+
+    dehom = hom.dehomogenize()
+    assert not dehom.homvar
+    assert list(dehom.variables) == list(system.variables)
+    assert list(dehom.parameters) == list(system.parameters)
+    assert dehom.equals(system)
+
+def test_homogenize_rejects_existing_symbol():
+    system = PolynomialSystem(['x**2*a - y'], parameters=['a'])
+    with pytest.raises(ValueError):
+        system.homogenize('a')
+    with pytest.raises(ValueError):
+        system.homogenize('x')
+
+def test_equals():
+    F = PolynomialSystem(['(x - 1)*(x + 1)', 'x*y - 2'])
+
+    assert F.equals(PolynomialSystem(['x**2 - 1', 'y*x - 2']))
+    assert not F.equals(PolynomialSystem(['x**2 - 1', 'x*y - 2 + 1e-6']))
+    assert not F.equals(PolynomialSystem(['x*y - 2', 'x**2 - 1']))
+    # the same system in other variables
+    G = PolynomialSystem(['u**2 - 1', 'u*v - 2'])
+    assert not F.equals(G)
+    assert F.equals(G, strict=False)
+
+@pytest.mark.parametrize('polynomials, rank', [
+    (['x**2 - y', 'x - y'], 2),
+    (['x + y', '2*x + 2*y'], 1),
+    (['(x + y)**2', 'x + y'], 1),
+    (['x*y*z', 'x - 1', 'y*z'], 2),
+    (['1', '2'], 0),
+])
+def test_rank(polynomials, rank):
+    assert PolynomialSystem(polynomials).rank() == rank
@@ -0,0 +1,20 @@
+import numpy as np
+
+from naglib.core.base import AffinePointArray
+
+def test_row_view_stays_numeric():
+    points = AffinePointArray(np.array([[1 + 2j, 3], [4, 5j]]))
+    p = points[0]
+
+    assert complex(p[0]) == 1 + 2j
+    assert p == points[0]
+    assert [complex(c) for c in p.coordinates] == [1 + 2j, 3]
+    assert np.shares_memory(p._numeric(), points.array)
+
+def test_assigning_to_row_view_leaves_array_alone():
+    points = AffinePointArray(np.array([[1 + 2j, 3], [4, 5j]]))
+    p = points[0]
+    p[1] = 7
+
+    assert [complex(c) for c in p.coordinates] == [1 + 2j, 7]
+    assert points.array[0, 1] == 3
@@ -0,0 +1,91 @@
+import os
+
+from naglib.bertini.cache import ResultCache
+
+def _write(dirname, name, contents):
+    path = os.path.join(dirname, name)
+    fh = open(path, 'w')
+    fh.write(contents)
+    fh.close()
+    return path
+
+def _run_dir(tmp_path, name, input_text, output_size=10):
+    dirname = str(tmp_path / name)
+    os.makedirs(dirname)
+    inputf = _write(dirname, 'input', input_text)
+    _write(dirname, 'finite_solutions', 'x'*output_size)
+    return dirname, inputf
+
+def test_store_and_fetch(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    bertini = _write(str(tmp_path), 'bertini', '')
+    dirname, inputf = _run_dir(tmp_path, 'run', 'INPUT\nEND;\n')
+
+    key = cache.key(bertini, [inputf])
+    assert key not in cache
+    assert cache.fetch(key, str(tmp_path)) is None
+
+    cache.store(key, dirname, [inputf], 'stdout')
+    assert key in cache and len(cache) == 1
+
+    target = str(tmp_path / 'target')
+    os.makedirs(target)
+    assert cache.fetch(key, target) == 'stdout'
+    # outputs only
+    assert os.listdir(target) == ['finite_solutions']
+
+    cache.discard(key)
+    assert key not in cache
+
+def test_key_follows_inputs(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    bertini = _write(str(tmp_path), 'bertini', '')
+    first, inputf = _run_dir(tmp_path, 'first', 'INPUT\nf = x;\nEND;\n')
+    second, other = _run_dir(tmp_path, 'second', 'INPUT\nf = y;\nEND;\n')
+    third, same = _run_dir(tmp_path, 'third', 'INPUT\nf = x;\nEND;\n')
+
+    assert cache.key(bertini, [inputf]) != cache.key(bertini, [other])
+    assert cache.key(bertini, [inputf]) == cache.key(bertini, [same])
+    # a different Bertini
+    rebuilt = _write(str(tmp_path), 'bertini2', 'new')
+    assert cache.key(bertini, [inputf]) != cache.key(rebuilt, [inputf])
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), max_size=2500)
+    bertini = _write(str(tmp_path), 'bertini', '')
+
+    keys = []
+    for i in range(3):
+        dirname, inputf = _run_dir(tmp_path, 'run{0}'.format(i), str(i), output_size=1000)
+        key = cache.key(bertini, [inputf])
+        cache.store(key, dirname, [inputf], '')
+        os.utime(os.path.join(cache.dirname, key), (i, i))
+        keys.append(key)
+
+    cache.max_size = 2500
+    assert [k in cache for k in keys] == [False, True, True]
+
+    cache.clear()
+    assert len(cache) == 0
+
+def test_run_uses_cache(fake_bertini, tmp_path):
+    from naglib.core.algebra import PolynomialSystem
+    from naglib.bertini.sysutils import BertiniRun
+
+    cache = ResultCache(str(tmp_path / 'cache'))
+    system = PolynomialSystem(['x**2 - 1', 'y - 2'])
+
+    first = BertiniRun(system, cache=cache)
+    first.run()
+    assert len(cache) == 1
+
+    # Bertini prints its working directory, so a hit shows the first's
+    second = BertiniRun(system, cache=cache)
+    second.run()
+    assert second.complete
+    assert second.dirname != first.dirname
+    assert second.output == first.output == 'done in {0}\n'.format(first.dirname)
+
+    first.close()
+    second.close()
+    assert fake_bertini.live == []
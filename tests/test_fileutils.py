@@ -0,0 +1,215 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from naglib.bertini.fileutils import LazyWitnessData, fprint, parse_main_data, parse_witness_data
+
+# two points on one component of codimension 1, in 3 (homogeneous)
+# variables, in double precision
+WITNESS_DATA = """3
+1
+1
+2
+52
+1.0e+00 0.0e+00
+6.0e-01 1.0e-01
+8.0e-01 -2.0e-01
+52
+1.0e+00 0.0e+00
+6.0e-01 1.0e-01
+8.0e-01 -2.0e-01
+1.5e+00
+0
+1.0e-01
+0.0e+00
+10
+1
+0
+0
+52
+1.0e+00 0.0e+00
+-6.0e-01 1.0e-01
+8.0e-01 -2.0e-01
+52
+1.0e+00 0.0e+00
+-6.0e-01 1.0e-01
+8.0e-01 -2.0e-01
+1.5e+00
+0
+1.0e-01
+0.0e+00
+10
+1
+0
+0
+-1
+
+1
+1 1
+1.0e+00 0.0e+00
+1
+
+3
+0.1 0.2
+0.3 0.4
+0.5 0.6
+
+0.0 0.0
+1 3
+0.7 0.1
+0.2 0.3
+0.4 0.5
+3
+1.0 0.0
+0.0 0.0
+0.0 0.0
+"""
+
+@pytest.fixture
+def witness_data(tmp_path):
+    filename = str(tmp_path / 'witness_data')
+    fh = open(filename, 'w')
+    fh.write(WITNESS_DATA)
+    fh.close()
+    return filename
+
+def _coordinates(points):
+    return [[complex(c) for c in p['coordinates']] for p in points]
+
+def test_lazy_witness_data_matches_parser(witness_data):
+    parsed = parse_witness_data(witness_data)
+    with LazyWitnessData(witness_data) as lazy:
+        assert len(lazy) == len(parsed) == 1
+        assert lazy.codims == [parsed[0]['codim']]
+        assert lazy.components(0) == [0]
+        assert lazy.num_points(0) == 2
+        assert _coordinates(lazy[0]['points']) == _coordinates(parsed[0]['points'])
+    assert lazy.closed
+
+def test_lazy_witness_data_pickles(witness_data):
+    lazy = LazyWitnessData(witness_data)
+    copy = pickle.loads(pickle.dumps(lazy))
+    lazy.close()
+
+    assert not copy.closed
+    assert copy.filename == witness_data
+    assert copy.num_points(0) == 2
+    assert _coordinates(copy.points(0)) == _coordinates(parse_witness_data(witness_data)[0]['points'])
+    copy.close()
+
+def test_closing_run_closes_witness_data(fake_bertini, witness_data):
+    from naglib.core.algebra import PolynomialSystem
+    from naglib.bertini.sysutils import BertiniRun
+
+    run = BertiniRun(PolynomialSystem(['x**2 - 1']), lazy=True)
+    run._witness_data = run._read_witness_data(witness_data)
+    run.close()
+
+    assert run._witness_data.closed
+
+MAIN_DATA = """Number of variables: 2
+Variables:  x y
+------------------------------------------------------------------------------------------
+Solution 0 (path number 0)
+Estimated condition number: 2.214137587216e+00
+Function residual: 1.110223024625e-16
+Latest Newton residual: 0.000000000000e+00
+T value at final sample point: 0.000000000000e+00
+Maximum precision utilized: 52
+T value at first precision increase: 0.000000000000e+00
+Accuracy estimate, internal coordinates (difference of last two endpoint estimates):  1.2e-15
+Accuracy estimate, user's coordinates (after dehomogenization, if applicable): 1.2e-15
+Cycle number: 1
+x 1.000000000000000e+00 0.000000000000000e+00
+y 2.000000000000000e+00 -1.000000000000000e+00
+Paths with the same endpoint, to the prescribed tolerance:
+Multiplicity: 1
+------------------------------------------------------------------------------------------
+Path number: 1 (ID: 1)
+Estimated condition number: 1e12
+T value at final sample point: 1.0e-3
+Maximum precision utilized: 96
+retVal: -21
+------------------------------------------------------------------------------------------
+*************** input file needed to reproduce this run ***************
+variable_group x, y;
+x 1 2
+"""
+
+def test_parse_main_data():
+    stats = parse_main_data(MAIN_DATA.splitlines(True))
+
+    assert len(stats) == 2
+    assert list(stats.path) == [0, 1]
+    assert list(stats.solution) == [0, -1]
+    assert list(stats.condition_number) == [2.214137587216, 1e12]
+    assert list(stats.max_precision) == [52, 96]
+    assert list(stats.final_t) == [0, 1e-3]
+    assert list(stats.failure_code) == [0, -21]
+    assert list(stats.cycle_number) == [1, -1]
+    assert list(stats.multiplicity) == [1, -1]
+    assert stats.accuracy_estimate[0] == 1.2e-15
+
+    # the input echoed after the paths is not read as a coordinate
+    assert stats.endpoint.shape == (2, 2)
+    assert list(stats.endpoint[0]) == [1, 2 - 1j]
+    assert np.isnan(stats.endpoint[1]).all()
+    assert np.isnan(stats.function_residual[1])
+
+def test_parse_main_data_without_paths():
+    assert len(parse_main_data([])) == 0
+    assert len(parse_main_data(['garbage\n', 'Path number: x\n'])) == 0
+
+DIGITS = '0.1234567890123456789012345678901234567891'
+
+def _fprinted(points, tmp_path):
+    filename = str(tmp_path / 'points')
+    fprint(points, filename)
+    fh = open(filename)
+    lines = [l.split() for l in fh.read().splitlines()[2:] if l]
+    fh.close()
+    return lines
+
+def test_fprint_keeps_full_precision(tmp_path):
+    from mpmath import mpc, workdps
+    from sympy import Float
+    from naglib.core.base import AffinePoint
+
+    with workdps(40):
+        sympy_point = AffinePoint([Float(DIGITS, 40), 2])
+        mpmath_row = np.array([mpc(DIGITS, '1')], dtype=object)
+        assert _fprinted([sympy_point], tmp_path)[0] == [DIGITS, '0']
+        assert _fprinted(np.array([mpmath_row]), tmp_path)[0][0] == DIGITS
+
+def test_fprint_double_precision(tmp_path):
+    from naglib.core.base import AffinePointArray
+
+    points = AffinePointArray(np.array([[0.1 + 2j, 3], [4, 5j]]))
+    lines = _fprinted(points, tmp_path)
+    assert [complex(float(re), float(im)) for re, im in lines] == [0.1 + 2j, 3, 4, 5j]
+
+def test_lazy_witness_sets_leave_run_alone(fake_bertini, witness_data):
+    import gc
+    import weakref
+    from naglib.core.algebra import PolynomialSystem
+    from naglib.bertini.sysutils import BertiniRun
+
+    run = BertiniRun(PolynomialSystem(['x**2 + y**2 - 1']), lazy=True)
+    run._witness_data = run._read_witness_data(witness_data)
+    components = run._recover_components(run._witness_data)
+    points = components[0].witness_set._witness_points
+    assert not points.loaded
+
+    # the loader pickles without the run, and the copy loads
+    copy = pickle.loads(pickle.dumps(points))
+    assert len(copy.load()) == 2
+
+    ref = weakref.ref(run)
+    run.close()
+    del run
+    gc.collect()
+    assert ref() is None
+
+    with pytest.raises(ValueError, match='closed with its run'):
+        points.load()
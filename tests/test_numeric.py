@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from naglib.core.algebra import PolynomialSystem
+from naglib.core.numeric import newton
+
+@pytest.mark.parametrize('empty', [[], np.zeros((0, 2))])
+def test_newton_empty_batch(empty):
+    system = PolynomialSystem(['x**2 - 1', 'y - 2'])
+    result = newton(system, empty)
+
+    assert result['points'].array.shape == (0, 2)
+    assert result['residuals'].shape == (0,)
+    assert result['condition numbers'].shape == (0,)
+    assert result['converged'].shape == (0,)
+
+def _circle_component(**slices):
+    from naglib.core import AffinePoint, IrreducibleComponent, WitnessPoint, WitnessSet
+
+    # the unit circle cut by the line y = 0.3*x + 0.1
+    system = PolynomialSystem(['x**2 + y**2 - 1'])
+    xs = np.roots([1.09, 0.06, -0.99])
+    points = [WitnessPoint(AffinePoint([x, 0.3*x + 0.1]), 0) for x in xs]
+    lslice = slices.pop('linear_slice', None)
+    witness_set = WitnessSet(system, lslice, points, None, **slices)
+    return system, IrreducibleComponent(witness_set, 1, 0)
+
+@pytest.mark.parametrize('stored', ['homogeneous', 'dehomogenized', 'none'])
+def test_sample_moves_witness_slice(stored):
+    from sympy import symbols
+    from naglib.core.algebra import LinearSlice
+    from naglib.core.numeric import sample
+
+    h, x, y = symbols('_homvar x y')
+    hslice = LinearSlice([[0.1, 0.3, -1]], [h, x, y], h)
+    if stored == 'homogeneous':
+        slices = {'linear_slice':hslice.dehomogenize(), 'homogeneous_slice':hslice}
+    elif stored == 'dehomogenized':
+        slices = {'linear_slice':hslice.dehomogenize()}
+    else:
+        slices = {}
+    system, component = _circle_component(**slices)
+
+    np.random.seed(0)
+    samples = sample(component, 4)
+    assert len(samples) == 4
+    assert np.allclose(system.residuals(samples), 0, atol=1e-8)
+
+def test_sample_checks_witness_slice():
+    from sympy import symbols
+    from naglib.core.algebra import LinearSlice
+    from naglib.core.numeric import sample
+
+    wrong = LinearSlice([[1, 2]], symbols('x y'))
+    system, component = _circle_component(linear_slice=wrong)
+    with pytest.raises(ValueError, match='linear slice'):
+        sample(component, 1)
+
+def test_newton_converges():
+    system = PolynomialSystem(['x**2 - 2', 'x*y - 1'])
+    root = np.array([np.sqrt(2), 1/np.sqrt(2)])
+    np.random.seed(5)
+    starts = np.vstack((root, -root)) + 1e-3*np.random.randn(2, 2)
+
+    result = newton(system, starts)
+    assert result['converged'].all()
+    assert np.allclose(result['points'].array, np.vstack((root, -root)))
+    assert (result['residuals'] < 1e-10).all()
+    assert (result['condition numbers'] >= 1).all()
+
+def test_newton_reports_failure():
+    system = PolynomialSystem(['x**2 + 1', 'y'])
+    result = newton(system, [[0, 0]], maxit=5, multiprec=False)
+    assert not result['converged'][0]
+
+def test_newton_with_parameters():
+    system = PolynomialSystem(['x**2 - a', 'y - a*x'], parameters=['a'])
+    result = newton(system, [[1.9, 7.9], [-2.1, -8.1]], parameters=[4])
+    assert result['converged'].all()
+    assert np.allclose(result['points'].array, [[2, 8], [-2, -8]])
+
+def _sorted_rows(points):
+    points = np.array([[complex(c) for c in p.coordinates] for p in points])
+    return points[np.lexsort((points[:,1].real, points[:,0].real))]
+
+def test_solve_total_degree():
+    from naglib.core.numeric import solve_total_degree
+
+    np.random.seed(6)
+    system = PolynomialSystem(['x**2 - 1', 'y**2 - 4'])
+    solutions = _sorted_rows(solve_total_degree(system))
+    expected = [[-1, -2], [-1, 2], [1, -2], [1, 2]]
+    assert np.allclose(solutions, expected)
+
+def test_solve_parameter_homotopy():
+    from naglib.core.numeric import solve_parameter_homotopy, solve_total_degree
+
+    np.random.seed(7)
+    system = PolynomialSystem(['x**2 - a', 'y - a*x'], parameters=['a'])
+    start = solve_total_degree(system, [1])
+    solutions = _sorted_rows(solve_parameter_homotopy(system, start, [1], [9]))
+    assert np.allclose(solutions, [[-3, -27], [3, 27]])
@@ -0,0 +1,31 @@
+import pytest
+
+from naglib.core.algebra import PolynomialSystem
+from naglib.bertini.pool import BertiniPool
+from naglib.bertini.sysutils import BertiniRun
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_pool_updates_caller_run(fake_bertini, processes):
+    run = BertiniRun(PolynomialSystem(['x**2 - 1', 'y - 2']), as_array=True)
+
+    with BertiniPool(2, processes=processes) as pool:
+        solutions = pool.submit(run).result()
+
+    assert solutions.array.shape == (1, 2)
+    assert run.parallel
+    assert run.complete
+    assert run.output.startswith('done')
+    assert 'bertini' in run.timings
+    run.close()
+    assert fake_bertini.live == []
+
+def test_pool_map_keeps_order(fake_bertini):
+    runs = [BertiniRun(PolynomialSystem(['x**2 - {0}'.format(k), 'y - 2'])) for k in range(4)]
+
+    with BertiniPool(2) as pool:
+        results = list(pool.map(runs))
+
+    assert len(results) == 4
+    assert all([r.complete for r in runs])
+    for r in runs:
+        r.close()
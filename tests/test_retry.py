@@ -0,0 +1,61 @@
+import pytest
+
+from naglib.core.algebra import PolynomialSystem
+from naglib.core.base import AffinePoint
+from naglib.bertini.sysutils import BertiniRun
+
+def test_retry_merges_retracked_paths(failing_bertini):
+    system = PolynomialSystem(['x**3 - a'], parameters=['a'])
+    start = [AffinePoint([1]), AffinePoint([2]), AffinePoint([5])]
+    run = BertiniRun(system, config={'ParameterHomotopy':2}, start=start,
+                     start_parameters=AffinePoint([1]),
+                     final_parameters=AffinePoint([2]), as_array=True)
+
+    solutions = run.run(retry_failed=True)
+    run.close()
+
+    assert run._failed_paths() == [1]
+    assert sorted(solutions.array[:,0].real) == [1, 2, 3]
+    assert run._config == {'ParameterHomotopy':2}
+    assert failing_bertini.live == []
+
+def test_retry_without_start_points_reruns(failing_bertini):
+    run = BertiniRun(PolynomialSystem(['x**3 - 1']), as_array=True)
+
+    solutions = run.run(retry_failed=True)
+    run.close()
+
+    # a total degree run has no start points to retrack from, so the
+    # whole run is repeated with the tighter settings and merged in
+    assert sorted(solutions.array[:,0].real) == [1, 2, 3]
+    assert run._config == {}
+    assert 'bertini[2]' in run.timings
+    assert failing_bertini.live == []
+
+def test_retry_ab_initio_parameter_run_warns(failing_bertini):
+    system = PolynomialSystem(['x**3 - a'], parameters=['a'])
+    run = BertiniRun(system, config={'ParameterHomotopy':1})
+
+    with pytest.warns(UserWarning, match='ab initio'):
+        run.run(retry_failed=True)
+    run.close()
+
+    assert 'bertini[2]' not in run.timings
+
+def test_timings_cover_every_attempt(failing_bertini):
+    system = PolynomialSystem(['x**3 - a'], parameters=['a'])
+    start = [AffinePoint([1]), AffinePoint([2]), AffinePoint([5])]
+    run = BertiniRun(system, config={'ParameterHomotopy':2}, start=start,
+                     start_parameters=AffinePoint([1]),
+                     final_parameters=AffinePoint([2]))
+
+    run.run(retry_failed=True)
+    assert 'bertini' in run.timings
+    assert 'bertini[2]' in run.timings
+    assert 'write files[2]' in run.timings
+
+    # a fresh run starts over
+    run.run()
+    run.close()
+    assert 'bertini' in run.timings
+    assert 'bertini[2]' not in run.timings
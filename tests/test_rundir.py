@@ -0,0 +1,70 @@
+import os
+import pickle
+
+from naglib.bertini.rundir import RunDirectoryManager
+
+def _touch(dirname, name='output', size=10):
+    fh = open(os.path.join(dirname, name), 'w')
+    fh.write('x'*size)
+    fh.close()
+
+def test_released_directories_are_reused(tmp_path):
+    manager = RunDirectoryManager(str(tmp_path))
+
+    dirname = manager.acquire()
+    assert os.path.isdir(dirname) and manager.live == [dirname]
+    _touch(dirname)
+
+    manager.release(dirname)
+    assert manager.live == []
+    again = manager.acquire()
+    assert again == dirname
+    assert os.listdir(again) == []
+
+def test_failed_directories_are_kept(tmp_path):
+    manager = RunDirectoryManager(str(tmp_path), keep_failed=25)
+
+    kept = []
+    for i in range(3):
+        dirname = manager.acquire()
+        _touch(dirname)
+        os.utime(dirname, (i, i))
+        manager.fail(dirname)
+        manager.release(dirname)
+        kept.append(os.path.basename(dirname))
+        assert not os.path.exists(dirname)
+
+    # the oldest goes once they take more than keep_failed bytes
+    assert sorted(os.listdir(manager.failed_dir)) == sorted(kept[1:])
+
+def test_cleanup_removes_live_directories(tmp_path):
+    manager = RunDirectoryManager(str(tmp_path))
+    live = manager.acquire()
+    free = manager.acquire()
+    manager.release(free)
+
+    manager.cleanup()
+    assert not os.path.exists(live)
+    assert not os.path.exists(free)
+    assert manager.live == []
+
+def test_pickled_manager_starts_empty(tmp_path):
+    manager = RunDirectoryManager(str(tmp_path), keep_failed=123)
+    manager.acquire()
+
+    copy = pickle.loads(pickle.dumps(manager))
+    assert copy.basedir == manager.basedir
+    assert copy.keep_failed == 123
+    assert copy.live == []
+    manager.cleanup()
+
+def test_run_gives_back_directory(fake_bertini):
+    from naglib.core.algebra import PolynomialSystem
+    from naglib.bertini.sysutils import BertiniRun
+
+    run = BertiniRun(PolynomialSystem(['x**2 - 1', 'y - 2']))
+    run.run()
+    assert len(fake_bertini.live) == 1
+
+    run.close()
+    assert fake_bertini.live == []
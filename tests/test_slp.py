@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from sympy import lambdify, symbols, sympify
+
+from naglib.core.slp import StraightLineProgram
+
+x, y, a = symbols('x y a')
+POLYNOMIALS = sympify(['(x + y)**3 - a*(x + y)**2 + 1',
+                       '(x + y)**2*(x*y - a) - 2*I',
+                       'x**5*y - 3',
+                       '4'])
+
+@pytest.fixture
+def slp():
+    return StraightLineProgram(POLYNOMIALS, [x, y], [a])
+
+def test_evaluate(slp):
+    np.random.seed(2)
+    points = np.random.randn(5, 2) + 1j*np.random.randn(5, 2)
+    params = np.random.randn(5, 1) + 1j*np.random.randn(5, 1)
+
+    func = lambdify([x, y, a], list(POLYNOMIALS), modules='numpy')
+    expected = np.array([np.broadcast_to(v, (5,)) for v in func(points[:,0], points[:,1], params[:,0])]).T
+    assert np.allclose(slp.evaluate(points, params), expected)
+    # a single point, with parameters broadcast
+    assert np.allclose(slp.evaluate(points[0], params[0]), expected[0])
+
+def test_shares_subexpressions(slp):
+    assert len(slp.subexpressions) > 0
+    # x + y is computed once
+    adds = [args for op, dest, args in slp.instructions if op == 'add' and set(args) == {0, 1}]
+    assert len(adds) == 1
+
+def test_bertini_lines(slp):
+    from sympy import Symbol
+
+    lines = slp.bertini_lines(['f1', 'f2', 'f3', 'f4'])
+    assert len(lines) == len(slp.subexpressions) + 4
+
+    # reading the lines back in order gives the polynomials
+    defined = {}
+    for line in lines:
+        name, expr = line.rstrip(';').split(' = ')
+        defined[Symbol(name)] = sympify(expr.replace('^', '**')).subs(defined)
+    for i, p in enumerate(POLYNOMIALS):
+        assert (defined[Symbol('f{0}'.format(i+1))] - p).expand() == 0
+
+def test_missing_parameters(slp):
+    with pytest.raises(ValueError, match='parameters'):
+        slp.evaluate([1, 2])
+
+def test_rejects_unknown_symbols():
+    with pytest.raises(ValueError, match='neither a variable nor a parameter'):
+        StraightLineProgram(sympify(['x - b']), [x])
+
+def test_rejects_non_polynomials():
+    with pytest.raises(ValueError, match='not polynomial'):
+        StraightLineProgram(sympify(['sin(x)']), [x])
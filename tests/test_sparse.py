@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from sympy import I, lambdify, symbols, sympify
+
+from naglib.core.sparse import SparsePolynomials
+
+x, y, z, a, h = symbols('x y z a h')
+VARIABLES = [x, y, z]
+PARAMETERS = [a]
+POLYNOMIALS = sympify(['3*x**2*y - a*z + 2',
+                       'x*y*z - (1 + 2*I)*y**3 + a**2*x',
+                       'z**4 - x',
+                       '0',
+                       '7'])
+
+def _lambdified(exprs, gens, values):
+    """
+    Evaluate SymPy `exprs' at each row of `values' with lambdify
+    """
+    func = lambdify(gens, list(exprs), modules='numpy')
+    result = np.empty((len(values), len(exprs)), dtype=np.complex128)
+    for i, v in enumerate(func(*values.T)):
+        result[:,i] = v
+    return result
+
+@pytest.fixture
+def values():
+    np.random.seed(1)
+    return np.random.randn(6, 4) + 1j*np.random.randn(6, 4)
+
+@pytest.fixture
+def sparse():
+    return SparsePolynomials.from_sympy(POLYNOMIALS, VARIABLES, PARAMETERS)
+
+def test_evaluate(sparse, values):
+    expected = _lambdified(POLYNOMIALS, VARIABLES + PARAMETERS, values)
+    assert np.allclose(sparse.evaluate(values), expected)
+
+def test_round_trip(sparse):
+    exprs = sparse.as_exprs(VARIABLES + PARAMETERS)
+    assert [(e - p).expand() for e, p in zip(exprs, POLYNOMIALS)] == [0]*len(POLYNOMIALS)
+
+def test_degrees(sparse):
+    assert sparse.degrees() == (3, 3, 4, 0, 0)
+
+@pytest.mark.parametrize('index', range(4))
+def test_diff(sparse, values, index):
+    gens = VARIABLES + PARAMETERS
+    expected = _lambdified([p.diff(gens[index]) for p in POLYNOMIALS], gens, values)
+    assert np.allclose(sparse.diff(index).evaluate(values), expected)
+
+def test_jacobian(sparse, values):
+    gens = VARIABLES + PARAMETERS
+    derivatives = [p.diff(v) for p in POLYNOMIALS for v in VARIABLES]
+    expected = _lambdified(derivatives, gens, values)
+    assert np.allclose(sparse.jacobian().evaluate(values), expected)
+
+def test_homogenize(sparse, values):
+    hom = sparse.homogenize()
+    degrees = sparse.degrees()
+    # h**d*f(x/h, y/h, z/h, a), parameters left alone
+    homogenized = [h**d*p.subs(dict([(v, v/h) for v in VARIABLES]), simultaneous=True)
+                   for p, d in zip(POLYNOMIALS, degrees)]
+    hvalues = np.hstack((np.random.randn(len(values), 1) + 0j, values))
+    expected = _lambdified(homogenized, [h] + VARIABLES + PARAMETERS, hvalues)
+
+    assert hom.degrees() == degrees
+    assert hom.homogeneous().all()
+    assert np.allclose(hom.evaluate(hvalues), expected)
+
+def test_dehomogenize(sparse, values):
+    dehom = sparse.homogenize().dehomogenize(0)
+    assert np.allclose(dehom.evaluate(values), sparse.evaluate(values))
+
+    # setting x to 1 combines terms
+    expected = _lambdified([p.subs(x, 1) for p in POLYNOMIALS], [y, z, a], values[:,1:])
+    assert np.allclose(sparse.dehomogenize(0).evaluate(values[:,1:]), expected)
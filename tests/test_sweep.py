@@ -0,0 +1,72 @@
+import numpy as np
+
+from naglib.core.algebra import PolynomialSystem
+from naglib.bertini.sweep import parameter_sweep
+
+def test_sweep_gives_back_run_directories(fake_bertini):
+    system = PolynomialSystem(['x**2 - a'], parameters=['a'])
+    targets = np.arange(1, 7).reshape(-1, 1)
+
+    results = dict(parameter_sweep(system, targets, workers=2))
+
+    assert sorted(results) == list(range(6))
+    assert fake_bertini.live == []
+
+def test_sweep_stopped_early_gives_back_run_directories(fake_bertini):
+    system = PolynomialSystem(['x**2 - a'], parameters=['a'])
+    targets = np.arange(1, 7).reshape(-1, 1)
+
+    sweep = parameter_sweep(system, targets, workers=2)
+    next(sweep)
+    sweep.close()
+
+    assert fake_bertini.live == []
+
+def _read_points(filename):
+    from naglib.bertini.fileutils import read_array
+    return read_array(filename)
+
+def test_sweep_with_array_parameters(fake_bertini, monkeypatch):
+    from naglib.core.base import AffinePointArray
+    from naglib.bertini import sysutils
+
+    # keep what each run writes for its parameters
+    written = []
+    prepare = sysutils.BertiniRun._prepare_run
+    def spy(run):
+        result = prepare(run)
+        written.append([_read_points(run.dirname + '/' + name)
+                        for name in ('start', 'start_parameters', 'final_parameters')])
+        return result
+    monkeypatch.setattr(sysutils.BertiniRun, '_prepare_run', spy)
+
+    system = PolynomialSystem(['x**2 - a'], parameters=['a'])
+    start = np.array([[1], [-1]])
+    start_parameters = AffinePointArray(np.array([[1]]))
+    targets = np.array([[4], [9]])
+
+    results = dict(parameter_sweep(system, targets, workers=1, start=start,
+                                   start_parameters=start_parameters))
+
+    assert sorted(results) == [0, 1]
+    assert fake_bertini.live == []
+    for start_points, startp, finalp in written:
+        assert start_points.shape == (2, 1)
+        assert startp.shape == (1, 1) and startp[0, 0] == 1
+        assert finalp.shape == (1, 1)
+    assert sorted([finalp[0, 0].real for s, p, finalp in written]) == [4, 9]
+
+def test_run_accepts_array_parameters(fake_bertini):
+    from naglib.bertini.sysutils import BertiniRun
+
+    system = PolynomialSystem(['x**2 - a', 'y - b'], parameters=['a', 'b'])
+    run = BertiniRun(system, config={'ParameterHomotopy':2}, start=np.array([[1, 2], [-1, 2]]),
+                     start_parameters=np.array([1, 2]),
+                     final_parameters=np.array([[4, 2]]))
+    run._prepare_run()
+    startp = _read_points(run.dirname + '/start_parameters')
+    finalp = _read_points(run.dirname + '/final_parameters')
+    run.close()
+
+    assert startp.tolist() == [[1, 2]]
+    assert finalp.tolist() == [[4, 2]]
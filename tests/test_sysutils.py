@@ -0,0 +1,51 @@
+import pickle
+from multiprocessing import cpu_count
+
+import pytest
+
+from naglib.core.algebra import PolynomialSystem
+from naglib.bertini.sysutils import BertiniRun, _discover, _render_input
+
+def test_pcount_from_environment(monkeypatch):
+    monkeypatch.setenv('NAGLIB_PCOUNT', '3')
+    assert _discover('PCOUNT') == 3
+
+@pytest.mark.parametrize('value', ['abc', '0', '-2', '1.5'])
+def test_bad_pcount_falls_back(monkeypatch, value):
+    monkeypatch.setenv('NAGLIB_PCOUNT', value)
+    with pytest.warns(UserWarning, match='NAGLIB_PCOUNT'):
+        assert _discover('PCOUNT') == cpu_count()
+
+def _never(system):
+    raise AssertionError('rendered again')
+
+@pytest.mark.parametrize('input_form', ['factor', 'expand', 'raw', 'slp'])
+def test_input_section_rendered_once(input_form):
+    system = PolynomialSystem(['(x - 1)*(y + 2)', 'x**2 + y**2 - 5'])
+    run = BertiniRun(system, input_form=input_form)
+
+    lines = run._input_section(system)
+    assert lines == _render_input(system, input_form)
+    assert lines[0] == 'INPUT' and lines[-1] == 'END'
+    assert system._rendered_input(input_form, _never) == lines
+
+    # pickled systems (e.g., sent to a process pool) keep the text
+    copy = pickle.loads(pickle.dumps(system))
+    assert copy._rendered_input(input_form, _never) == lines
+
+def test_input_section_follows_modification():
+    system = PolynomialSystem(['x**2 - y**2', 'x*y'])
+    run = BertiniRun(system, input_form='raw')
+    assert 'variable_group x,y;' in run._input_section(system)
+
+    system.homvar = 'x'
+    assert 'hom_variable_group x,y;' in run._input_section(system)
+    system.homvar = None
+    assert 'variable_group x,y;' in run._input_section(system)
+
+def test_slp_input_rejects_free_symbols():
+    system = PolynomialSystem(['x**2 - c', 'y - 2'], ['x', 'y'])
+    with pytest.raises(ValueError, match=r'\[c\]'):
+        BertiniRun(system, input_form='slp')
+    # the other input forms leave it to Bertini
+    BertiniRun(system, input_form='raw')
@@ -0,0 +1,26 @@
+import numpy as np
+from sympy import Float, Rational
+
+from naglib.core.base import AffinePoint
+from naglib.core.witnessdata import WitnessPoint
+
+def test_float_converts_last_approximation():
+    last = np.array([1 + 2j, 3.5])
+    point = WitnessPoint(AffinePoint([Rational(1, 3), 2]), 0,
+                         precision=52, last_approximation=last)
+
+    flo = point.float(30)
+
+    assert all([c.is_Float for c in flo.coordinates])
+    assert flo.coordinates[0]._prec > Float(1.0)._prec
+    assert [complex(c) for c in flo.last_approximation] == [1 + 2j, 3.5]
+    assert all([c.as_real_imag()[0].is_Float for c in flo.last_approximation])
+
+def test_float_of_point_last_approximation():
+    point = WitnessPoint(AffinePoint([1, 2]), 0,
+                         last_approximation=AffinePoint([Rational(1, 3), 2]))
+
+    flo = point.float()
+
+    assert isinstance(flo.last_approximation, AffinePoint)
+    assert flo.last_approximation.coordinates[0].is_Float